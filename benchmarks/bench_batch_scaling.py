@@ -0,0 +1,89 @@
+"""
+Parallel scaling of the bulk report runner.
+
+Writes a synthetic filled template, runs ``run_report`` with each worker count and prints
+wall time, rows/second, speedup over one worker and parallel efficiency. Outputs are
+compared byte-for-byte against the single-worker run.
+
+Usage:
+    python benchmarks/bench_batch_scaling.py --rows 1000000 --workers 1 2 4 8 16
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from open_gov_waterfront.batch import run_report
+from open_gov_waterfront.reports import REPORT_COLUMNS
+
+
+def _write_projects(path: Path, n: int, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "project": [f"P{i}" for i in range(n)],
+            "location": "Cleveland",
+            "jurisdiction": "OH",
+            "waterbody": "Lake Erie",
+            "design_wave_Hs_m": rng.uniform(0.5, 4.0, n),
+            "design_Tp_s": rng.uniform(3.0, 15.0, n),
+            "water_depth_m": rng.uniform(1.0, 40.0, n),
+            "pile_D_m": rng.uniform(0.3, 2.5, n),
+            "morison_Cd": 1.0,
+            "morison_Cm": 2.0,
+            "mooring_wind_area_m2": rng.uniform(100.0, 5000.0, n),
+            "mooring_current_area_m2": rng.uniform(50.0, 2000.0, n),
+            "mooring_wind_mps": rng.uniform(0.0, 40.0, n),
+            "mooring_current_mps": rng.uniform(0.0, 2.0, n),
+            "berthing_mass_tonnes": rng.uniform(1e3, 2e5, n),
+            "berthing_speed_knots": rng.uniform(0.05, 0.5, n),
+            "seawall_mu": rng.uniform(0.3, 0.8, n),
+            "seawall_W_kN": rng.uniform(100.0, 5000.0, n),
+            "seawall_T_kN": rng.uniform(50.0, 2000.0, n),
+            "notes": "",
+        },
+        columns=REPORT_COLUMNS,
+    )
+    df.to_csv(path, index=False)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--chunksize", type=int, default=25_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "projects.csv"
+        _write_projects(src, args.rows)
+        print(f"cores={os.cpu_count()} rows={args.rows:,} chunksize={args.chunksize:,}")
+        print(f"{'workers':>7} {'seconds':>9} {'rows/s':>11} {'speedup':>8} {'efficiency':>10}")
+        baseline_s: float | None = None
+        reference: bytes | None = None
+        for workers in args.workers:
+            out = Path(tmp) / f"out-{workers}.csv"
+            summary = run_report(src, out, chunksize=args.chunksize, workers=workers)
+            body = out.read_bytes()
+            if reference is None:
+                reference = body
+            elif body != reference:
+                raise SystemExit(f"output with {workers} workers differs from the first run")
+            baseline_s = baseline_s or summary.elapsed_s
+            speedup = baseline_s / summary.elapsed_s
+            print(
+                f"{workers:>7} {summary.elapsed_s:>9.2f} {summary.rows / summary.elapsed_s:>11,.0f} "
+                f"{speedup:>8.2f} {speedup / workers:>10.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
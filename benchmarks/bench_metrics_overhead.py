@@ -0,0 +1,67 @@
+"""
+Per-request overhead of MetricsMiddleware.
+
+Calls a trivial ASGI app directly (no network, no framework) with and without the
+middleware and reports the difference per request in microseconds.
+
+Usage:
+    python benchmarks/bench_metrics_overhead.py [--requests 200000]
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from open_gov_waterfront.metrics import MetricsMiddleware, MetricsRegistry
+
+
+class _Route:
+    path = "/waves"
+
+
+async def _app(scope: Scope, receive: Receive, send: Send) -> None:
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _receive() -> Message:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message: Message) -> None:
+    return None
+
+
+async def _run(app: ASGIApp, n: int) -> float:
+    scope: dict[str, Any] = {"type": "http", "method": "POST", "path": "/waves"}
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(dict(scope), _receive, _send)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    wrapped = MetricsMiddleware(_app, registry=MetricsRegistry())
+    bare = min(asyncio.run(_run(_app, args.requests)) for _ in range(args.repeat))
+    instrumented = min(asyncio.run(_run(wrapped, args.requests)) for _ in range(args.repeat))
+    per_request_us = 1e6 * (instrumented - bare) / args.requests
+    print(f"bare app:        {1e6 * bare / args.requests:8.3f} us/request")
+    print(f"with middleware: {1e6 * instrumented / args.requests:8.3f} us/request")
+    print(f"overhead:        {per_request_us:8.3f} us/request")
+
+
+if __name__ == "__main__":
+    main()
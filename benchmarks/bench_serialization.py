@@ -0,0 +1,74 @@
+"""
+Payload size and serialization time for array responses: current vs. optimized path.
+
+The baseline reproduces the stock path (Pydantic model built from Python lists, dumped and
+rendered by JSONResponse). The optimized paths encode numpy arrays directly as JSON or
+MessagePack, optionally gzip-compressed as GZipMiddleware would.
+
+Usage:
+    python benchmarks/bench_serialization.py [--repeat 20]
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import math
+import time
+from collections.abc import Callable
+
+from fastapi.responses import JSONResponse
+
+from open_gov_waterfront.models import TideResponse
+from open_gov_waterfront.responses import dumps_json, dumps_msgpack
+from open_gov_waterfront.tides import Constituent, tide_series
+
+CASES = {
+    "1 day @ 60 s": (86400.0, 60.0),
+    "30 days @ 600 s": (30 * 86400.0, 600.0),
+    "1 year @ 600 s": (365 * 86400.0, 600.0),
+}
+CONSTITUENTS = [
+    Constituent(amp_m=0.5, omega_rad_s=2 * math.pi / 44714.0, phase_rad=0.0),
+    Constituent(amp_m=0.2, omega_rad_s=2 * math.pi / 43200.0, phase_rad=1.0),
+]
+
+
+def _time_ms(fn: Callable[[], bytes], repeat: int) -> tuple[float, bytes]:
+    best = math.inf
+    out = b""
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return 1000 * best, out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'case':>16} {'path':>20} {'ms':>9} {'bytes':>11} {'gzip bytes':>11}")
+    for name, (duration_s, dt_s) in CASES.items():
+        t, eta = tide_series(0.0, duration_s, dt_s, CONSTITUENTS)
+        content = {"t_s": t, "eta_m": eta}
+        paths: dict[str, Callable[[], bytes]] = {
+            "pydantic+JSONResponse": lambda: (
+                JSONResponse(TideResponse(t_s=t.tolist(), eta_m=eta.tolist()).model_dump()).body
+            ),
+            "numpy json": lambda: dumps_json(content),
+            "numpy msgpack": lambda: dumps_msgpack(content),
+        }
+        for path, fn in paths.items():
+            ms, body = _time_ms(fn, args.repeat)
+            print(
+                f"{name:>16} {path:>20} {ms:>9.2f} {len(body):>11,} "
+                f"{len(gzip.compress(body, compresslevel=9)):>11,}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Throughput comparison harness for sizing API workers per core.
+
+Starts the production launcher (``python -m open_gov_waterfront.server``) once per
+configuration on a local port, drives it with concurrent keep-alive clients for a fixed
+duration and prints requests/second, requests/second per worker and latency percentiles.
+
+Usage:
+    python benchmarks/bench_workers.py --workers 1 2 4 8 --loop asyncio uvloop \
+        --http h11 httptools --duration 10 --concurrency 64
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from open_gov_waterfront.loadtest import parse_mix, percentile, run_load
+
+
+def _start_server(port: int, workers: int, loop: str, http: str) -> subprocess.Popen[bytes]:
+    env = dict(os.environ)
+    env.update(
+        {
+            "WATERFRONT_PORT": str(port),
+            "WATERFRONT_HOST": "127.0.0.1",
+            "WATERFRONT_WORKERS": str(workers),
+            "WATERFRONT_LOOP": loop,
+            "WATERFRONT_HTTP": http,
+            "WATERFRONT_LOG_LEVEL": "warning",
+            "WATERFRONT_ACCESS_LOG": "false",
+            # Measure raw capacity, not the shedding policy.
+            "WATERFRONT_SCALAR_MAX_IN_FLIGHT": "100000",
+        }
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "open_gov_waterfront.server"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _wait_ready(base_url: str, timeout_s: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become ready")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--loop", nargs="+", default=["auto"])
+    parser.add_argument("--http", nargs="+", default=["auto"])
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per configuration")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent clients")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--mix", default="waves,berthing,seawall", help="Endpoint weights")
+    args = parser.parse_args()
+    mix = parse_mix(args.mix)
+
+    cores = os.cpu_count() or 1
+    print(f"cores={cores} duration={args.duration}s concurrency={args.concurrency}")
+    print(
+        f"{'workers':>7} {'loop':>8} {'http':>10} {'req/s':>10} {'req/s/wkr':>10} "
+        f"{'p50 ms':>8} {'p99 ms':>8} {'errors':>7}"
+    )
+    for workers, loop, http in itertools.product(args.workers, args.loop, args.http):
+        base_url = f"http://127.0.0.1:{args.port}"
+        proc = _start_server(args.port, workers, loop, http)
+        try:
+            _wait_ready(base_url)
+            result = asyncio.run(
+                run_load(mix, url=base_url, concurrency=args.concurrency, duration_s=args.duration)
+            )
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+        total = result.total()
+        latencies = sorted(total.latencies_s)
+        rps = len(latencies) / result.elapsed_s
+        print(
+            f"{workers:>7} {loop:>8} {http:>10} {rps:>10.0f} {rps / workers:>10.0f} "
+            f"{1000 * percentile(latencies, 0.50):>8.2f} "
+            f"{1000 * percentile(latencies, 0.99):>8.2f} {total.errors + total.shed:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,423 @@
+"""
+Benchmark suite for every calculation module and API endpoint, with JSON baselines.
+
+Fixed-size workloads, so results from different commits are comparable:
+
+- scalar: one call of each public kernel, repeated in a tight loop
+- array: each kernel over 10,000 seeded random inputs (dispersion solved cold and warm)
+- tides: 8-constituent synthesis at 600 s steps from 1 day to 19 years (one nodal cycle)
+- api: sequential and 16-way concurrent requests through an in-process ASGI transport
+
+Each case reports the best and median time per operation over the repeats. ``run``
+writes them to a JSON file; ``compare`` flags cases whose best time per operation grew
+by more than the threshold and exits with status 1 if any did.
+
+Usage:
+    python benchmarks/suite.py run --output baseline.json [--repeat 5] [--filter tides]
+    python benchmarks/suite.py compare baseline.json current.json [--threshold 0.10]
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import httpx
+import numpy as np
+
+from open_gov_waterfront import __version__, waves
+from open_gov_waterfront.berthing import berthing_energy_J, fender_reaction_kN
+from open_gov_waterfront.corrosion import CorrosionInputs, remaining_thickness_mm
+from open_gov_waterfront.mooring import EnvLoads, mooring_total_load_N
+from open_gov_waterfront.morison import MorisonCoeffs, morison_inline_max_per_length_N
+from open_gov_waterfront.piles import PileAxialInputs, pile_axial_capacity_kN
+from open_gov_waterfront.scour import pile_scour_depth_m
+from open_gov_waterfront.seawall import sliding_fs
+from open_gov_waterfront.server import admission_gates, app
+from open_gov_waterfront.tides import Constituent, tide_series
+
+SCALAR_LOOPS = 20_000
+ARRAY_SIZE = 10_000
+API_REQUESTS = 500
+API_CONCURRENCY = 16
+DAY_S = 86400.0
+
+# Principal constituents: (amplitude m, period h). Amplitudes are representative only.
+TIDE_CONSTITUENTS = [
+    Constituent(amp_m=amp, omega_rad_s=2 * math.pi / (period_h * 3600.0), phase_rad=0.3 * i)
+    for i, (amp, period_h) in enumerate(
+        [
+            (0.55, 12.4206),  # M2
+            (0.18, 12.0000),  # S2
+            (0.11, 12.6583),  # N2
+            (0.05, 11.9672),  # K2
+            (0.35, 23.9345),  # K1
+            (0.25, 25.8193),  # O1
+            (0.11, 24.0659),  # P1
+            (0.05, 26.8684),  # Q1
+        ]
+    )
+]
+TIDE_CASES = {
+    "1d": 1 * DAY_S,
+    "30d": 30 * DAY_S,
+    "1y": 365.25 * DAY_S,
+    "19y": 19 * 365.25 * DAY_S,
+}
+
+API_BODIES: dict[str, dict[str, Any]] = {
+    "/waves": {"T_s": 10.0, "h_m": 20.0},
+    "/morison": {"D_m": 1.0, "u_amp_mps": 2.0, "a_amp_mps2": 1.0},
+    "/berthing": {"mass_tonnes": 50000.0, "speed_knots": 0.3},
+    "/mooring": {
+        "A_wind_m2": 1000.0,
+        "A_current_m2": 500.0,
+        "U_wind_mps": 20.0,
+        "U_current_mps": 1.0,
+    },
+    "/pile-axial": {
+        "shaft_length_m": 20.0,
+        "perimeter_m": 2.0,
+        "area_tip_m2": 0.3,
+        "unit_skin_kPa": 50.0,
+        "unit_end_bearing_kPa": 2000.0,
+    },
+    "/corrosion": {"t0_mm": 12.0, "rate_mm_per_year": 0.1, "years": 50.0},
+    "/seawall": {"mu": 0.6, "W_kN": 1000.0, "T_kN": 400.0},
+    "/scour": {"D_m": 1.0, "U_mps": 1.5},
+    "/tides": {"constituents": [{"amp_m": 0.5, "period_s": 44714.0}], "duration_s": DAY_S},
+}
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    group: str
+    ops: int
+    run: Callable[[], object]
+    setup: Callable[[], object] | None = None
+
+
+def _inputs(seed: int = 0) -> dict[str, list[float]]:
+    rng = np.random.default_rng(seed)
+
+    def u(lo: float, hi: float) -> list[float]:
+        return rng.uniform(lo, hi, ARRAY_SIZE).tolist()
+
+    return {
+        "T": u(3.0, 20.0),
+        "h": u(1.0, 100.0),
+        "D": u(0.3, 3.0),
+        "U": u(0.0, 3.0),
+        "A": u(-2.0, 2.0),
+        "mass": u(1e3, 2e5),
+        "speed": u(0.05, 0.5),
+        "area": u(100.0, 5000.0),
+        "wind": u(0.0, 40.0),
+        "len": u(5.0, 60.0),
+        "skin": u(10.0, 150.0),
+        "years": u(0.0, 75.0),
+        "mu": u(0.3, 0.8),
+        "W": u(100.0, 5000.0),
+        "T_kN": u(50.0, 2000.0),
+    }
+
+
+def _loop(fn: Callable[[], object], n: int) -> Callable[[], None]:
+    def run() -> None:
+        for _ in range(n):
+            fn()
+
+    return run
+
+
+def _scalar_cases() -> list[Case]:
+    coeffs = MorisonCoeffs()
+    env = EnvLoads(A_wind_m2=1000.0, A_current_m2=500.0, U_wind_mps=20.0, U_current_mps=1.0)
+    pile = PileAxialInputs(
+        shaft_length_m=20.0,
+        perimeter_m=2.0,
+        area_tip_m2=0.3,
+        unit_skin_kPa=50.0,
+        unit_end_bearing_kPa=2000.0,
+    )
+    corr = CorrosionInputs(t0_mm=12.0, rate_mm_per_year=0.1, years=50.0)
+    kernels: dict[str, Callable[[], object]] = {
+        "waves.wavelength_L": lambda: waves.wavelength_L(10.0, 20.0),
+        "waves.celerity_c": lambda: waves.celerity_c(10.0, 20.0),
+        "waves.group_celerity_cg": lambda: waves.group_celerity_cg(10.0, 20.0),
+        "waves.shoaling_coefficient": lambda: waves.shoaling_coefficient(None, 10.0, 20.0),
+        "morison.inline_max": lambda: morison_inline_max_per_length_N(1.0, 2.0, 1.0, coeffs),
+        "berthing.energy": lambda: berthing_energy_J(50000.0, 0.3),
+        "berthing.fender_reaction": lambda: fender_reaction_kN(1e6),
+        "mooring.total_load": lambda: mooring_total_load_N(env),
+        "piles.axial_capacity": lambda: pile_axial_capacity_kN(pile),
+        "corrosion.remaining": lambda: remaining_thickness_mm(corr),
+        "seawall.sliding_fs": lambda: sliding_fs(0.6, 1000.0, 400.0),
+        "scour.pile_depth": lambda: pile_scour_depth_m(1.0, 1.5),
+    }
+    return [
+        Case(f"scalar/{name}", "scalar", SCALAR_LOOPS, _loop(fn, SCALAR_LOOPS))
+        for name, fn in kernels.items()
+    ]
+
+
+def _array_cases() -> list[Case]:
+    x = _inputs()
+    n = ARRAY_SIZE
+    coeffs = MorisonCoeffs()
+
+    def dispersion() -> None:
+        for T, h in zip(x["T"], x["h"], strict=True):
+            waves.dispersion_k(T, h)
+
+    # 1,000 distinct sea states revisited 10 times: fits the solver cache once primed.
+    revisits = list(zip(x["T"][:1000], x["h"][:1000], strict=True)) * (n // 1000)
+
+    def dispersion_warm() -> None:
+        for T, h in revisits:
+            waves.dispersion_k(T, h)
+
+    def morison() -> None:
+        for D, U, A in zip(x["D"], x["U"], x["A"], strict=True):
+            morison_inline_max_per_length_N(D, U, A, coeffs)
+
+    def berthing() -> None:
+        for m, v in zip(x["mass"], x["speed"], strict=True):
+            fender_reaction_kN(berthing_energy_J(m, v))
+
+    def mooring() -> None:
+        for a, w, u in zip(x["area"], x["wind"], x["U"], strict=True):
+            mooring_total_load_N(EnvLoads(a, 0.5 * a, w, u))
+
+    def piles() -> None:
+        for length, skin in zip(x["len"], x["skin"], strict=True):
+            pile_axial_capacity_kN(PileAxialInputs(length, 2.0, 0.3, skin, 2000.0))
+
+    def corrosion() -> None:
+        for years in x["years"]:
+            remaining_thickness_mm(CorrosionInputs(12.0, 0.1, years))
+
+    def seawall() -> None:
+        for mu, W, T in zip(x["mu"], x["W"], x["T_kN"], strict=True):
+            sliding_fs(mu, W, T)
+
+    def scour() -> None:
+        for D, U in zip(x["D"], x["U"], strict=True):
+            pile_scour_depth_m(D, U)
+
+    return [
+        Case(
+            "array/waves.dispersion_k[cold]",
+            "array",
+            n,
+            dispersion,
+            setup=waves._solve_dispersion.cache_clear,
+        ),
+        Case(
+            "array/waves.dispersion_k[warm]",
+            "array",
+            len(revisits),
+            dispersion_warm,
+            setup=dispersion_warm,
+        ),
+        Case("array/morison.inline_max", "array", n, morison),
+        Case("array/berthing.energy+fender", "array", n, berthing),
+        Case("array/mooring.total_load", "array", n, mooring),
+        Case("array/piles.axial_capacity", "array", n, piles),
+        Case("array/corrosion.remaining", "array", n, corrosion),
+        Case("array/seawall.sliding_fs", "array", n, seawall),
+        Case("array/scour.pile_depth", "array", n, scour),
+    ]
+
+
+def _tide_cases(dt_s: float = 600.0) -> list[Case]:
+    cases = []
+    for label, duration_s in TIDE_CASES.items():
+        n = int(duration_s / dt_s) + 1
+
+        def run(duration_s: float = duration_s) -> None:
+            tide_series(0.0, duration_s, dt_s, TIDE_CONSTITUENTS)
+
+        cases.append(Case(f"tides/tide_series[{label}@600s,8c]", "tides", n, run))
+    return cases
+
+
+@contextmanager
+def _admit_all(concurrency: int) -> Iterator[None]:
+    """Widen the app's admission gates so `concurrency` callers are never queued or shed."""
+    saved = {name: gate.limits for name, gate in admission_gates.items()}
+    for gate in admission_gates.values():
+        in_flight = max(gate.limits.max_in_flight, concurrency)
+        gate.limits = replace(gate.limits, max_in_flight=in_flight)
+    try:
+        yield
+    finally:
+        for name, limits in saved.items():
+            admission_gates[name].limits = limits
+
+
+async def _drive(path: str, body: dict[str, Any] | None, n: int, concurrency: int) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = iter(range(n))
+
+        async def worker() -> None:
+            for _ in remaining:
+                if body is None:
+                    r = await client.get(path)
+                else:
+                    r = await client.post(path, json=body)
+                if r.status_code != 200:
+                    raise RuntimeError(f"{path} returned {r.status_code}: {r.text[:200]}")
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+def _api_cases() -> list[Case]:
+    endpoints: dict[str, dict[str, Any] | None] = {"/health": None, "/states": None}
+    endpoints.update(API_BODIES)
+    cases = []
+    for path, body in endpoints.items():
+        method = "GET" if body is None else "POST"
+        for concurrency in (1, API_CONCURRENCY):
+
+            def run(path: str = path, body: Any = body, c: int = concurrency) -> None:
+                # The api cases time request handling; load shedding has its own tests.
+                with _admit_all(c):
+                    asyncio.run(_drive(path, body, API_REQUESTS, c))
+
+            cases.append(Case(f"api/{method} {path}[c={concurrency}]", "api", API_REQUESTS, run))
+    return cases
+
+
+def all_cases() -> list[Case]:
+    return _scalar_cases() + _array_cases() + _tide_cases() + _api_cases()
+
+
+def measure(case: Case, repeat: int) -> dict[str, Any]:
+    times = []
+    for _ in range(repeat):
+        if case.setup is not None:
+            case.setup()
+        t0 = time.perf_counter()
+        case.run()
+        times.append(time.perf_counter() - t0)
+    best, median = min(times), statistics.median(times)
+    return {
+        "group": case.group,
+        "ops": case.ops,
+        "repeat": repeat,
+        "best_s": best,
+        "median_s": median,
+        "best_per_op_s": best / case.ops,
+        "median_per_op_s": median / case.ops,
+    }
+
+
+def _metadata() -> dict[str, Any]:
+    return {
+        "package_version": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "created_utc": datetime.now(UTC).isoformat(timespec="seconds"),
+    }
+
+
+def _fmt_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    cases = [c for c in all_cases() if not args.filter or any(f in c.name for f in args.filter)]
+    results: dict[str, dict[str, Any]] = {}
+    print(f"{'case':<46} {'ops':>8} {'best/op':>12} {'median/op':>12}")
+    for case in cases:
+        r = results[case.name] = measure(case, args.repeat)
+        print(
+            f"{case.name:<46} {case.ops:>8} {_fmt_time(r['best_per_op_s']):>12} "
+            f"{_fmt_time(r['median_per_op_s']):>12}",
+            flush=True,
+        )
+    if args.output is not None:
+        payload = {"meta": _metadata(), "results": results}
+        args.output.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        print(f"wrote {len(results)} results to {args.output}")
+    return 0
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float
+) -> tuple[list[tuple[str, float, float, float]], list[str]]:
+    """Rows of (case, baseline s/op, current s/op, ratio) and the names that regressed."""
+    rows = []
+    regressed = []
+    base, cur = baseline["results"], current["results"]
+    for name in sorted(base.keys() & cur.keys()):
+        b, c = base[name]["best_per_op_s"], cur[name]["best_per_op_s"]
+        ratio = c / b if b > 0 else math.inf
+        rows.append((name, b, c, ratio))
+        if ratio > 1.0 + threshold:
+            regressed.append(name)
+    return rows, regressed
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    current = json.loads(args.current.read_text(encoding="utf-8"))
+    rows, regressed = compare(baseline, current, args.threshold)
+    print(f"{'case':<46} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, b, c, ratio in rows:
+        flag = "  REGRESSION" if name in regressed else ""
+        print(f"{name:<46} {_fmt_time(b):>12} {_fmt_time(c):>12} {ratio - 1:>+9.1%}{flag}")
+    for name in sorted(baseline["results"].keys() - current["results"].keys()):
+        print(f"{name:<46} missing from current run")
+    for name in sorted(current["results"].keys() - baseline["results"].keys()):
+        print(f"{name:<46} new (no baseline)")
+    if baseline.get("meta", {}).get("machine") != current.get("meta", {}).get("machine"):
+        print("warning: baseline and current runs come from different machines")
+    print(f"{len(regressed)} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="run the suite")
+    run.add_argument("--output", type=Path, default=None, help="write results as JSON")
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--filter", nargs="*", default=None, help="only cases containing any")
+    run.set_defaults(func=cmd_run)
+    cmp = sub.add_parser("compare", help="compare two result files")
+    cmp.add_argument("baseline", type=Path)
+    cmp.add_argument("current", type=Path)
+    cmp.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown")
+    cmp.set_defaults(func=cmd_compare)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
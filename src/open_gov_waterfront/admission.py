@@ -0,0 +1,144 @@
+"""
+Admission control and load shedding for the API server.
+
+Each endpoint class (cheap scalar calculations vs. series/batch calculations) gets its own
+gate with a fixed number of in-flight slots and a bounded FIFO wait queue. When both are
+full the request is rejected immediately with 503 and a Retry-After header, so a flood of
+expensive requests cannot push up latency for the cheap ones.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import deque
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Literal
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+EndpointClass = Literal["scalar", "series"]
+
+EXEMPT_PATHS: frozenset[str] = frozenset(
+    {"/health", "/metrics", "/docs", "/docs/oauth2-redirect", "/redoc", "/openapi.json"}
+)
+ENDPOINT_CLASSES: dict[str, EndpointClass] = {"/tides": "series"}
+
+
+@dataclass(frozen=True)
+class AdmissionLimits:
+    max_in_flight: int
+    max_queue: int
+    queue_timeout_s: float = 2.0
+
+
+class AdmissionGate:
+    """Counting gate with a bounded FIFO wait queue; slots are handed directly to waiters."""
+
+    def __init__(self, limits: AdmissionLimits) -> None:
+        if limits.max_in_flight <= 0 or limits.max_queue < 0 or limits.queue_timeout_s <= 0:
+            raise ValueError("max_in_flight and queue_timeout_s must be > 0, max_queue >= 0")
+        self.limits = limits
+        self.in_flight = 0
+        self.rejected = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting in the queue if needed. Returns False when the request is shed."""
+        if self.in_flight < self.limits.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            return True
+        if len(self._waiters) >= self.limits.max_queue:
+            self.rejected += 1
+            return False
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await asyncio.wait_for(fut, self.limits.queue_timeout_s)
+        except TimeoutError:
+            self._abandon(fut)
+            self.rejected += 1
+            return False
+        except asyncio.CancelledError:
+            self._abandon(fut)
+            raise
+        return True
+
+    def _abandon(self, fut: asyncio.Future[None]) -> None:
+        if fut.done() and not fut.cancelled():
+            # The slot was handed over just as the waiter gave up; pass it on.
+            self.release()
+        elif fut in self._waiters:
+            self._waiters.remove(fut)
+
+    def release(self) -> None:
+        """Free a slot, handing it to the oldest live waiter if there is one."""
+        while self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                return
+        self.in_flight = max(0, self.in_flight - 1)
+
+
+def build_gates(scalar: AdmissionLimits, series: AdmissionLimits) -> dict[str, AdmissionGate]:
+    return {"scalar": AdmissionGate(scalar), "series": AdmissionGate(series)}
+
+
+def classify_path(path: str) -> EndpointClass | None:
+    """Endpoint class for a request path, or None when the path is exempt."""
+    if path in EXEMPT_PATHS:
+        return None
+    return ENDPOINT_CLASSES.get(path, "scalar")
+
+
+class AdmissionMiddleware:
+    """ASGI middleware that admits, queues or sheds HTTP requests per endpoint class."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        gates: Mapping[str, AdmissionGate],
+        classify: Callable[[str], str | None] = classify_path,
+        retry_after_s: int = 1,
+    ) -> None:
+        self.app = app
+        self.gates = gates
+        self.classify = classify
+        self.retry_after_s = retry_after_s
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        endpoint_class = self.classify(scope["path"])
+        gate = self.gates.get(endpoint_class) if endpoint_class is not None else None
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+        if not await gate.acquire():
+            await self._reject(send, endpoint_class or "")
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
+
+    async def _reject(self, send: Send, endpoint_class: str) -> None:
+        body = json.dumps(
+            {"detail": f"Server busy: too many {endpoint_class} requests in flight"}
+        ).encode()
+        headers: list[tuple[bytes, bytes]] = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(self.retry_after_s).encode()),
+        ]
+        await send({"type": "http.response.start", "status": 503, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,375 @@
+"""
+Bulk project runner for filled report templates.
+
+Reads a filled report template (see ``write_report_template``) in fixed-size chunks,
+evaluates the wave, Morison, mooring, berthing and seawall screening calculations for
+every row with the array kernels in ``vectorized``, and appends each enriched chunk to
+the output file, so memory stays bounded by the chunk size however long the input is.
+Inputs and outputs are CSV, or Parquet for ``.parquet`` paths (see ``columnar``).
+
+With ``workers > 1`` chunks are processed, and formatted as CSV, in a process pool whose
+workers are started and warmed up once per run; the parent only parses input and writes
+finished chunks, in input order, with a bounded number of chunks in flight.
+
+A row with missing or out-of-range inputs for a calculation gets NaN results and a
+message in that calculation's ``*_error`` column; the other calculations for the row and
+all other rows are unaffected. Morison forces use linear-wave kinematics at the
+still-water level with the design Hs as the wave height.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections import deque
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import columnar, tracing, vectorized
+from .reports import REPORT_DTYPES
+from .results import ResultRecord, ResultsStore, canonical_inputs, input_hash
+
+DEFAULT_CHUNKSIZE = 50_000
+
+# Calculation name of a report row in the results store.
+RESULTS_CALC = "report"
+# Template columns stored with each row's result.
+LABEL_COLUMNS = ("project", "jurisdiction")
+
+# Optional coefficient columns and the defaults used when absent or blank.
+COEFFICIENT_DEFAULTS = {"morison_Cd": 1.0, "morison_Cm": 2.0}
+
+# Required inputs per calculation: (column, lower bound, bound inclusive).
+CALCULATIONS: dict[str, list[tuple[str, float, bool]]] = {
+    "waves": [("design_Tp_s", 0.0, False), ("water_depth_m", 0.0, False)],
+    "morison": [
+        ("design_Tp_s", 0.0, False),
+        ("water_depth_m", 0.0, False),
+        ("design_wave_Hs_m", 0.0, True),
+        ("pile_D_m", 0.0, False),
+    ],
+    "mooring": [
+        ("mooring_wind_area_m2", 0.0, True),
+        ("mooring_current_area_m2", 0.0, True),
+        ("mooring_wind_mps", 0.0, True),
+        ("mooring_current_mps", 0.0, True),
+    ],
+    "berthing": [("berthing_mass_tonnes", 0.0, False), ("berthing_speed_knots", 0.0, False)],
+    "seawall": [
+        ("seawall_mu", 0.0, False),
+        ("seawall_W_kN", 0.0, False),
+        ("seawall_T_kN", 0.0, False),
+    ],
+}
+NUMERIC_COLUMNS = sorted(
+    {col for rules in CALCULATIONS.values() for col, _, _ in rules} | set(COEFFICIENT_DEFAULTS)
+)
+REQUIRED_COLUMNS = [c for c in NUMERIC_COLUMNS if c not in COEFFICIENT_DEFAULTS]
+
+RESULT_COLUMNS = {
+    "waves": ["wavelength_m", "celerity_mps", "group_celerity_mps", "shoaling_coefficient"],
+    "morison": ["morison_u_amp_mps", "morison_a_amp_mps2", "morison_force_per_length_Npm"],
+    "mooring": ["mooring_total_load_N"],
+    "berthing": ["berthing_energy_J", "fender_reaction_kN"],
+    "seawall": ["seawall_sliding_fs"],
+}
+ERROR_COLUMNS = [f"{name}_error" for name in CALCULATIONS]
+OUTPUT_COLUMNS = [col for cols in RESULT_COLUMNS.values() for col in cols] + ERROR_COLUMNS
+
+
+@dataclass(frozen=True)
+class BatchSummary:
+    """Row, chunk and per-calculation error counts of a bulk run."""
+
+    rows: int
+    chunks: int
+    error_rows: dict[str, int]
+    elapsed_s: float
+    skipped_rows: int = 0
+
+
+def _row_errors(values: dict[str, np.ndarray], rules: list[tuple[str, float, bool]]) -> np.ndarray:
+    """Per-row message for the first failed rule ("" when all pass)."""
+    n = len(next(iter(values.values())))
+    msg = np.full(n, "", dtype=object)
+    for col, bound, inclusive in reversed(rules):
+        x = values[col]
+        missing = np.isnan(x)
+        in_range = x >= bound if inclusive else x > bound
+        msg[~missing & ~in_range] = f"{col} must be {'>=' if inclusive else '>'} {bound:g}"
+        msg[missing] = f"{col} is missing or not a number"
+    return msg
+
+
+def input_values(chunk: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Calculation inputs of a chunk as float arrays (NaN when blank, coefficient defaults)."""
+    values: dict[str, np.ndarray] = {}
+    for col in NUMERIC_COLUMNS:
+        if col in chunk:
+            x = pd.to_numeric(chunk[col], errors="coerce").to_numpy(dtype=float)
+        else:
+            x = np.full(len(chunk), np.nan)
+        if col in COEFFICIENT_DEFAULTS:
+            x = np.where(np.isnan(x), COEFFICIENT_DEFAULTS[col], x)
+        values[col] = x
+    return values
+
+
+def row_inputs(chunk: pd.DataFrame) -> list[str]:
+    """Canonical JSON of each row's calculation inputs, as hashed by the results store."""
+    values = input_values(chunk)
+    columns = [values[col].tolist() for col in NUMERIC_COLUMNS]
+    return [canonical_inputs(dict(zip(NUMERIC_COLUMNS, row, strict=True))) for row in zip(*columns)]
+
+
+def process_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Return `chunk` with result and ``*_error`` columns appended."""
+    with tracing.span("batch.chunk", rows=len(chunk)):
+        values = input_values(chunk)
+        errors = {name: _row_errors(values, rules) for name, rules in CALCULATIONS.items()}
+
+        T, h = values["design_Tp_s"], values["water_depth_m"]
+        wave = vectorized.wave_properties(T, h)
+        u, a = vectorized.surface_kinematics(values["design_wave_Hs_m"], T, wave["k"], h)
+        energy = vectorized.berthing_energy_J(
+            values["berthing_mass_tonnes"], values["berthing_speed_knots"]
+        )
+        results = {
+            "wavelength_m": wave["wavelength_m"],
+            "celerity_mps": wave["celerity_mps"],
+            "group_celerity_mps": wave["group_celerity_mps"],
+            "shoaling_coefficient": wave["shoaling_coefficient"],
+            "morison_u_amp_mps": u,
+            "morison_a_amp_mps2": a,
+            "morison_force_per_length_Npm": vectorized.morison_inline_max_per_length_N(
+                values["pile_D_m"], u, a, values["morison_Cd"], values["morison_Cm"]
+            ),
+            "mooring_total_load_N": vectorized.mooring_total_load_N(
+                values["mooring_wind_area_m2"],
+                values["mooring_current_area_m2"],
+                values["mooring_wind_mps"],
+                values["mooring_current_mps"],
+            ),
+            "berthing_energy_J": energy,
+            "fender_reaction_kN": vectorized.fender_reaction_kN(energy),
+            "seawall_sliding_fs": vectorized.sliding_fs(
+                values["seawall_mu"], values["seawall_W_kN"], values["seawall_T_kN"]
+            ),
+        }
+        out = chunk.copy()
+        for name, cols in RESULT_COLUMNS.items():
+            ok = errors[name] == ""
+            for col in cols:
+                out[col] = np.where(ok, results[col], np.nan)
+        for name in CALCULATIONS:
+            out[f"{name}_error"] = errors[name]
+    return out
+
+
+def check_columns(columns: list[str]) -> None:
+    """Raise ValueError if any required input column is missing."""
+    missing = [c for c in REQUIRED_COLUMNS if c not in columns]
+    if missing:
+        raise ValueError(f"Input is missing required columns: {', '.join(missing)}")
+
+
+ChunkResult = tuple[str | pd.DataFrame, int, dict[str, int]]
+
+
+def _run_chunk(
+    chunk: pd.DataFrame,
+    keep: list[str] | None,
+    csv_header: bool | None,
+    stored: pd.DataFrame | None = None,
+) -> ChunkResult:
+    """
+    Process one chunk (runs in pool workers). With `csv_header` set, the result is
+    rendered to CSV text here so formatting cost is spread across workers. Rows in the
+    index of `stored` are not recalculated: their outputs are taken from it.
+    """
+    if stored is None or stored.empty:
+        result = process_chunk(chunk)
+    else:
+        fresh = ~chunk.index.isin(stored.index)
+        filled = chunk.loc[stored.index].join(stored)
+        result = pd.concat([process_chunk(chunk[fresh]), filled]).loc[chunk.index]
+    if keep is not None:
+        result = result[[*keep, *OUTPUT_COLUMNS]]
+    errors = {name: int((result[f"{name}_error"] != "").sum()) for name in CALCULATIONS}
+    body = result if csv_header is None else result.to_csv(index=False, header=csv_header)
+    return body, len(result), errors
+
+
+def _warm_worker() -> None:
+    """Pool initializer: pay imports and first-call setup once per worker process."""
+    process_chunk(pd.DataFrame({c: [1.0] for c in NUMERIC_COLUMNS}))
+
+
+def resolve_workers(workers: int) -> int:
+    """Worker count to use; 0 means one per available CPU."""
+    if workers < 0:
+        raise ValueError("workers must be >= 0")
+    return workers or os.cpu_count() or 1
+
+
+def output_dtypes(columns: list[str]) -> dict[str, str]:
+    """
+    Pinned column types for Parquet output: template, result and error columns, and text
+    for any other input column (it is carried through as read, never calculated).
+    """
+    dtypes = {c: REPORT_DTYPES.get(c, "string") for c in columns}
+    dtypes.update({c: "float64" for cols in RESULT_COLUMNS.values() for c in cols})
+    dtypes.update({c: "string" for c in ERROR_COLUMNS})
+    return dtypes
+
+
+@dataclass(frozen=True)
+class _Recording:
+    """What the results store needs about a chunk's rows besides their outputs."""
+
+    inputs: list[str]
+    projects: list[str | None]
+    jurisdictions: list[str | None]
+    fresh: np.ndarray | None = None  # rows to record; None records all of them
+
+    def records(self, result: pd.DataFrame) -> list[ResultRecord]:
+        if self.fresh is not None:
+            result = result[self.fresh]
+        outputs = result[OUTPUT_COLUMNS].to_dict("records")
+        return [
+            ResultRecord(RESULTS_CALC, text, json.dumps(out), project, jurisdiction)
+            for text, out, project, jurisdiction in zip(
+                self.inputs, outputs, self.projects, self.jurisdictions, strict=True
+            )
+        ]
+
+
+def _labels(chunk: pd.DataFrame, col: str) -> list[str | None]:
+    if col not in chunk:
+        return [None] * len(chunk)
+    return [None if pd.isna(v) else str(v) for v in chunk[col].tolist()]
+
+
+def run_report(
+    input_path: Path,
+    output_path: Path,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    workers: int = 1,
+    progress: Callable[[int], None] | None = None,
+    keep: Sequence[str] | None = None,
+    results: ResultsStore | None = None,
+    skip_existing: bool = False,
+) -> BatchSummary:
+    """
+    Run every row of a filled report template and write the enriched table. Input and
+    output are CSV, or Parquet for ``.parquet`` paths.
+
+    `workers` > 1 processes chunks in a process pool (0 = one per CPU); output order
+    always matches input order. `keep` limits the input columns carried into the output
+    (all when None); only those and the calculation inputs are read. `progress` is called
+    with the row count of each chunk as it is written.
+
+    With `results`, every calculated row is recorded in the results store under the
+    calculation name "report", with its project and jurisdiction. `skip_existing` then
+    reuses the stored outputs of rows whose inputs already have a result for the current
+    version: they are written to the output without being recalculated or recorded again.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be >= 1")
+    if skip_existing and results is None:
+        raise ValueError("skip_existing needs a results store")
+    n_workers = resolve_workers(workers)
+    columns = columnar.read_columns(input_path)
+    check_columns(columns)
+    keep_cols = None if keep is None else [c for c in columns if c in set(keep)]
+    if keep is not None and len(keep_cols or []) != len(set(keep)):
+        unknown = sorted(set(keep) - set(columns))
+        raise ValueError(f"Columns to keep are not in the input: {', '.join(unknown)}")
+    read_cols = None
+    if keep_cols is not None:
+        needed = set(keep_cols) | set(NUMERIC_COLUMNS)
+        if results is not None:
+            needed |= set(LABEL_COLUMNS)
+        read_cols = [c for c in columns if c in needed]
+    # Rows to be recorded come back as frames; otherwise workers render CSV themselves.
+    csv_text = not columnar.is_parquet(output_path) and results is None
+    start = time.perf_counter()
+    rows = chunks = skipped = 0
+    error_rows = dict.fromkeys(CALCULATIONS, 0)
+
+    def prepared() -> Iterator[tuple[pd.DataFrame, pd.DataFrame | None, _Recording | None]]:
+        """Input chunks, outputs stored for skipped rows, and what is needed to record the rest."""
+        nonlocal skipped
+        reader = columnar.iter_chunks(input_path, chunksize, columns=read_cols, dtype=text_dtypes)
+        for chunk in reader:
+            if results is None:
+                yield chunk, None, None
+                continue
+            inputs = row_inputs(chunk)
+            labels = [_labels(chunk, col) for col in LABEL_COLUMNS]
+            stored = None
+            fresh = None
+            if skip_existing:
+                hashes = [input_hash(RESULTS_CALC, text) for text in inputs]
+                done = results.stored_outputs(hashes)
+                fresh = np.array([h not in done for h in hashes], dtype=bool)
+                stored = pd.DataFrame(
+                    [done[h] for h, ok in zip(hashes, fresh, strict=True) if not ok],
+                    index=chunk.index[~fresh],
+                    columns=OUTPUT_COLUMNS,
+                )
+                skipped += len(stored)
+                inputs = [text for text, ok in zip(inputs, fresh, strict=True) if ok]
+                labels = [[v for v, ok in zip(col, fresh, strict=True) if ok] for col in labels]
+            projects, jurisdictions = labels
+            yield chunk, stored, _Recording(inputs, projects, jurisdictions, fresh)
+
+    def write(writer: columnar.TableWriter, done: ChunkResult, rec: _Recording | None) -> None:
+        nonlocal rows
+        body, n, errors = done
+        if isinstance(body, str):
+            writer.write_csv_text(body)
+        else:
+            writer.write(body)
+        if results is not None and rec is not None and rec.inputs:
+            assert isinstance(body, pd.DataFrame)
+            results.record_many(rec.records(body), source="batch")
+        rows += n
+        for name, count in errors.items():
+            error_rows[name] += count
+        if progress is not None:
+            progress(n)
+
+    # Text and extra columns stay text; numeric columns are coerced per chunk.
+    text_dtypes = {c: str for c in columns if REPORT_DTYPES.get(c, "string") == "string"}
+    out_cols = (keep_cols if keep_cols is not None else columns) + OUTPUT_COLUMNS
+    with columnar.TableWriter(output_path, dtypes=output_dtypes(out_cols)) as writer:
+        if n_workers == 1:
+            for chunk, stored, rec in prepared():
+                header = (chunks == 0) if csv_text else None
+                write(writer, _run_chunk(chunk, keep_cols, header, stored), rec)
+                chunks += 1
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_warm_worker) as pool:
+                # Bounded window of in-flight chunks, collected in submission order.
+                pending: deque[tuple[Future[ChunkResult], _Recording | None]] = deque()
+                for chunk, stored, rec in prepared():
+                    header = (chunks == 0) if csv_text else None
+                    future = pool.submit(_run_chunk, chunk, keep_cols, header, stored)
+                    pending.append((future, rec))
+                    chunks += 1
+                    if len(pending) >= 2 * n_workers:
+                        future, rec = pending.popleft()
+                        write(writer, future.result(), rec)
+                while pending:
+                    future, rec = pending.popleft()
+                    write(writer, future.result(), rec)
+    return BatchSummary(rows, chunks, error_rows, time.perf_counter() - start, skipped)
@@ -6,7 +6,10 @@ Author: Nik Jois <nikjois@llamasearch.ai>
 
 from __future__ import annotations
 
+from .timing import timed
 
+
+@timed
 def berthing_energy_J(
     mass_tonnes: float, speed_knots: float, Ce: float = 1.0, Cc: float = 1.0, Cs: float = 1.0
 ) -> float:
@@ -22,6 +25,7 @@ def berthing_energy_J(
     return float(E)
 
 
+@timed
 def fender_reaction_kN(energy_J: float, efficiency: float = 0.7, deflection_m: float = 0.5) -> float:
     """
     Simple reaction estimate: R = (E / (eff * deflection)) in N; return kN.
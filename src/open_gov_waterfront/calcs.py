@@ -0,0 +1,308 @@
+"""
+Registry of the screening calculations shared by the HTTP API and the stdio worker.
+
+Each entry pairs a calculation name (the API path without the slash) with its Pydantic
+request model and a function from a validated request to a plain result dict, so every
+front end validates and computes the same way.
+
+``ARRAY_CALCS`` holds array forms of the same calculations for sweeps and sampling: the
+same parameter names and defaults as the request model, evaluated elementwise with the
+kernels in ``vectorized`` (invalid elements give NaN rather than an error).
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+import numpy as np
+from numpy.typing import ArrayLike
+from pydantic import BaseModel
+
+from . import vectorized
+from .berthing import berthing_energy_J, fender_reaction_kN
+from .corrosion import CorrosionInputs, remaining_thickness_mm
+from .models import (
+    BerthingRequest,
+    CorrosionRequest,
+    MooringRequest,
+    MorisonRequest,
+    PileAxialRequest,
+    ScourRequest,
+    SeawallRequest,
+    TideRequest,
+    WaveRequest,
+)
+from .mooring import EnvLoads, mooring_total_load_N
+from .morison import MorisonCoeffs, morison_inline_max_per_length_N
+from .piles import PileAxialInputs, pile_axial_capacity_kN
+from .scour import pile_scour_depth_m
+from .seawall import sliding_fs
+from .tides import Constituent, tide_series
+from .waves import celerity_c, group_celerity_cg, shoaling_coefficient, wavelength_L
+
+R = TypeVar("R", bound=BaseModel)
+
+
+@dataclass(frozen=True)
+class Calc:
+    """A named calculation: its request model and implementation."""
+
+    name: str
+    request_model: type[BaseModel]
+    run: Callable[[Any], dict[str, Any]]
+
+
+CALCS: dict[str, Calc] = {}
+
+
+def register(
+    name: str, model: type[R]
+) -> Callable[[Callable[[R], dict[str, Any]]], Callable[[R], dict[str, Any]]]:
+    """Decorator adding a calculation to ``CALCS`` under `name`."""
+
+    def decorator(fn: Callable[[R], dict[str, Any]]) -> Callable[[R], dict[str, Any]]:
+        CALCS[name] = Calc(name, model, fn)
+        return fn
+
+    return decorator
+
+
+def validate(name: str, params: Mapping[str, Any]) -> tuple[Calc, BaseModel]:
+    """
+    Look up a calculation and validate `params` with its request model. Raises ValueError
+    for an unknown name and pydantic's ValidationError for invalid parameters.
+    """
+    calc = CALCS.get(name)
+    if calc is None:
+        raise ValueError(f"Unknown calculation {name!r}; choose from {', '.join(CALCS)}")
+    return calc, calc.request_model.model_validate(params)
+
+
+def run_calc(name: str, params: Mapping[str, Any]) -> dict[str, Any]:
+    """Validate `params` and run the calculation (errors as for ``validate``)."""
+    calc, req = validate(name, params)
+    return calc.run(req)
+
+
+def storable(name: str, outputs: Mapping[str, Any]) -> dict[str, Any]:
+    """Outputs as kept in the results store: series are reduced to a summary."""
+    if name == "tides":
+        return {
+            "points": int(outputs["t_s"].size),
+            "eta_max_m": float(outputs["eta_m"].max()),
+            "eta_min_m": float(outputs["eta_m"].min()),
+        }
+    return dict(outputs)
+
+
+@register("waves", WaveRequest)
+def waves(req: WaveRequest) -> dict[str, Any]:
+    return {
+        "wavelength_m": wavelength_L(req.T_s, req.h_m),
+        "celerity_mps": celerity_c(req.T_s, req.h_m),
+        "group_celerity_mps": group_celerity_cg(req.T_s, req.h_m),
+        "shoaling_coefficient": shoaling_coefficient(None, req.T_s, req.h_m),
+    }
+
+
+@register("morison", MorisonRequest)
+def morison(req: MorisonRequest) -> dict[str, Any]:
+    FpL = morison_inline_max_per_length_N(
+        req.D_m, req.u_amp_mps, req.a_amp_mps2, coeffs=MorisonCoeffs(Cd=req.Cd, Cm=req.Cm)
+    )
+    return {"force_per_length_Npm": FpL}
+
+
+@register("berthing", BerthingRequest)
+def berthing(req: BerthingRequest) -> dict[str, Any]:
+    E = berthing_energy_J(req.mass_tonnes, req.speed_knots, Ce=req.Ce, Cc=req.Cc, Cs=req.Cs)
+    RkN = fender_reaction_kN(E, efficiency=req.efficiency, deflection_m=req.deflection_m)
+    return {"energy_J": E, "fender_reaction_kN": RkN}
+
+
+@register("mooring", MooringRequest)
+def mooring(req: MooringRequest) -> dict[str, Any]:
+    env = EnvLoads(
+        A_wind_m2=req.A_wind_m2,
+        A_current_m2=req.A_current_m2,
+        U_wind_mps=req.U_wind_mps,
+        U_current_mps=req.U_current_mps,
+        Cd_wind=req.Cd_wind,
+        Cd_current=req.Cd_current,
+        safety_factor=req.safety_factor,
+    )
+    return {"total_load_N": mooring_total_load_N(env)}
+
+
+@register("pile-axial", PileAxialRequest)
+def pile_axial(req: PileAxialRequest) -> dict[str, Any]:
+    Q = pile_axial_capacity_kN(
+        PileAxialInputs(
+            shaft_length_m=req.shaft_length_m,
+            perimeter_m=req.perimeter_m,
+            area_tip_m2=req.area_tip_m2,
+            unit_skin_kPa=req.unit_skin_kPa,
+            unit_end_bearing_kPa=req.unit_end_bearing_kPa,
+        )
+    )
+    return {"capacity_kN": Q}
+
+
+@register("corrosion", CorrosionRequest)
+def corrosion(req: CorrosionRequest) -> dict[str, Any]:
+    t = remaining_thickness_mm(
+        CorrosionInputs(t0_mm=req.t0_mm, rate_mm_per_year=req.rate_mm_per_year, years=req.years)
+    )
+    return {"remaining_thickness_mm": t}
+
+
+@register("seawall", SeawallRequest)
+def seawall(req: SeawallRequest) -> dict[str, Any]:
+    return {"sliding_fs": sliding_fs(req.mu, req.W_kN, req.T_kN)}
+
+
+@register("scour", ScourRequest)
+def scour(req: ScourRequest) -> dict[str, Any]:
+    return {"scour_depth_m": pile_scour_depth_m(req.D_m, req.U_mps, K=req.K, m=req.m)}
+
+
+@register("tides", TideRequest)
+def tides(req: TideRequest) -> dict[str, Any]:
+    """Tide series as numpy arrays (callers choose the encoding)."""
+    cons = [
+        Constituent(amp_m=c.amp_m, omega_rad_s=2 * math.pi / c.period_s, phase_rad=c.phase_rad)
+        for c in req.constituents
+    ]
+    t, eta = tide_series(0.0, req.duration_s, req.dt_s, cons)
+    return {"t_s": t, "eta_m": eta}
+
+
+@dataclass(frozen=True)
+class ArrayCalc:
+    """Array form of a calculation in ``CALCS``, keyed by the request model's field names."""
+
+    name: str
+    params: tuple[str, ...]
+    defaults: dict[str, float]
+    outputs: tuple[str, ...]
+    run: Callable[..., dict[str, np.ndarray]]
+
+    def __call__(self, params: Mapping[str, ArrayLike]) -> dict[str, np.ndarray]:
+        """Evaluate with defaults filled in; extra keys in `params` are ignored."""
+        missing = [p for p in self.params if p not in params and p not in self.defaults]
+        if missing:
+            raise ValueError(f"{self.name} needs parameters: {', '.join(missing)}")
+        return self.run(**{p: params[p] if p in params else self.defaults[p] for p in self.params})
+
+
+ARRAY_CALCS: dict[str, ArrayCalc] = {}
+
+A = TypeVar("A", bound=Callable[..., dict[str, np.ndarray]])
+
+
+def register_array(name: str, outputs: tuple[str, ...]) -> Callable[[A], A]:
+    """Decorator adding the array form of calculation `name` to ``ARRAY_CALCS``."""
+    fields = CALCS[name].request_model.model_fields
+
+    def decorator(fn: A) -> A:
+        defaults = {p: f.default for p, f in fields.items() if not f.is_required()}
+        ARRAY_CALCS[name] = ArrayCalc(name, tuple(fields), defaults, outputs, fn)
+        return fn
+
+    return decorator
+
+
+def array_calc(name: str) -> ArrayCalc:
+    """Look up an array calculation; ValueError for an unknown name."""
+    calc = ARRAY_CALCS.get(name)
+    if calc is None:
+        raise ValueError(f"No array form of {name!r}; choose from {', '.join(ARRAY_CALCS)}")
+    return calc
+
+
+@register_array(
+    "waves", ("wavelength_m", "celerity_mps", "group_celerity_mps", "shoaling_coefficient")
+)
+def waves_array(T_s: ArrayLike, h_m: ArrayLike) -> dict[str, np.ndarray]:
+    props = vectorized.wave_properties(T_s, h_m)
+    del props["k"]
+    return props
+
+
+@register_array("morison", ("force_per_length_Npm",))
+def morison_array(
+    D_m: ArrayLike, u_amp_mps: ArrayLike, a_amp_mps2: ArrayLike, Cd: ArrayLike, Cm: ArrayLike
+) -> dict[str, np.ndarray]:
+    F = vectorized.morison_inline_max_per_length_N(D_m, u_amp_mps, a_amp_mps2, Cd, Cm)
+    return {"force_per_length_Npm": F}
+
+
+@register_array("berthing", ("energy_J", "fender_reaction_kN"))
+def berthing_array(
+    mass_tonnes: ArrayLike,
+    speed_knots: ArrayLike,
+    Ce: ArrayLike,
+    Cc: ArrayLike,
+    Cs: ArrayLike,
+    efficiency: ArrayLike,
+    deflection_m: ArrayLike,
+) -> dict[str, np.ndarray]:
+    E = vectorized.berthing_energy_J(mass_tonnes, speed_knots, Ce, Cc, Cs)
+    R = vectorized.fender_reaction_kN(E, efficiency, deflection_m)
+    return {"energy_J": E, "fender_reaction_kN": R}
+
+
+@register_array("mooring", ("total_load_N",))
+def mooring_array(
+    A_wind_m2: ArrayLike,
+    A_current_m2: ArrayLike,
+    U_wind_mps: ArrayLike,
+    U_current_mps: ArrayLike,
+    Cd_wind: ArrayLike,
+    Cd_current: ArrayLike,
+    safety_factor: ArrayLike,
+) -> dict[str, np.ndarray]:
+    F = vectorized.mooring_total_load_N(
+        A_wind_m2, A_current_m2, U_wind_mps, U_current_mps, Cd_wind, Cd_current, safety_factor
+    )
+    return {"total_load_N": F}
+
+
+@register_array("pile-axial", ("capacity_kN",))
+def pile_axial_array(
+    shaft_length_m: ArrayLike,
+    perimeter_m: ArrayLike,
+    area_tip_m2: ArrayLike,
+    unit_skin_kPa: ArrayLike,
+    unit_end_bearing_kPa: ArrayLike,
+) -> dict[str, np.ndarray]:
+    Q = vectorized.pile_axial_capacity_kN(
+        shaft_length_m, perimeter_m, area_tip_m2, unit_skin_kPa, unit_end_bearing_kPa
+    )
+    return {"capacity_kN": Q}
+
+
+@register_array("corrosion", ("remaining_thickness_mm",))
+def corrosion_array(
+    t0_mm: ArrayLike, rate_mm_per_year: ArrayLike, years: ArrayLike
+) -> dict[str, np.ndarray]:
+    return {
+        "remaining_thickness_mm": vectorized.remaining_thickness_mm(t0_mm, rate_mm_per_year, years)
+    }
+
+
+@register_array("seawall", ("sliding_fs",))
+def seawall_array(mu: ArrayLike, W_kN: ArrayLike, T_kN: ArrayLike) -> dict[str, np.ndarray]:
+    return {"sliding_fs": vectorized.sliding_fs(mu, W_kN, T_kN)}
+
+
+@register_array("scour", ("scour_depth_m",))
+def scour_array(
+    D_m: ArrayLike, U_mps: ArrayLike, K: ArrayLike, m: ArrayLike
+) -> dict[str, np.ndarray]:
+    return {"scour_depth_m": vectorized.pile_scour_depth_m(D_m, U_mps, K, m)}
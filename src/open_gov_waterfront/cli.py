@@ -1,39 +1,192 @@
 """
 Command-line interface for OpenGov-WaterfrontEngineering.
 
+Only the scalar calculation modules are imported at start-up. Commands that need numpy,
+pandas, pyarrow or httpx import their modules when they run, so quick commands such as
+``seawall-slide`` start fast; ``tests/test_cli_startup.py`` guards this.
+
+``--output json|csv|plain`` replaces the Rich panels and tables with unformatted,
+full-precision values written straight to stdout: one record for scalar commands, one
+row per line for commands that produce series or tables.
+
 Author: Nik Jois <nikjois@llamasearch.ai>
 """
 
 from __future__ import annotations
 
+import csv
+import json
+import math
+import sqlite3
+import sys
+from collections.abc import Iterable, Sequence
+from dataclasses import asdict
+from enum import StrEnum
 from pathlib import Path
+from typing import Any
 
 import typer
 from rich.console import Console
 from rich.panel import Panel
+from rich.table import Table
 from rich.theme import Theme
 
+from . import timing, tracing
 from .berthing import berthing_energy_J, fender_reaction_kN
 from .corrosion import CorrosionInputs, remaining_thickness_mm
 from .mooring import EnvLoads, mooring_total_load_N
 from .morison import MorisonCoeffs, morison_inline_max_per_length_N
 from .piles import PileAxialInputs, pile_axial_capacity_kN
-from .reports import write_report_template
+from .results import ResultsStore
 from .scour import pile_scour_depth_m
 from .seawall import sliding_fs
 from .states import list_states
-from .tides import Constituent, tide_series
 from .waves import celerity_c, group_celerity_cg, shoaling_coefficient, wavelength_L
 
 app = typer.Typer(
     help="OpenGov-WaterfrontEngineering: Marine/waterfront screening toolkit (CA/IN/OH)."
 )
 console = Console(theme=Theme({"info": "cyan", "error": "red", "success": "green"}))
+err_console = Console(stderr=True)
+
+
+class OutputFormat(StrEnum):
+    rich = "rich"
+    json = "json"
+    csv = "csv"
+    plain = "plain"
+
+
+# Set by the --output, --results-db, --project and --jurisdiction options of the callback.
+_output = OutputFormat.rich
+_results: ResultsStore | None = None
+_project: str | None = None
+_jurisdiction: str | None = None
+
+
+def _machine_output() -> bool:
+    return _output is not OutputFormat.rich
+
+
+def _json_line(record: dict[str, Any]) -> str:
+    """One JSON line; NaN and infinities, which JSON cannot represent, become null."""
+    clean = {
+        k: None if isinstance(v, float) and not math.isfinite(v) else v for k, v in record.items()
+    }
+    return json.dumps(clean, allow_nan=False) + "\n"
+
+
+def _write_rows(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> None:
+    """
+    Stream rows to stdout: JSON lines, CSV with a header, or space-separated values
+    without a header (plain).
+    """
+    out = sys.stdout
+    if _output is OutputFormat.json:
+        for row in rows:
+            out.write(_json_line(dict(zip(columns, row, strict=True))))
+    elif _output is OutputFormat.csv:
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(columns)
+        writer.writerows(rows)
+    else:
+        for row in rows:
+            out.write(" ".join(str(v) for v in row) + "\n")
+
+
+def _record(calc: str, inputs: dict[str, Any], outputs: dict[str, Any]) -> None:
+    """
+    Store a result when a results database is configured. Storage errors (a locked or
+    read-only database, say) are reported on stderr and do not stop the command.
+    """
+    if _results is None:
+        return
+    try:
+        _results.record(
+            calc, inputs, outputs, source="cli", project=_project, jurisdiction=_jurisdiction
+        )
+    except (sqlite3.Error, OSError) as e:
+        err_console.print(f"Could not record {calc} result: {e}")
+
+
+def _emit(record: dict[str, Any], text: str, title: str) -> None:
+    """Show one result: a Rich panel, or `record` in the selected machine format."""
+    if not _machine_output():
+        console.print(Panel(text, title=title))
+    elif _output is OutputFormat.json:
+        sys.stdout.write(_json_line(record))
+    elif _output is OutputFormat.csv:
+        _write_rows(list(record), [list(record.values())])
+    else:
+        sys.stdout.write("".join(f"{k}={v}\n" for k, v in record.items()))
+
+
+def _print_timings() -> None:
+    table = Table(title="Kernel Timings")
+    for col in ("kernel", "calls", "total ms", "mean us", "max us", "events"):
+        table.add_column(col, justify="left" if col in ("kernel", "events") else "right")
+    for name, stat in timing.snapshot().items():
+        events = ", ".join(f"{k}={v}" for k, v in sorted(stat["counters"].items()))
+        table.add_row(
+            name,
+            str(stat["calls"]),
+            f"{1e3 * stat['total_s']:.3f}",
+            f"{1e6 * stat['mean_s']:.1f}",
+            f"{1e6 * stat['max_s']:.1f}",
+            events,
+        )
+    err_console.print(table)
+
+
+@app.callback()
+def callback(
+    ctx: typer.Context,
+    trace: Path | None = typer.Option(
+        None,
+        "--trace",
+        help="Append calculation spans to this JSON-lines file (or set WATERFRONT_TRACE_FILE).",
+    ),
+    output: OutputFormat = typer.Option(
+        OutputFormat.rich,
+        "--output",
+        "-o",
+        help="Result format: rich panels, or json/csv/plain with full-precision values.",
+    ),
+    results_db: Path | None = typer.Option(
+        None,
+        "--results-db",
+        envvar="WATERFRONT_RESULTS_DB",
+        help="Record results in this SQLite results store.",
+    ),
+    project: str | None = typer.Option(None, "--project", help="Project label for results"),
+    jurisdiction: str | None = typer.Option(
+        None, "--jurisdiction", help="Jurisdiction label for results (e.g. CA)"
+    ),
+) -> None:
+    global _output, _results, _project, _jurisdiction
+    _output = output
+    _results = ResultsStore(results_db) if results_db is not None else None
+    _project, _jurisdiction = project, jurisdiction
+    if _results is not None:
+        ctx.call_on_close(_results.close)
+    # With WATERFRONT_TIMING set, report kernel timings (to stderr) after the command.
+    if timing.ENABLED:
+        ctx.call_on_close(_print_timings)
+    if trace is not None:
+        tracing.configure(trace)
+    if tracing.ENABLED:
+        ctx.with_resource(tracing.span(f"cli.{ctx.invoked_subcommand}"))
 
 
 @app.command("list-states")
 def cmd_list_states() -> None:
     """List supported state profiles (CA, IN, OH)."""
+    if _machine_output():
+        _write_rows(
+            ("code", "name", "waters", "agencies", "notes"),
+            ((p.code, p.name, p.waters, "; ".join(p.agencies), p.notes) for p in list_states()),
+        )
+        return
     lines = [
         f"{p.code}: {p.name} - Waters: {p.waters}; Agencies: {', '.join(p.agencies)}. {p.notes}"
         for p in list_states()
@@ -51,11 +204,17 @@ def cmd_waves(
     c = celerity_c(T_s, h_m)
     cg = group_celerity_cg(T_s, h_m)
     Ks = shoaling_coefficient(None, T_s, h_m)
-    console.print(
-        Panel(
-            f"L = {L:.2f} m\nc = {c:.2f} m/s\ncg = {cg:.2f} m/s\nKs = {Ks:.3f}",
-            title="Linear Waves",
-        )
+    result = {
+        "wavelength_m": L,
+        "celerity_mps": c,
+        "group_celerity_mps": cg,
+        "shoaling_coefficient": Ks,
+    }
+    _record("waves", {"T_s": T_s, "h_m": h_m}, result)
+    _emit(
+        result,
+        f"L = {L:.2f} m\nc = {c:.2f} m/s\ncg = {cg:.2f} m/s\nKs = {Ks:.3f}",
+        title="Linear Waves",
     )
 
 
@@ -69,8 +228,12 @@ def cmd_morison_max(
 ) -> None:
     """Calculate maximum Morison inline force per unit length on a pile."""
     FpL = morison_inline_max_per_length_N(D_m, u_amp, a_amp, coeffs=MorisonCoeffs(Cd=Cd, Cm=Cm))
-    console.print(
-        Panel(f"Max inline force per length = {FpL:.1f} N/m", title="Morison Inline Force")
+    inputs = {"D_m": D_m, "u_amp_mps": u_amp, "a_amp_mps2": a_amp, "Cd": Cd, "Cm": Cm}
+    _record("morison", inputs, {"force_per_length_Npm": FpL})
+    _emit(
+        {"force_per_length_Npm": FpL},
+        f"Max inline force per length = {FpL:.1f} N/m",
+        title="Morison Inline Force",
     )
 
 
@@ -87,8 +250,20 @@ def cmd_berthing(
     """Calculate berthing energy and fender reaction."""
     E = berthing_energy_J(mass_tonnes, speed_knots, Ce=Ce, Cc=Cc, Cs=Cs)
     RkN = fender_reaction_kN(E, efficiency=eff, deflection_m=defl_m)
-    console.print(
-        Panel(f"E = {E:,.0f} J\nR = {RkN:.1f} kN", title="Berthing Energy/Reaction")
+    inputs = {
+        "mass_tonnes": mass_tonnes,
+        "speed_knots": speed_knots,
+        "Ce": Ce,
+        "Cc": Cc,
+        "Cs": Cs,
+        "efficiency": eff,
+        "deflection_m": defl_m,
+    }
+    _record("berthing", inputs, {"energy_J": E, "fender_reaction_kN": RkN})
+    _emit(
+        {"energy_J": E, "fender_reaction_kN": RkN},
+        f"E = {E:,.0f} J\nR = {RkN:.1f} kN",
+        title="Berthing Energy/Reaction",
     )
 
 
@@ -113,7 +288,8 @@ def cmd_mooring(
         safety_factor=SF,
     )
     F = mooring_total_load_N(env)
-    console.print(Panel(f"Total mooring load = {F/1000:.1f} kN", title="Mooring Load"))
+    _record("mooring", asdict(env), {"total_load_N": F})
+    _emit({"total_load_N": F}, f"Total mooring load = {F / 1000:.1f} kN", title="Mooring Load")
 
 
 @app.command("pile-axial")
@@ -125,16 +301,16 @@ def cmd_pile_axial(
     qb_kPa: float = typer.Option(..., "--qb"),
 ) -> None:
     """Calculate pile axial capacity."""
-    Q = pile_axial_capacity_kN(
-        PileAxialInputs(
-            shaft_length_m=shaft_len,
-            perimeter_m=perimeter,
-            area_tip_m2=area_tip,
-            unit_skin_kPa=qs_kPa,
-            unit_end_bearing_kPa=qb_kPa,
-        )
+    pile = PileAxialInputs(
+        shaft_length_m=shaft_len,
+        perimeter_m=perimeter,
+        area_tip_m2=area_tip,
+        unit_skin_kPa=qs_kPa,
+        unit_end_bearing_kPa=qb_kPa,
     )
-    console.print(Panel(f"Axial capacity = {Q:.0f} kN", title="Pile Axial Capacity"))
+    Q = pile_axial_capacity_kN(pile)
+    _record("pile-axial", asdict(pile), {"capacity_kN": Q})
+    _emit({"capacity_kN": Q}, f"Axial capacity = {Q:.0f} kN", title="Pile Axial Capacity")
 
 
 @app.command("corrosion")
@@ -144,10 +320,14 @@ def cmd_corrosion(
     years: float = typer.Option(..., "--years"),
 ) -> None:
     """Calculate remaining thickness after corrosion."""
-    t_rem = remaining_thickness_mm(
-        CorrosionInputs(t0_mm=t0_mm, rate_mm_per_year=rate, years=years)
+    corrosion = CorrosionInputs(t0_mm=t0_mm, rate_mm_per_year=rate, years=years)
+    t_rem = remaining_thickness_mm(corrosion)
+    _record("corrosion", asdict(corrosion), {"remaining_thickness_mm": t_rem})
+    _emit(
+        {"remaining_thickness_mm": t_rem},
+        f"Remaining thickness = {t_rem:.2f} mm",
+        title="Corrosion Allowance",
     )
-    console.print(Panel(f"Remaining thickness = {t_rem:.2f} mm", title="Corrosion Allowance"))
 
 
 @app.command("seawall-slide")
@@ -158,7 +338,8 @@ def cmd_seawall_slide(
 ) -> None:
     """Calculate seawall sliding factor of safety."""
     FS = sliding_fs(mu, W_kN, T_kN)
-    console.print(Panel(f"Sliding FS = {FS:.2f}", title="Seawall Sliding"))
+    _record("seawall", {"mu": mu, "W_kN": W_kN, "T_kN": T_kN}, {"sliding_fs": FS})
+    _emit({"sliding_fs": FS}, f"Sliding FS = {FS:.2f}", title="Seawall Sliding")
 
 
 @app.command("scour-pile")
@@ -170,7 +351,12 @@ def cmd_scour_pile(
 ) -> None:
     """Calculate local scour depth at pile (screening)."""
     ys = pile_scour_depth_m(D_m, U_mps, K=K, m=mexp)
-    console.print(Panel(f"Estimated local scour = {ys:.2f} m", title="Pile Scour (Screening)"))
+    _record("scour", {"D_m": D_m, "U_mps": U_mps, "K": K, "m": mexp}, {"scour_depth_m": ys})
+    _emit(
+        {"scour_depth_m": ys},
+        f"Estimated local scour = {ys:.2f} m",
+        title="Pile Scour (Screening)",
+    )
 
 
 @app.command("tides")
@@ -183,29 +369,431 @@ def cmd_tides(
     P2: float = typer.Option(0.0, "--P2"),
     dur: float = typer.Option(43200.0, "--dur", help="Duration (s)"),
     dt: float = typer.Option(600.0, "--dt", help="Time step (s)"),
+    out: Path | None = typer.Option(
+        None, "--out", help="Write the series (t_s, eta_m) to CSV or .parquet"
+    ),
 ) -> None:
-    """Generate tide synthesis from constituents."""
+    """
+    Generate tide synthesis from constituents. With --output json/csv/plain and no --out,
+    the series itself is streamed to stdout, one (t_s, eta_m) row per line.
+    """
     import math
 
+    from .tides import Constituent, tide_series
+
     cons = [Constituent(amp_m=A1, omega_rad_s=2 * math.pi / T1, phase_rad=P1)]
     if A2 > 0 and T2 > 0:
         cons.append(Constituent(amp_m=A2, omega_rad_s=2 * math.pi / T2, phase_rad=P2))
     t, eta = tide_series(0.0, dur, dt, cons)
-    console.print(
-        Panel(
-            f"Generated {len(t)} points. Max eta = {float(eta.max()):.2f} m, Min eta = {float(eta.min()):.2f} m",
-            title="Tide Synthesis",
+    eta_max, eta_min = float(eta.max()), float(eta.min())
+    summary = {"points": len(t), "eta_max_m": eta_max, "eta_min_m": eta_min}
+    used = [(A1, T1, P1)] + ([(A2, T2, P2)] if len(cons) > 1 else [])
+    inputs = {
+        "constituents": [{"amp_m": a, "period_s": p, "phase_rad": ph} for a, p, ph in used],
+        "duration_s": dur,
+        "dt_s": dt,
+    }
+    _record("tides", inputs, summary)
+    if out is None and _machine_output():
+        _write_rows(("t_s", "eta_m"), zip(t.tolist(), eta.tolist(), strict=True))
+        return
+    _emit(
+        summary,
+        f"Generated {len(t)} points. Max eta = {eta_max:.2f} m, Min eta = {eta_min:.2f} m",
+        title="Tide Synthesis",
+    )
+    if out is not None:
+        import pandas as pd
+
+        from . import columnar
+
+        columnar.write_table(pd.DataFrame({"t_s": t, "eta_m": eta}), out)
+        if not _machine_output():
+            console.print(f"[success]Wrote {len(t)} points to {out}[/success]")
+
+
+@app.command("trace-summary")
+def cmd_trace_summary(
+    trace_file: Path = typer.Argument(..., exists=True, dir_okay=False, help="Span file"),
+) -> None:
+    """Summarize a trace file: time per pipeline stage, nested by caller."""
+    stages = tracing.summarize(tracing.read_trace(trace_file))
+    if not stages:
+        console.print("[error]No spans found[/error]")
+        raise typer.Exit(code=1)
+    root_total = sum(s.total_s for s in stages if s.depth == 0)
+    if _machine_output():
+        _write_rows(
+            ("stage", "depth", "count", "total_s", "self_s", "max_s"),
+            (("/".join(s.path), s.depth, s.count, s.total_s, s.self_s, s.max_s) for s in stages),
         )
+        return
+    table = Table(title=f"Trace Summary: {trace_file}")
+    for col in ("stage", "count", "total ms", "self ms", "max ms", "% of roots"):
+        table.add_column(col, justify="left" if col == "stage" else "right")
+    for s in stages:
+        table.add_row(
+            "  " * s.depth + s.path[-1],
+            str(s.count),
+            f"{1e3 * s.total_s:.3f}",
+            f"{1e3 * s.self_s:.3f}",
+            f"{1e3 * s.max_s:.3f}",
+            f"{100 * s.total_s / root_total:.1f}" if root_total > 0 else "-",
+        )
+    console.print(table)
+
+
+@app.command("loadtest")
+def cmd_loadtest(
+    url: str | None = typer.Option(
+        None, "--url", help="Base URL of a running server (default: in-process app)"
+    ),
+    mix: str | None = typer.Option(
+        None,
+        "--mix",
+        help="Endpoint weights, e.g. 'waves=4,tides=1' or 'all' (default: a mixed profile)",
+    ),
+    concurrency: int = typer.Option(16, "--concurrency", "-c", help="Concurrent clients"),
+    duration: float | None = typer.Option(
+        None, "--duration", help="Run time in s (default 10 unless --requests is given)"
+    ),
+    requests: int | None = typer.Option(None, "--requests", help="Stop after N requests"),
+    seed: int = typer.Option(0, "--seed", help="Seed for the endpoint mix"),
+    json_out: Path | None = typer.Option(None, "--json-out", help="Also write results as JSON"),
+) -> None:
+    """Load-test the API and report throughput and p50/p95/p99 latency per endpoint."""
+    import asyncio
+    import logging
+
+    from . import loadtest
+
+    # Per-request client logging would swamp the report.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    try:
+        weights = loadtest.parse_mix(mix or loadtest.DEFAULT_MIX)
+        result = asyncio.run(
+            loadtest.run_load(
+                weights,
+                url=url,
+                concurrency=concurrency,
+                duration_s=10.0 if duration is None and requests is None else duration,
+                requests=requests,
+                seed=seed,
+            )
+        )
+    except ValueError as e:
+        console.print(f"[error]{e}[/error]")
+        raise typer.Exit(code=2)
+
+    data = result.as_dict()
+    if json_out is not None:
+        json_out.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    rows = [*data["endpoints"].items(), ("total", data["total"])]
+    if _machine_output():
+        keys = list(data["total"])
+        _write_rows(["endpoint", *keys], ([name, *(row[k] for k in keys)] for name, row in rows))
+        return
+    table = Table(
+        title=f"Load test: {result.target}, {concurrency} clients, {result.elapsed_s:.1f} s"
     )
+    for col in ("endpoint", "requests", "req/s", "p50 ms", "p95 ms", "p99 ms", "max ms"):
+        table.add_column(col, justify="left" if col == "endpoint" else "right")
+    for col in ("errors", "shed"):
+        table.add_column(col, justify="right")
+    for name, row in rows:
+        table.add_row(
+            name,
+            str(row["requests"]),
+            f"{row['rps']:.0f}",
+            f"{row['p50_ms']:.2f}",
+            f"{row['p95_ms']:.2f}",
+            f"{row['p99_ms']:.2f}",
+            f"{row['max_ms']:.2f}",
+            str(row["errors"]),
+            str(row["shed"]),
+        )
+    console.print(table)
+    if json_out is not None:
+        console.print(f"[success]Wrote {json_out}[/success]")
 
 
 @app.command("report-template")
 def cmd_report_template(
-    out: Path = typer.Option(Path("waterfront_report_template.csv"), "--out")
+    out: Path = typer.Option(Path("waterfront_report_template.csv"), "--out"),
 ) -> None:
-    """Write a report template CSV."""
+    """Write a report template (CSV, or Parquet for a .parquet path)."""
+    from .reports import write_report_template
+
     write_report_template(out)
-    console.print(Panel(f"Wrote report template to {out}", title="Report Template"))
+    _emit({"out": str(out)}, f"Wrote report template to {out}", title="Report Template")
+
+
+@app.command("run-report")
+def cmd_run_report(
+    input_file: Path = typer.Argument(
+        ..., exists=True, dir_okay=False, help="Filled report template (CSV or .parquet)"
+    ),
+    out: Path = typer.Option(Path("waterfront_report_results.csv"), "--out"),
+    chunksize: int | None = typer.Option(
+        None, "--chunksize", help="Rows per chunk (bounds memory; default 50,000)"
+    ),
+    workers: int = typer.Option(1, "--workers", "-w", help="Worker processes (0 = one per CPU)"),
+    keep: str | None = typer.Option(
+        None, "--keep", help="Comma-separated input columns to carry into the output"
+    ),
+    skip_existing: bool = typer.Option(
+        False,
+        "--skip-existing",
+        help="Reuse stored results for rows whose inputs already have one (needs --results-db)",
+    ),
+) -> None:
+    """
+    Run wave, Morison, mooring, berthing and seawall checks for every project row. With
+    --results-db each row's result is recorded under the calculation name "report".
+    """
+    from rich.progress import BarColumn, MofNCompleteColumn, Progress, TimeElapsedColumn
+
+    from . import batch, columnar
+
+    try:
+        total = columnar.estimate_rows(input_file)
+        with Progress(
+            "[progress.description]{task.description}",
+            BarColumn(),
+            MofNCompleteColumn(),
+            TimeElapsedColumn(),
+            console=console,
+            transient=True,
+            disable=_machine_output(),
+        ) as bar:
+            task = bar.add_task("rows", total=total or None)
+            summary = batch.run_report(
+                input_file,
+                out,
+                chunksize=chunksize or batch.DEFAULT_CHUNKSIZE,
+                workers=workers,
+                progress=lambda n: bar.advance(task, n),
+                keep=[c.strip() for c in keep.split(",") if c.strip()] if keep else None,
+                results=_results,
+                skip_existing=skip_existing,
+            )
+    except (ValueError, RuntimeError) as e:
+        console.print(f"[error]{e}[/error]")
+        raise typer.Exit(code=2)
+    n_workers = batch.resolve_workers(workers)
+    errors = ", ".join(f"{name}={n}" for name, n in summary.error_rows.items() if n)
+    _emit(
+        {
+            "rows": summary.rows,
+            "chunks": summary.chunks,
+            "workers": n_workers,
+            "elapsed_s": summary.elapsed_s,
+            "skipped_rows": summary.skipped_rows,
+            **{f"{name}_error_rows": n for name, n in summary.error_rows.items()},
+            "out": str(out),
+        },
+        f"{summary.rows:,} rows in {summary.chunks} chunk(s), "
+        f"{n_workers} worker(s), {summary.elapsed_s:.2f} s\n"
+        f"Rows with input errors: {errors or 'none'}\n"
+        + (f"Rows reused from the store: {summary.skipped_rows:,}\n" if skip_existing else "")
+        + f"Wrote {out}",
+        title="Report Run",
+    )
+
+
+@app.command("ais-berthing")
+def cmd_ais_berthing(
+    input_file: Path = typer.Argument(
+        ..., exists=True, dir_okay=False, help="Berthing events (CSV or .parquet)"
+    ),
+    threshold: list[float] = typer.Option(
+        [], "--threshold", "-t", help="Energy (J) whose exceedances to count; repeatable"
+    ),
+    efficiency: float = typer.Option(0.7, "--eff", help="Default fender efficiency"),
+    deflection: float = typer.Option(0.5, "--defl", help="Default fender deflection (m)"),
+    chunksize: int | None = typer.Option(
+        None, "--chunksize", help="Rows per chunk (bounds memory; default 200,000)"
+    ),
+    events_out: Path | None = typer.Option(
+        None, "--events-out", help="Also write every event with its energy and reaction"
+    ),
+    out: Path | None = typer.Option(None, "--out", help="Write the per-berth table here"),
+) -> None:
+    """
+    Berthing energy statistics per berth from an AIS event log with berth, vessel_type,
+    displacement_tonnes and speed_knots columns, in one streaming pass.
+    """
+    from . import ais, columnar
+
+    try:
+        summary = ais.summarize_log(
+            input_file,
+            chunksize or ais.DEFAULT_CHUNKSIZE,
+            thresholds=threshold,
+            efficiency=efficiency,
+            deflection_m=deflection,
+            events_out=events_out,
+        )
+    except (ValueError, RuntimeError) as e:
+        console.print(f"[error]{e}[/error]")
+        raise typer.Exit(code=2)
+    frame = summary.to_frame()
+    if out is not None:
+        columnar.write_table(frame, out)
+    if _machine_output():
+        _write_rows(list(frame.columns), frame.itertuples(index=False, name=None))
+        return
+    table = Table(title=f"Berthing energy by berth: {summary.events:,} events")
+    for col in frame.columns:
+        table.add_column(col, justify="left" if col == "berth" else "right")
+    for row in frame.itertuples(index=False, name=None):
+        table.add_row(*(f"{v:.4g}" if isinstance(v, float) else str(v) for v in row))
+    console.print(table)
+    if summary.unassigned:
+        console.print(f"Events without a berth: {summary.unassigned:,}")
+    if summary.unknown_types:
+        unknown = ", ".join(f"{k} ({n:,})" for k, n in summary.unknown_types.items())
+        console.print(f"Unknown vessel types (other defaults used): {unknown}")
+    for path in (p for p in (out, events_out) if p is not None):
+        console.print(f"[success]Wrote {path}[/success]")
+
+
+class FenderObjective(StrEnum):
+    mass = "mass"
+    cost = "cost"
+
+
+@app.command("select-fenders")
+def cmd_select_fenders(
+    catalog_file: Path = typer.Argument(
+        ..., exists=True, dir_okay=False, help="Fender catalog (JSON, CSV or .parquet)"
+    ),
+    energy: float | None = typer.Option(None, "--energy", help="Design berthing energy (J)"),
+    max_reaction: float | None = typer.Option(
+        None, "--max-reaction", help="Allowable fender reaction (kN)"
+    ),
+    berths: Path | None = typer.Option(
+        None,
+        "--berths",
+        exists=True,
+        dir_okay=False,
+        help="Table of berths with energy_J and max_reaction_kN columns",
+    ),
+    by: FenderObjective = typer.Option(FenderObjective.mass, "--by", help="Minimize mass or cost"),
+    out: Path | None = typer.Option(None, "--out", help="Write the berths with their selection"),
+) -> None:
+    """
+    Pick the lightest (or cheapest) catalog fender with rated energy >= the design energy
+    and rated reaction <= the allowable reaction, for one berth or a table of berths.
+    """
+    import pandas as pd
+
+    from . import columnar, fenders
+
+    try:
+        catalog = fenders.load_catalog(catalog_file)
+        if berths is not None:
+            table = columnar.read_table(berths)
+            missing = [c for c in ("energy_J", "max_reaction_kN") if c not in table]
+            if missing:
+                raise ValueError(f"Berths table is missing columns: {', '.join(missing)}")
+        elif energy is not None and max_reaction is not None:
+            table = pd.DataFrame({"energy_J": [energy], "max_reaction_kN": [max_reaction]})
+        else:
+            raise ValueError("Give --energy and --max-reaction, or --berths")
+        chosen = catalog.select(table["energy_J"], table["max_reaction_kN"], by=by.value)
+    except (ValueError, RuntimeError) as e:
+        console.print(f"[error]{e}[/error]")
+        raise typer.Exit(code=2)
+    models = catalog.to_frame().add_prefix("fender_")
+    picked = models.reindex(chosen).reset_index(drop=True)
+    result = table.reset_index(drop=True).join(picked)
+    if out is not None:
+        columnar.write_table(result, out)
+    if _machine_output():
+        records = result.astype(object).where(result.notna(), None)
+        _write_rows(list(result.columns), records.itertuples(index=False, name=None))
+        return
+    view = Table(title=f"Fender selection by {by.value}: {catalog_file.name}")
+    for col in result.columns:
+        view.add_column(col, justify="right" if col != "fender_model" else "left")
+    for row in result.itertuples(index=False, name=None):
+        view.add_row(
+            *("-" if pd.isna(v) else f"{v:.4g}" if isinstance(v, float) else str(v) for v in row)
+        )
+    console.print(view)
+    if out is not None:
+        console.print(f"[success]Wrote {out}[/success]")
+
+
+@app.command("serve-stdio")
+def cmd_serve_stdio() -> None:
+    """
+    Answer JSON-lines calculation requests from stdin on stdout until end of input, e.g.
+    {"calc": "berthing", "mass_tonnes": 50000, "speed_knots": 0.3}.
+    """
+    import sys
+
+    from .stdio import serve
+
+    summary = serve(sys.stdin.buffer, sys.stdout.buffer, results=_results)
+    if summary.errors:
+        err_console.print(f"{summary.errors} of {summary.requests} request(s) failed")
+
+
+@app.command("query-results")
+def cmd_query_results(
+    calc: str | None = typer.Option(None, "--calc", help="Calculation name, e.g. berthing"),
+    project: str | None = typer.Option(None, "--project"),
+    jurisdiction: str | None = typer.Option(None, "--jurisdiction"),
+    input_hash: str | None = typer.Option(None, "--hash", help="Input hash"),
+    limit: int = typer.Option(20, "--limit", min=1, help="Most recent results to show"),
+) -> None:
+    """Show stored results from the results database (--results-db), newest first."""
+    if _results is None:
+        console.print(
+            "[error]No results database: pass --results-db or set WATERFRONT_RESULTS_DB[/error]"
+        )
+        raise typer.Exit(code=2)
+    found = _results.query(
+        calc=calc,
+        project=project or _project,
+        jurisdiction=jurisdiction or _jurisdiction,
+        input_hash=input_hash,
+        limit=limit,
+    )
+    columns = ("id", "created_at", "calc", "project", "jurisdiction", "version", "source")
+    if _machine_output():
+        _write_rows(
+            (*columns, "input_hash", "inputs", "outputs"),
+            (
+                (
+                    *(getattr(r, c) for c in columns),
+                    r.input_hash,
+                    json.dumps(r.inputs),
+                    json.dumps(r.outputs),
+                )
+                for r in found
+            ),
+        )
+        return
+    table = Table(title=f"Stored results: {_results.path}")
+    for col in ("id", "time (UTC)", "calc", "project", "jurisdiction", "hash", "outputs"):
+        table.add_column(col, justify="right" if col == "id" else "left")
+    for r in found:
+        outputs = "\n".join(
+            f"{k}={v:.6g}" if isinstance(v, float) else f"{k}={v}" for k, v in r.outputs.items()
+        )
+        table.add_row(
+            str(r.id),
+            r.created_at[:19].replace("T", " "),
+            r.calc,
+            r.project or "",
+            r.jurisdiction or "",
+            r.input_hash[:12],
+            outputs,
+        )
+    console.print(table)
 
 
 if __name__ == "__main__":
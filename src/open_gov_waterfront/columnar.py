@@ -0,0 +1,184 @@
+"""
+Tabular file I/O for batch inputs and results: CSV by default, Parquet when the path ends
+in ``.parquet`` (or ``.pq``) and pyarrow is installed (the ``parquet`` extra).
+
+Readers stream a file in chunks and can project columns, so only the needed fields are
+parsed; Parquet files are read row group by row group with ``iter_batches``. Writers
+append one chunk at a time; each Parquet chunk becomes a row group, so a file written by
+a batch run can itself be streamed back chunk by chunk. pyarrow is imported only when a
+Parquet file is actually used.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping, Sequence
+from pathlib import Path
+from types import TracebackType
+from typing import Any, TextIO
+
+import pandas as pd
+
+PARQUET_SUFFIXES = frozenset({".parquet", ".pq"})
+
+
+def is_parquet(path: Path) -> bool:
+    return path.suffix.lower() in PARQUET_SUFFIXES
+
+
+def _arrow() -> tuple[Any, Any]:
+    """The pyarrow and pyarrow.parquet modules, imported on first use."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:  # pragma: no cover - exercised only without the 'parquet' extra
+        raise RuntimeError("Parquet files need pyarrow; install the 'parquet' extra") from None
+    return pa, pq
+
+
+def read_columns(path: Path) -> list[str]:
+    """Column names of a CSV or Parquet file without reading its rows."""
+    if is_parquet(path):
+        _, pq = _arrow()
+        return list(pq.ParquetFile(path).schema_arrow.names)
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def estimate_rows(path: Path) -> int:
+    """
+    Data rows in a file: exact for Parquet (from metadata), a line count for CSV (an
+    estimate, since quoted fields may hold newlines).
+    """
+    if is_parquet(path):
+        _, pq = _arrow()
+        return int(pq.ParquetFile(path).metadata.num_rows)
+    lines = 0
+    with path.open("rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            lines += block.count(b"\n")
+    return max(0, lines - 1)
+
+
+def iter_chunks(
+    path: Path,
+    chunksize: int,
+    columns: Sequence[str] | None = None,
+    dtype: Mapping[str, Any] | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield DataFrames of at most `chunksize` rows with only `columns` (all when None),
+    kept in file order. An empty file yields a single empty frame with the header.
+    """
+    if is_parquet(path):
+        _, pq = _arrow()
+        pf = pq.ParquetFile(path)
+        names = pf.schema_arrow.names
+        if columns is not None:
+            wanted = set(columns)
+            names = [n for n in names if n in wanted]
+        empty = True
+        for batch in pf.iter_batches(batch_size=chunksize, columns=names):
+            empty = False
+            yield batch.to_pandas()
+        if empty:
+            yield pf.schema_arrow.empty_table().select(names).to_pandas()
+        return
+    usecols = list(columns) if columns is not None else None
+    with pd.read_csv(path, chunksize=chunksize, usecols=usecols, dtype=dtype) as reader:
+        yield from reader
+
+
+def read_table(path: Path, columns: Sequence[str] | None = None) -> pd.DataFrame:
+    """Read a whole CSV or Parquet file (optionally only `columns`)."""
+    if is_parquet(path):
+        _, pq = _arrow()
+        return pq.read_table(path, columns=list(columns) if columns else None).to_pandas()
+    return pd.read_csv(path, usecols=list(columns) if columns else None)
+
+
+class TableWriter:
+    """
+    Append DataFrame chunks to a CSV or Parquet file. `dtypes` pins the Arrow type of
+    named columns ("float64" or "string") so chunks that are all-null in a column still
+    match the schema taken from the first chunk.
+    """
+
+    def __init__(self, path: Path, dtypes: Mapping[str, str] | None = None) -> None:
+        self.path = path
+        self.parquet = is_parquet(path)
+        self.dtypes = dict(dtypes or {})
+        self._csv: TextIO | None = None
+        self._writer: Any = None
+        self._schema: Any = None
+        self._header_written = False
+        if self.parquet:
+            self._pa, self._pq = _arrow()
+        else:
+            self._csv = path.open("w", newline="", encoding="utf-8")
+
+    def write_csv_text(self, text: str) -> None:
+        """Append pre-rendered CSV text (header included on the first chunk)."""
+        if self._csv is None:
+            raise RuntimeError("write_csv_text is only valid for CSV output")
+        self._csv.write(text)
+        self._header_written = True
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self._csv is not None:
+            df.to_csv(self._csv, index=False, header=not self._header_written)
+            self._header_written = True
+            return
+        df = self._coerce(df)
+        if self._schema is None:
+            self._schema = self._build_schema(df)
+            self._writer = self._pq.ParquetWriter(self.path, self._schema)
+        table = self._pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+        self._writer.write_table(table, row_group_size=max(1, len(df)))
+
+    def _coerce(self, df: pd.DataFrame) -> pd.DataFrame:
+        df = df.copy()
+        for col, kind in self.dtypes.items():
+            if col not in df:
+                continue
+            if kind == "float64":
+                df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+            else:
+                df[col] = df[col].astype("string")
+        return df
+
+    def _build_schema(self, df: pd.DataFrame) -> Any:
+        pa = self._pa
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+        fields = []
+        for field in schema:
+            kind = self.dtypes.get(field.name)
+            if kind == "float64":
+                field = field.with_type(pa.float64())
+            elif kind == "string" or pa.types.is_null(field.type):
+                field = field.with_type(pa.string())
+            fields.append(field)
+        return pa.schema(fields)
+
+    def close(self) -> None:
+        if self._csv is not None:
+            self._csv.close()
+        elif self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self) -> TableWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def write_table(df: pd.DataFrame, path: Path, dtypes: Mapping[str, str] | None = None) -> None:
+    """Write a whole DataFrame to CSV or Parquet."""
+    with TableWriter(path, dtypes) as writer:
+        writer.write(df)
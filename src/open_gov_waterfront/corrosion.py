@@ -8,6 +8,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from .timing import timed
+
 
 @dataclass(frozen=True)
 class CorrosionInputs:
@@ -16,6 +18,7 @@ class CorrosionInputs:
     years: float
 
 
+@timed
 def remaining_thickness_mm(inp: CorrosionInputs) -> float:
     t = inp.t0_mm - inp.rate_mm_per_year * inp.years
     return float(max(0.0, t))
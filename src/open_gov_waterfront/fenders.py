@@ -0,0 +1,180 @@
+"""
+Fender catalog: the lightest or cheapest model meeting energy and reaction limits.
+
+A catalog lists fender models with their rated energy (kJ), rated reaction (kN),
+deflection (m) and, optionally, mass (kg) and cost. ``FenderCatalog.select`` answers
+"the best model by `by` with energy >= E and reaction <= R_max" for whole arrays of
+berths at once.
+
+Queries go through an index built once per objective. Models are ranked by the objective
+(ties broken by lower reaction, then higher energy, then catalog order), and a model is
+dropped when a better-ranked one has at least its energy and at most its reaction: it can
+never be the answer. The remaining skyline is laid on a grid of its distinct reactions
+(ascending) by its distinct energies (ascending), and the grid is reduced to the best rank
+over reactions <= R and energies >= E with two cumulative minima. A query is then two
+``searchsorted`` bisections and a table lookup, with no scan of the catalog.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping, Sequence
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+import pandas as pd
+from numpy.typing import ArrayLike
+
+from . import columnar
+
+Objective = Literal["mass", "cost"]
+OBJECTIVES: dict[str, str] = {"mass": "mass_kg", "cost": "cost"}
+NONE = -1  # select() result where no model meets the limits
+
+
+@dataclass(frozen=True)
+class FenderModel:
+    """One catalog entry; `mass_kg` and `cost` are NaN when the catalog omits them."""
+
+    model: str
+    energy_kJ: float
+    reaction_kN: float
+    deflection_m: float
+    mass_kg: float = float("nan")
+    cost: float = float("nan")
+
+    def __post_init__(self) -> None:
+        if not (self.energy_kJ > 0 and self.reaction_kN > 0 and self.deflection_m > 0):
+            raise ValueError(f"{self.model}: energy, reaction and deflection must be > 0")
+
+
+@dataclass(frozen=True)
+class _Index:
+    """Skyline grid for one objective: best catalog position per (reaction, energy) cell."""
+
+    reactions: np.ndarray  # distinct skyline reactions, ascending
+    energies: np.ndarray  # distinct skyline energies, ascending
+    best: np.ndarray  # catalog position, NONE where no skyline model fits the cell
+
+    @classmethod
+    def build(cls, energy: np.ndarray, reaction: np.ndarray, value: np.ndarray) -> _Index:
+        order = np.lexsort((np.arange(len(value)), -energy, reaction, value))
+        e, r = energy[order], reaction[order]
+        # Model k is dominated when a better-ranked model j < k has e_j >= e_k and r_j <= r_k.
+        covers = (e[:, None] >= e[None, :]) & (r[:, None] <= r[None, :])
+        dominated = np.triu(covers, k=1).any(axis=0)
+        sky = order[~dominated]
+        reactions, energies = np.unique(reaction[sky]), np.unique(energy[sky])
+        rank = np.full((len(reactions), len(energies)), len(sky), dtype=np.int64)
+        i = np.searchsorted(reactions, reaction[sky])
+        j = np.searchsorted(energies, energy[sky])
+        rank[i, j] = np.arange(len(sky))
+        # Best rank over reactions <= row's and energies >= column's.
+        rank = np.minimum.accumulate(rank, axis=0)
+        rank = np.minimum.accumulate(rank[:, ::-1], axis=1)[:, ::-1]
+        best = np.append(sky, NONE)[rank]
+        return cls(reactions, energies, best)
+
+    def query(self, energy_kJ: np.ndarray, max_reaction_kN: np.ndarray) -> np.ndarray:
+        i = np.searchsorted(self.reactions, max_reaction_kN, side="right") - 1
+        j = np.searchsorted(self.energies, energy_kJ, side="left")
+        ok = (i >= 0) & (j < len(self.energies))
+        ok &= ~(np.isnan(energy_kJ) | np.isnan(max_reaction_kN))
+        out = np.full(np.shape(i), NONE, dtype=np.int64)
+        out[ok] = self.best[i[ok], j[ok]]
+        return out
+
+
+class FenderCatalog:
+    """Fender models with per-objective selection indexes built on first use."""
+
+    def __init__(self, models: Sequence[FenderModel]) -> None:
+        if not models:
+            raise ValueError("A fender catalog needs at least one model")
+        names = [m.model for m in models]
+        if len(set(names)) != len(names):
+            dupes = sorted({n for n in names if names.count(n) > 1})
+            raise ValueError(f"Duplicate fender models: {', '.join(dupes)}")
+        self.models = list(models)
+        self.energy_kJ = np.array([m.energy_kJ for m in models])
+        self.reaction_kN = np.array([m.reaction_kN for m in models])
+        self._indexes: dict[str, _Index] = {}
+
+    def __len__(self) -> int:
+        return len(self.models)
+
+    def __getitem__(self, position: int) -> FenderModel:
+        return self.models[position]
+
+    def _index(self, by: Objective) -> _Index:
+        if by not in OBJECTIVES:
+            raise ValueError(f"Unknown objective {by!r}; use one of {', '.join(OBJECTIVES)}")
+        if by not in self._indexes:
+            value = np.array([getattr(m, OBJECTIVES[by]) for m in self.models])
+            if np.isnan(value).any():
+                missing = [m.model for m, v in zip(self.models, value, strict=True) if np.isnan(v)]
+                raise ValueError(f"Models without {OBJECTIVES[by]}: {', '.join(missing)}")
+            self._indexes[by] = _Index.build(self.energy_kJ, self.reaction_kN, value)
+        return self._indexes[by]
+
+    def select(
+        self, energy_J: ArrayLike, max_reaction_kN: ArrayLike, by: Objective = "mass"
+    ) -> np.ndarray:
+        """
+        Catalog position of the best model by `by` with rated energy >= `energy_J` and
+        rated reaction <= `max_reaction_kN`, elementwise over broadcast arrays; ``NONE``
+        (-1) where no model qualifies or a limit is NaN.
+        """
+        E, R = np.broadcast_arrays(
+            np.asarray(energy_J, dtype=float) / 1000.0, np.asarray(max_reaction_kN, dtype=float)
+        )
+        return self._index(by).query(E, R)
+
+    def pick(
+        self, energy_J: float, max_reaction_kN: float, by: Objective = "mass"
+    ) -> FenderModel | None:
+        """The best model for one berth, or None."""
+        position = int(self.select(energy_J, max_reaction_kN, by))
+        return None if position == NONE else self.models[position]
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame([asdict(m) for m in self.models])
+
+
+def catalog_from_records(records: Sequence[Mapping[str, Any]]) -> FenderCatalog:
+    """Build a catalog from mappings with the ``FenderModel`` field names."""
+    known = {f.name for f in fields(FenderModel)}
+    models = []
+    for i, record in enumerate(records):
+        missing = [
+            k for k in ("model", "energy_kJ", "reaction_kN", "deflection_m") if k not in record
+        ]
+        if missing:
+            raise ValueError(f"Catalog entry {i} is missing: {', '.join(missing)}")
+        values = {k: v for k, v in record.items() if k in known}
+        for k in values.keys() - {"model"}:
+            v = values[k]
+            values[k] = float("nan") if v is None or v == "" else float(v)
+        values["model"] = str(values["model"])
+        models.append(FenderModel(**values))
+    return FenderCatalog(models)
+
+
+def load_catalog(path: Path) -> FenderCatalog:
+    """
+    Load a catalog from JSON (a list of entries, or ``{"fenders": [...]}``), CSV or
+    Parquet, with columns named like the ``FenderModel`` fields.
+    """
+    if path.suffix.lower() == ".json":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        records = data.get("fenders") if isinstance(data, dict) else data
+        if not isinstance(records, list):
+            raise ValueError("A JSON catalog is a list of fenders or {'fenders': [...]}")
+        return catalog_from_records(records)
+    frame = columnar.read_table(path)
+    frame = frame.astype(object).where(frame.notna(), None)
+    return catalog_from_records(frame.to_dict("records"))
@@ -0,0 +1,487 @@
+"""
+Background jobs for analyses that outlive an HTTP request.
+
+A job is a typed analysis (a name from ``JOB_KINDS`` plus parameters validated by that
+kind's Pydantic model) recorded in a SQLite database and executed by an in-process
+thread pool; no external broker is involved. Status, progress and the result summary
+live in the database, so they survive a restart.
+
+Several processes (the workers of a multi-worker server) may share one database. Each
+``JobQueue`` has an owner id; a worker claims a queued job with a single conditional
+``UPDATE`` and runs it only if that update changed the row, so a job runs once however
+many processes try to pick it up. While jobs run, their owner refreshes a heartbeat.
+A running job whose heartbeat is older than ``STALE_AFTER_S`` belonged to a process that
+stopped, and any live queue (at start and then periodically) puts it back in the queue.
+
+Jobs read server-side inputs (report templates) only from the queue's input directory;
+paths in job parameters are relative to it and may not leave it.
+
+Bulk outputs are written as artifacts in a per-job directory: arrays as ``.npy`` files
+filled in place through ``numpy.lib.format.open_memmap`` (and readable the same way with
+``np.load(..., mmap_mode="r")``), tables as CSV or Parquet.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, TypeVar
+
+import numpy as np
+from pydantic import BaseModel
+
+from . import tracing
+from .models import MonteCarloJobParams, ReportJobParams, TideJobParams
+from .tides import Constituent, tide_elevation
+
+JOBS_DB = "jobs.sqlite3"
+ARTIFACTS_DIR = "artifacts"
+INPUTS_DIR = "inputs"  # default input directory under the queue root
+TIDE_BLOCK_POINTS = 1 << 20  # samples generated per block of a tide job
+HEARTBEAT_S = 5.0  # how often a queue refreshes the heartbeat of its running jobs
+STALE_AFTER_S = 60.0  # a running job without a heartbeat for this long is requeued
+
+P = TypeVar("P", bound=BaseModel)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    params TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    artifacts TEXT NOT NULL DEFAULT '[]',
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    owner TEXT,
+    heartbeat_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+# Columns added after the first release, for databases created before them.
+_ADDED_COLUMNS = {"owner": "TEXT", "heartbeat_at": "REAL"}
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat(timespec="milliseconds")
+
+
+@dataclass(frozen=True)
+class Job:
+    """One row of the job table."""
+
+    id: str
+    kind: str
+    status: str
+    progress: float
+    params: dict[str, Any]
+    result: dict[str, Any] | None
+    error: str | None
+    artifacts: list[str]
+    created_at: str
+    started_at: str | None
+    finished_at: str | None
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class JobStore:
+    """SQLite persistence for jobs; safe to share between threads."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        with self._lock:
+            self._db.execute("PRAGMA busy_timeout=5000")
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+            have = {r["name"] for r in self._db.execute("PRAGMA table_info(jobs)")}
+            for name, kind in _ADDED_COLUMNS.items():
+                if name not in have:
+                    self._db.execute(f"ALTER TABLE jobs ADD COLUMN {name} {kind}")
+
+    def _execute(self, sql: str, args: tuple[Any, ...] = ()) -> list[sqlite3.Row]:
+        with self._lock:
+            return self._db.execute(sql, args).fetchall()
+
+    def _update(self, sql: str, args: tuple[Any, ...] = ()) -> int:
+        """Run an UPDATE and return the number of rows it changed."""
+        with self._lock:
+            return self._db.execute(sql, args).rowcount
+
+    @staticmethod
+    def _job(row: sqlite3.Row) -> Job:
+        return Job(
+            id=row["id"],
+            kind=row["kind"],
+            status=row["status"],
+            progress=row["progress"],
+            params=json.loads(row["params"]),
+            result=json.loads(row["result"]) if row["result"] is not None else None,
+            error=row["error"],
+            artifacts=json.loads(row["artifacts"]),
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+        )
+
+    def create(self, kind: str, params: dict[str, Any]) -> Job:
+        job_id = uuid.uuid4().hex
+        self._execute(
+            "INSERT INTO jobs (id, kind, status, params, created_at) VALUES (?, ?, 'queued', ?, ?)",
+            (job_id, kind, json.dumps(params), _now()),
+        )
+        job = self.get(job_id)
+        assert job is not None
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        rows = self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        return self._job(rows[0]) if rows else None
+
+    def recent(self, status: str | None = None, limit: int = 50) -> list[Job]:
+        """Most recent jobs first, optionally only those with `status`."""
+        if status is None:
+            rows = self._execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,))
+        else:
+            rows = self._execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?",
+                (status, limit),
+            )
+        return [self._job(r) for r in rows]
+
+    def claim(self, job_id: str, owner: str) -> bool:
+        """
+        Move a queued job to running under `owner`. The update is conditional on the job
+        still being queued, so of several processes claiming it exactly one gets True.
+        """
+        changed = self._update(
+            "UPDATE jobs SET status = 'running', progress = 0, started_at = ?, owner = ?,"
+            " heartbeat_at = ? WHERE id = ? AND status = 'queued'",
+            (_now(), owner, time.time(), job_id),
+        )
+        return changed == 1
+
+    def heartbeat(self, owner: str) -> None:
+        """Mark the running jobs of `owner` as alive."""
+        self._update(
+            "UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status = 'running'",
+            (time.time(), owner),
+        )
+
+    def set_progress(self, job_id: str, fraction: float) -> None:
+        self._execute("UPDATE jobs SET progress = ? WHERE id = ?", (fraction, job_id))
+
+    def finish(self, job_id: str, result: dict[str, Any], artifacts: list[str]) -> None:
+        self._execute(
+            "UPDATE jobs SET status = 'succeeded', progress = 1, result = ?, artifacts = ?,"
+            " finished_at = ? WHERE id = ?",
+            (json.dumps(result), json.dumps(artifacts), _now(), job_id),
+        )
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._execute(
+            "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+            (error, _now(), job_id),
+        )
+
+    def requeue_stale(self, stale_after_s: float = STALE_AFTER_S) -> int:
+        """
+        Put running jobs whose owner stopped sending heartbeats back in the queue; return
+        how many were requeued. Jobs of live owners are left alone.
+        """
+        return self._update(
+            "UPDATE jobs SET status = 'queued', progress = 0, started_at = NULL, owner = NULL,"
+            " heartbeat_at = NULL WHERE status = 'running'"
+            " AND (heartbeat_at IS NULL OR heartbeat_at < ?)",
+            (time.time() - stale_after_s,),
+        )
+
+    def queued(self) -> list[str]:
+        """Ids of queued jobs, oldest first."""
+        rows = self._execute("SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at")
+        return [r["id"] for r in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class JobContext:
+    """Handed to a running job: progress reporting and artifact paths."""
+
+    # Progress is written to the database at most this often (s).
+    PROGRESS_INTERVAL_S = 0.25
+
+    def __init__(self, store: JobStore, job_id: str, artifact_dir: Path, input_dir: Path) -> None:
+        self.job_id = job_id
+        self.artifact_dir = artifact_dir
+        self.input_dir = input_dir
+        self.artifacts: list[str] = []
+        self._store = store
+        self._last_progress = 0.0
+
+    def progress(self, fraction: float) -> None:
+        now = time.monotonic()
+        if now - self._last_progress >= self.PROGRESS_INTERVAL_S:
+            self._last_progress = now
+            self._store.set_progress(self.job_id, min(1.0, max(0.0, fraction)))
+
+    def input_file(self, name: str) -> Path:
+        """
+        An existing file in the input directory. Raises ValueError for paths that resolve
+        outside it (absolute paths, ``..`` or symlinks pointing elsewhere).
+        """
+        root = self.input_dir.resolve()
+        path = (root / name).resolve()
+        if not path.is_relative_to(root):
+            raise ValueError(f"Input path {name!r} is outside the job input directory")
+        if not path.is_file():
+            raise ValueError(f"Input file not found: {name}")
+        return path
+
+    def artifact(self, name: str) -> Path:
+        """Path for a new artifact file of this job."""
+        self.artifact_dir.mkdir(parents=True, exist_ok=True)
+        self.artifacts.append(name)
+        return self.artifact_dir / name
+
+
+@dataclass(frozen=True)
+class JobKind:
+    """A named analysis: its parameter model and implementation."""
+
+    name: str
+    params_model: type[BaseModel]
+    run: Callable[[Any, JobContext], dict[str, Any]]
+
+
+JOB_KINDS: dict[str, JobKind] = {}
+
+
+def register_job(
+    name: str, model: type[P]
+) -> Callable[
+    [Callable[[P, JobContext], dict[str, Any]]], Callable[[P, JobContext], dict[str, Any]]
+]:
+    """Decorator adding an analysis to ``JOB_KINDS`` under `name`."""
+
+    def decorator(
+        fn: Callable[[P, JobContext], dict[str, Any]],
+    ) -> Callable[[P, JobContext], dict[str, Any]]:
+        JOB_KINDS[name] = JobKind(name, model, fn)
+        return fn
+
+    return decorator
+
+
+class JobQueue:
+    """Job database, artifact directory and worker pool under one root directory."""
+
+    def __init__(
+        self,
+        root: Path,
+        workers: int = 2,
+        heartbeat_s: float = HEARTBEAT_S,
+        stale_after_s: float = STALE_AFTER_S,
+        input_dir: Path | None = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        if not 0 < heartbeat_s < stale_after_s:
+            raise ValueError("heartbeat_s must be > 0 and below stale_after_s")
+        self.root = root
+        self.workers = workers
+        self.input_dir = input_dir if input_dir is not None else root / INPUTS_DIR
+        self.heartbeat_s = heartbeat_s
+        self.stale_after_s = stale_after_s
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.store = JobStore(root / JOBS_DB)
+        self._pool: ThreadPoolExecutor | None = None
+        self._stop = threading.Event()
+        self._monitor: threading.Thread | None = None
+
+    def start(self) -> None:
+        """
+        Start the workers, resume queued jobs and those whose owner stopped, and start
+        the heartbeat thread. Jobs another live process is running are not touched.
+        """
+        if self._pool is not None:
+            return
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+        self._stop.clear()
+        self.store.requeue_stale(self.stale_after_s)
+        self._submit_queued()
+        self._monitor = threading.Thread(target=self._beat, name="job-heartbeat", daemon=True)
+        self._monitor.start()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the workers. Queued jobs stay queued in the database for the next start."""
+        self._stop.set()
+        if self._monitor is not None:
+            self._monitor.join()
+            self._monitor = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+    def _submit_queued(self) -> None:
+        """Offer every queued job to the pool; claims decide which process runs each."""
+        pool = self._pool
+        if pool is not None:
+            for job_id in self.store.queued():
+                pool.submit(self._execute, job_id)
+
+    def _beat(self) -> None:
+        """Heartbeat thread: keep this queue's jobs alive and take over those of dead owners."""
+        while not self._stop.wait(self.heartbeat_s):
+            self.store.heartbeat(self.owner)
+            if self.store.requeue_stale(self.stale_after_s):
+                self._submit_queued()
+
+    def submit(self, kind: str, params: Mapping[str, Any]) -> Job:
+        """
+        Validate and enqueue a job. Raises ValueError for an unknown kind and pydantic's
+        ValidationError for invalid parameters.
+        """
+        spec = JOB_KINDS.get(kind)
+        if spec is None:
+            raise ValueError(f"Unknown job kind {kind!r}; choose from {', '.join(JOB_KINDS)}")
+        validated = spec.params_model.model_validate(params)
+        job = self.store.create(kind, validated.model_dump(mode="json"))
+        if self._pool is None:
+            self.start()  # also picks up the job just created
+        else:
+            self._pool.submit(self._execute, job.id)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self.store.get(job_id)
+
+    def artifact_path(self, job_id: str, name: str) -> Path | None:
+        """Path of a finished job's artifact, or None if the job has no such artifact."""
+        job = self.store.get(job_id)
+        if job is None or name not in job.artifacts:
+            return None
+        return self.root / ARTIFACTS_DIR / job_id / name
+
+    def wait(self, job_id: str, timeout_s: float = 30.0, poll_s: float = 0.01) -> Job:
+        """Block until a job has succeeded or failed (for scripts and tests)."""
+        deadline = time.monotonic() + timeout_s
+        while True:
+            job = self.store.get(job_id)
+            if job is None:
+                raise ValueError(f"Unknown job {job_id!r}")
+            if job.status in ("succeeded", "failed"):
+                return job
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Job {job_id} still {job.status} after {timeout_s} s")
+            time.sleep(poll_s)
+
+    def _execute(self, job_id: str) -> None:
+        if not self.store.claim(job_id, self.owner):
+            return  # no longer queued: finished, or claimed by another worker
+        job = self.store.get(job_id)
+        assert job is not None
+        spec = JOB_KINDS[job.kind]
+        ctx = JobContext(self.store, job_id, self.root / ARTIFACTS_DIR / job_id, self.input_dir)
+        try:
+            with tracing.span(f"job.{job.kind}", job_id=job_id):
+                result = spec.run(spec.params_model.model_validate(job.params), ctx)
+        except Exception as e:
+            self.store.fail(job_id, f"{type(e).__name__}: {e}")
+        else:
+            self.store.finish(job_id, result, ctx.artifacts)
+
+
+@register_job("tides", TideJobParams)
+def run_tides(req: TideJobParams, ctx: JobContext) -> dict[str, Any]:
+    """
+    Tide series of any length, generated block by block straight into ``t_s.npy`` and
+    ``eta_m.npy`` so memory use does not grow with the duration.
+    """
+    cons = [
+        Constituent(amp_m=c.amp_m, omega_rad_s=2 * math.pi / c.period_s, phase_rad=c.phase_rad)
+        for c in req.constituents
+    ]
+    n = req.points
+    t_out = np.lib.format.open_memmap(ctx.artifact("t_s.npy"), mode="w+", dtype=float, shape=(n,))
+    eta_out = np.lib.format.open_memmap(
+        ctx.artifact("eta_m.npy"), mode="w+", dtype=float, shape=(n,)
+    )
+    eta_max, eta_min, eta_sum = -math.inf, math.inf, 0.0
+    for start in range(0, n, TIDE_BLOCK_POINTS):
+        stop = min(n, start + TIDE_BLOCK_POINTS)
+        t = np.arange(start, stop, dtype=float) * req.dt_s
+        eta = tide_elevation(t, cons)
+        t_out[start:stop] = t
+        eta_out[start:stop] = eta
+        eta_max, eta_min = max(eta_max, float(eta.max())), min(eta_min, float(eta.min()))
+        eta_sum += float(eta.sum())
+        ctx.progress(stop / n)
+    t_out.flush()
+    eta_out.flush()
+    return {"points": n, "eta_max_m": eta_max, "eta_min_m": eta_min, "eta_mean_m": eta_sum / n}
+
+
+@register_job("report", ReportJobParams)
+def run_report_job(params: ReportJobParams, ctx: JobContext) -> dict[str, Any]:
+    """Bulk report run over a template in the input directory; the results are the artifact."""
+    from . import batch, columnar
+
+    input_path = ctx.input_file(params.input_path)
+    total = max(1, columnar.estimate_rows(input_path))
+    done = 0
+
+    def progress(rows: int) -> None:
+        nonlocal done
+        done += rows
+        ctx.progress(done / total)
+
+    summary = batch.run_report(
+        input_path,
+        ctx.artifact(f"report.{params.output_format}"),
+        chunksize=params.chunksize,
+        progress=progress,
+        keep=params.keep,
+    )
+    return asdict(summary)
+
+
+@register_job("montecarlo", MonteCarloJobParams)
+def run_monte_carlo_job(params: MonteCarloJobParams, ctx: JobContext) -> dict[str, Any]:
+    """Monte Carlo uncertainty run; the result holds the summary and the seed used."""
+    from .uncertainty import run_monte_carlo
+
+    result = run_monte_carlo(
+        params.calc,
+        params.inputs,
+        params.samples,
+        seed=params.seed,
+        chunk_size=params.chunk_size,
+        percentiles=params.percentiles,
+        thresholds=params.thresholds,
+        progress=ctx.progress,
+    )
+    return result.as_dict()
@@ -0,0 +1,227 @@
+"""
+Concurrent load generator for the HTTP API.
+
+Drives the app either in-process through httpx's ASGI transport (no sockets, measures
+the framework and calculation cost) or against a running server by URL (measures a real
+deployment, including worker and event-loop settings). Requests are drawn from a
+weighted endpoint mix by a fixed number of concurrent clients until a duration or a
+request count is reached; the result reports throughput and latency percentiles per
+endpoint.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+# name -> (method, path, JSON body or None)
+ENDPOINTS: dict[str, tuple[str, str, dict[str, Any] | None]] = {
+    "health": ("GET", "/health", None),
+    "states": ("GET", "/states", None),
+    "waves": ("POST", "/waves", {"T_s": 10.0, "h_m": 20.0}),
+    "morison": ("POST", "/morison", {"D_m": 1.0, "u_amp_mps": 2.0, "a_amp_mps2": 1.0}),
+    "berthing": ("POST", "/berthing", {"mass_tonnes": 50000.0, "speed_knots": 0.3}),
+    "mooring": (
+        "POST",
+        "/mooring",
+        {"A_wind_m2": 1000.0, "A_current_m2": 500.0, "U_wind_mps": 20.0, "U_current_mps": 1.0},
+    ),
+    "pile-axial": (
+        "POST",
+        "/pile-axial",
+        {
+            "shaft_length_m": 20.0,
+            "perimeter_m": 2.0,
+            "area_tip_m2": 0.3,
+            "unit_skin_kPa": 50.0,
+            "unit_end_bearing_kPa": 2000.0,
+        },
+    ),
+    "corrosion": ("POST", "/corrosion", {"t0_mm": 12.0, "rate_mm_per_year": 0.1, "years": 50.0}),
+    "seawall": ("POST", "/seawall", {"mu": 0.6, "W_kN": 1000.0, "T_kN": 400.0}),
+    "scour": ("POST", "/scour", {"D_m": 1.0, "U_mps": 1.5}),
+    "tides": (
+        "POST",
+        "/tides",
+        {
+            "constituents": [
+                {"amp_m": 0.5, "period_s": 44714.0},
+                {"amp_m": 0.2, "period_s": 43200.0},
+            ],
+            "duration_s": 7 * 86400.0,
+            "dt_s": 600.0,
+        },
+    ),
+}
+DEFAULT_MIX = "waves=4,berthing=2,seawall=2,mooring=1,scour=1,tides=0.5,states=0.5"
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    """
+    Parse an endpoint mix such as ``"waves=4,tides=1"`` into normalized weights.
+
+    ``"all"`` weights every endpoint equally; a name without ``=weight`` counts as 1.
+    """
+    spec = spec.strip()
+    if spec == "all":
+        return {name: 1.0 / len(ENDPOINTS) for name in ENDPOINTS}
+    weights: dict[str, float] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, raw = item.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint {name!r}; choose from {', '.join(ENDPOINTS)}")
+        try:
+            weight = float(raw) if raw else 1.0
+        except ValueError:
+            raise ValueError(f"Invalid weight for {name!r}: {raw!r}") from None
+        if weight < 0:
+            raise ValueError(f"Weight for {name!r} must be >= 0")
+        weights[name] = weights.get(name, 0.0) + weight
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Mix must contain at least one endpoint with positive weight")
+    return {name: w / total for name, w in weights.items() if w > 0}
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in [0, 1]) of an ascending list; 0.0 when empty."""
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+@dataclass
+class EndpointStats:
+    """Latencies and outcome counts for one endpoint."""
+
+    latencies_s: list[float] = field(default_factory=list)
+    errors: int = 0
+    shed: int = 0
+
+    def summary(self, elapsed_s: float) -> dict[str, float]:
+        lat = sorted(self.latencies_s)
+        return {
+            "requests": len(lat),
+            "errors": self.errors,
+            "shed": self.shed,
+            "rps": len(lat) / elapsed_s if elapsed_s > 0 else 0.0,
+            "p50_ms": 1e3 * percentile(lat, 0.50),
+            "p95_ms": 1e3 * percentile(lat, 0.95),
+            "p99_ms": 1e3 * percentile(lat, 0.99),
+            "max_ms": 1e3 * lat[-1] if lat else 0.0,
+        }
+
+
+@dataclass
+class LoadTestResult:
+    """Outcome of one load run: per-endpoint stats plus the wall-clock duration."""
+
+    target: str
+    concurrency: int
+    elapsed_s: float
+    endpoints: dict[str, EndpointStats]
+
+    def total(self) -> EndpointStats:
+        merged = EndpointStats()
+        for stats in self.endpoints.values():
+            merged.latencies_s.extend(stats.latencies_s)
+            merged.errors += stats.errors
+            merged.shed += stats.shed
+        return merged
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "target": self.target,
+            "concurrency": self.concurrency,
+            "elapsed_s": self.elapsed_s,
+            "total": self.total().summary(self.elapsed_s),
+            "endpoints": {
+                name: stats.summary(self.elapsed_s)
+                for name, stats in sorted(self.endpoints.items())
+            },
+        }
+
+
+async def run_load(
+    mix: Mapping[str, float],
+    *,
+    url: str | None = None,
+    concurrency: int = 16,
+    duration_s: float | None = 10.0,
+    requests: int | None = None,
+    seed: int = 0,
+    timeout_s: float = 30.0,
+) -> LoadTestResult:
+    """
+    Drive the API with `concurrency` clients until `duration_s` elapses or `requests`
+    have been sent (whichever comes first). Without `url` the app is served in-process.
+    A 503 from admission control counts as shed, any other non-2xx/304 as an error.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be >= 1")
+    if duration_s is None and requests is None:
+        raise ValueError("Give a duration, a request count, or both")
+    if duration_s is not None and duration_s <= 0:
+        raise ValueError("duration_s must be > 0")
+    if requests is not None and requests < 1:
+        raise ValueError("requests must be >= 1")
+
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    rng = random.Random(seed)
+    stats = {name: EndpointStats() for name in names}
+    remaining = requests
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    if url is None:
+        # Build the app only for in-process runs; remote runs should not pay for it.
+        from .server import app
+
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://loadtest",
+            timeout=timeout_s,
+        )
+        target = "in-process"
+    else:
+        client = httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout_s)
+        target = url
+
+    start = time.perf_counter()
+    deadline = start + duration_s if duration_s is not None else float("inf")
+
+    async def worker() -> None:
+        nonlocal remaining
+        while time.perf_counter() < deadline:
+            if remaining is not None:
+                if remaining <= 0:
+                    return
+                remaining -= 1
+            name = rng.choices(names, weights)[0]
+            method, path, body = ENDPOINTS[name]
+            t0 = time.perf_counter()
+            try:
+                r = await client.request(method, path, json=body)
+                status = r.status_code
+            except httpx.HTTPError:
+                status = 0
+            entry = stats[name]
+            entry.latencies_s.append(time.perf_counter() - t0)
+            if status == 503:
+                entry.shed += 1
+            elif not (200 <= status < 300 or status == 304):
+                entry.errors += 1
+
+    async with client:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return LoadTestResult(target, concurrency, time.perf_counter() - start, stats)
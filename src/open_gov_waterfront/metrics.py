@@ -0,0 +1,233 @@
+"""
+Lightweight request instrumentation with Prometheus text exposition.
+
+MetricsMiddleware records per-route request counts, error counts and latency histograms
+with fixed buckets into a MetricsRegistry. Gauges and counters owned by other components
+(admission gates, the dispersion cache, the kernel timing registry) are pulled in by
+collector callables at scrape time, so they cost nothing per request. Each worker process
+keeps its own registry.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from typing import Any
+
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from . import timing
+from .admission import AdmissionGate
+from .waves import dispersion_cache_info
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS_S: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+UNMATCHED_ROUTE = "unmatched"
+
+Collector = Callable[[], Iterable[str]]
+
+
+class _Histogram:
+    __slots__ = ("counts", "total")
+
+    def __init__(self, n_buckets: int) -> None:
+        self.counts = [0] * (n_buckets + 1)  # last slot is +Inf
+        self.total = 0.0
+
+
+class MetricsRegistry:
+    """Per-process counters and latency histograms keyed by (method, route)."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS_S) -> None:
+        if list(buckets) != sorted(buckets) or not buckets:
+            raise ValueError("buckets must be a non-empty ascending sequence")
+        self.buckets = buckets
+        self.in_flight = 0
+        self._requests: dict[tuple[str, str, int], int] = {}
+        self._errors: dict[tuple[str, str], int] = {}
+        self._latency: dict[tuple[str, str], _Histogram] = {}
+        self._collectors: list[Collector] = []
+
+    def observe(self, method: str, route: str, status: int, seconds: float) -> None:
+        key = (method, route)
+        status_key = (method, route, status)
+        self._requests[status_key] = self._requests.get(status_key, 0) + 1
+        if status >= 400:
+            self._errors[key] = self._errors.get(key, 0) + 1
+        hist = self._latency.get(key)
+        if hist is None:
+            hist = self._latency[key] = _Histogram(len(self.buckets))
+        hist.counts[bisect_left(self.buckets, seconds)] += 1
+        hist.total += seconds
+
+    def add_collector(self, collector: Collector) -> None:
+        """Register a callable that yields extra exposition lines at scrape time."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = [
+            "# HELP waterfront_http_requests_total HTTP requests by route and status.",
+            "# TYPE waterfront_http_requests_total counter",
+        ]
+        for (method, route, status), n in sorted(self._requests.items()):
+            labels = _labels(method=method, route=route, status=str(status))
+            lines.append(f"waterfront_http_requests_total{labels} {n}")
+        lines += [
+            "# HELP waterfront_http_request_errors_total HTTP responses with status >= 400.",
+            "# TYPE waterfront_http_request_errors_total counter",
+        ]
+        for (method, route), n in sorted(self._errors.items()):
+            lines.append(
+                f"waterfront_http_request_errors_total{_labels(method=method, route=route)} {n}"
+            )
+        lines += [
+            "# HELP waterfront_http_request_duration_seconds Request latency.",
+            "# TYPE waterfront_http_request_duration_seconds histogram",
+        ]
+        for (method, route), hist in sorted(self._latency.items()):
+            cumulative = 0
+            for upper, n in zip((*self.buckets, "+Inf"), hist.counts, strict=True):
+                cumulative += n
+                labels = _labels(method=method, route=route, le=str(upper))
+                lines.append(
+                    f"waterfront_http_request_duration_seconds_bucket{labels} {cumulative}"
+                )
+            labels = _labels(method=method, route=route)
+            lines.append(f"waterfront_http_request_duration_seconds_sum{labels} {hist.total!r}")
+            lines.append(f"waterfront_http_request_duration_seconds_count{labels} {cumulative}")
+        lines += [
+            "# HELP waterfront_http_requests_in_flight Requests currently being served.",
+            "# TYPE waterfront_http_requests_in_flight gauge",
+            f"waterfront_http_requests_in_flight {self.in_flight}",
+        ]
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def admission_collector(gates: Mapping[str, AdmissionGate]) -> Collector:
+    """Exposition lines for admission gate in-flight, queued and rejected counts."""
+
+    def collect() -> Iterable[str]:
+        yield "# HELP waterfront_admission_in_flight Admitted requests per endpoint class."
+        yield "# TYPE waterfront_admission_in_flight gauge"
+        for name, gate in sorted(gates.items()):
+            yield f"waterfront_admission_in_flight{_labels(endpoint_class=name)} {gate.in_flight}"
+        yield "# HELP waterfront_admission_queued Requests waiting for a slot per endpoint class."
+        yield "# TYPE waterfront_admission_queued gauge"
+        for name, gate in sorted(gates.items()):
+            yield f"waterfront_admission_queued{_labels(endpoint_class=name)} {gate.queued}"
+        yield "# HELP waterfront_admission_rejected_total Requests shed with 503."
+        yield "# TYPE waterfront_admission_rejected_total counter"
+        for name, gate in sorted(gates.items()):
+            yield f"waterfront_admission_rejected_total{_labels(endpoint_class=name)} {gate.rejected}"
+
+    return collect
+
+
+def dispersion_cache_collector() -> Iterable[str]:
+    """Exposition lines for the dispersion solver cache."""
+    info = dispersion_cache_info()
+    yield "# HELP waterfront_dispersion_cache_hits_total Dispersion solutions served from cache."
+    yield "# TYPE waterfront_dispersion_cache_hits_total counter"
+    yield f"waterfront_dispersion_cache_hits_total {info.hits}"
+    yield "# HELP waterfront_dispersion_cache_misses_total Dispersion solutions computed."
+    yield "# TYPE waterfront_dispersion_cache_misses_total counter"
+    yield f"waterfront_dispersion_cache_misses_total {info.misses}"
+    yield "# HELP waterfront_dispersion_cache_size Cached dispersion solutions."
+    yield "# TYPE waterfront_dispersion_cache_size gauge"
+    yield f"waterfront_dispersion_cache_size {info.currsize}"
+
+
+def timing_collector() -> Iterable[str]:
+    """Exposition lines for the kernel timing registry (empty unless WATERFRONT_TIMING is set)."""
+    if not timing.ENABLED:
+        return
+    stats = timing.snapshot()
+    yield "# HELP waterfront_kernel_calls_total Calls per calculation kernel."
+    yield "# TYPE waterfront_kernel_calls_total counter"
+    for name, stat in stats.items():
+        yield f"waterfront_kernel_calls_total{_labels(kernel=name)} {stat['calls']}"
+    yield "# HELP waterfront_kernel_seconds_total Cumulative wall time per calculation kernel."
+    yield "# TYPE waterfront_kernel_seconds_total counter"
+    for name, stat in stats.items():
+        yield f"waterfront_kernel_seconds_total{_labels(kernel=name)} {stat['total_s']!r}"
+    yield "# HELP waterfront_kernel_seconds_max Longest single call per calculation kernel."
+    yield "# TYPE waterfront_kernel_seconds_max gauge"
+    for name, stat in stats.items():
+        yield f"waterfront_kernel_seconds_max{_labels(kernel=name)} {stat['max_s']!r}"
+    yield "# HELP waterfront_kernel_events_total Kernel event counters (e.g. Newton iterations)."
+    yield "# TYPE waterfront_kernel_events_total counter"
+    for name, stat in stats.items():
+        for counter, n in sorted(stat["counters"].items()):
+            yield f"waterfront_kernel_events_total{_labels(kernel=name, event=counter)} {n}"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware feeding a MetricsRegistry; labels requests by their route template.
+    Requests answered before routing (shed by admission control, say) are matched against
+    `routes` instead, so they are still labelled by route rather than as unmatched.
+    """
+
+    def __init__(
+        self, app: ASGIApp, registry: MetricsRegistry, routes: Sequence[BaseRoute] = ()
+    ) -> None:
+        self.app = app
+        self.registry = registry
+        self.routes = routes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        registry = self.registry
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        registry.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            registry.in_flight -= 1
+            registry.observe(scope["method"], self._route_path(scope), status, elapsed)
+
+    def _route_path(self, scope: Scope) -> str:
+        route: Any = scope.get("route")
+        if route is None:
+            route = next((r for r in self.routes if r.matches(scope)[0] is not Match.NONE), None)
+        return getattr(route, "path", None) or UNMATCHED_ROUTE
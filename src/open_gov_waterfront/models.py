@@ -6,7 +6,11 @@ Author: Nik Jois <nikjois@llamasearch.ai>
 
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+import math
+from pathlib import PurePosixPath
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 class WaveRequest(BaseModel):
@@ -105,6 +109,98 @@ class ScourResponse(BaseModel):
     scour_depth_m: float
 
 
+class TideConstituentModel(BaseModel):
+    amp_m: float = Field(..., ge=0, description="Constituent amplitude (m)")
+    period_s: float = Field(..., gt=0, description="Constituent period (s)")
+    phase_rad: float = Field(0.0, description="Constituent phase (rad)")
+
+
+# Inline series are built and encoded whole in the server process; longer ones go to the
+# "tides" job, which writes them block by block.
+MAX_TIDE_POINTS = 1_000_000
+
+
+class TideJobParams(BaseModel):
+    constituents: list[TideConstituentModel] = Field(..., min_length=1)
+    duration_s: float = Field(43200.0, gt=0, description="Duration (s)")
+    dt_s: float = Field(600.0, gt=0, description="Time step (s)")
+
+    @property
+    def points(self) -> int:
+        """Number of samples in the series, as ``tides.tide_series`` builds it."""
+        return math.ceil((self.duration_s + 1e-9) / self.dt_s)
+
+
+class TideRequest(TideJobParams):
+    @model_validator(mode="after")
+    def _bounded(self) -> TideRequest:
+        if self.points > MAX_TIDE_POINTS:
+            raise ValueError(
+                f"duration_s / dt_s gives {self.points:,} points, more than the"
+                f" {MAX_TIDE_POINTS:,} allowed inline; submit a 'tides' job instead"
+            )
+        return self
+
+
+class TideResponse(BaseModel):
+    t_s: list[float]
+    eta_m: list[float]
+
+
 class HealthResponse(BaseModel):
     status: str
     version: str
+
+
+class ReportJobParams(BaseModel):
+    input_path: str = Field(
+        ...,
+        description="Filled report template (CSV/.parquet), relative to the job input directory",
+    )
+    output_format: Literal["csv", "parquet"] = Field("csv", description="Result file format")
+    chunksize: int = Field(50_000, gt=0, description="Rows per chunk")
+    keep: list[str] | None = Field(None, description="Input columns to carry into the output")
+
+    @field_validator("input_path")
+    @classmethod
+    def _relative_path(cls, value: str) -> str:
+        parts = PurePosixPath(value.replace("\\", "/")).parts
+        if not parts or value.startswith(("/", "\\")) or ":" in value or ".." in parts:
+            raise ValueError("input_path must be a relative path inside the job input directory")
+        return value
+
+
+class MonteCarloJobParams(BaseModel):
+    calc: str = Field(..., description="Calculation name, e.g. 'berthing'")
+    inputs: dict[str, float | dict[str, Any]] = Field(
+        ...,
+        description="Fixed values or distributions, e.g. {'dist': 'normal', 'mean': 1, 'std': 0.1}",
+    )
+    # Exact percentiles keep one float per sample and output in the server process, so
+    # samples are capped (40 MB per output); chunk_size bounds the per-chunk arrays.
+    samples: int = Field(100_000, gt=0, le=5_000_000, description="Number of samples")
+    seed: int | None = Field(None, ge=0, description="Root seed (random when omitted)")
+    chunk_size: int = Field(65_536, gt=0, le=262_144, description="Samples per chunk")
+    percentiles: list[float] = Field([5.0, 50.0, 95.0, 99.0], description="Percentiles to report")
+    thresholds: dict[str, list[float]] = Field(
+        default_factory=dict, description="Output levels whose exceedance probability is reported"
+    )
+
+
+class JobRequest(BaseModel):
+    kind: str = Field(..., description="Analysis type, e.g. 'tides' or 'report'")
+    params: dict[str, Any] = Field(default_factory=dict, description="Analysis parameters")
+
+
+class JobResponse(BaseModel):
+    id: str
+    kind: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    progress: float
+    params: dict[str, Any]
+    result: dict[str, Any] | None
+    error: str | None
+    artifacts: list[str]
+    created_at: str
+    started_at: str | None
+    finished_at: str | None
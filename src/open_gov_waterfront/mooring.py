@@ -8,6 +8,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from .timing import timed
 from .utils import rho_air, rho_water
 
 
@@ -22,6 +23,7 @@ class EnvLoads:
     safety_factor: float = 1.5
 
 
+@timed
 def mooring_total_load_N(env: EnvLoads) -> float:
     Fw = 0.5 * rho_air * env.Cd_wind * env.A_wind_m2 * (env.U_wind_mps**2)
     Fc = 0.5 * rho_water * env.Cd_current * env.A_current_m2 * (env.U_current_mps**2)
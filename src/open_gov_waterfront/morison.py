@@ -8,6 +8,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from .timing import timed
 from .utils import rho_water
 
 
@@ -17,6 +18,7 @@ class MorisonCoeffs:
     Cm: float = 2.0
 
 
+@timed
 def morison_inline_max_per_length_N(
     D_m: float,
     u_amp_mps: float,
@@ -8,6 +8,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from .timing import timed
+
 
 @dataclass(frozen=True)
 class PileAxialInputs:
@@ -18,6 +20,7 @@ class PileAxialInputs:
     unit_end_bearing_kPa: float
 
 
+@timed
 def pile_axial_capacity_kN(inp: PileAxialInputs) -> float:
     """
     Q = qs * As + qb * Ab, return in kN.
@@ -0,0 +1,195 @@
+"""
+On-demand cProfile hook for single API requests.
+
+When profiling is enabled in the settings, a request carrying the ``X-Profile`` header is
+run under cProfile:
+
+- ``X-Profile: summary`` replaces the response body with a JSON summary of the top
+  functions by cumulative time.
+- any other value stores the raw stats under the profile directory (loadable with
+  ``pstats`` or snakeviz) and names the file in the ``X-Profile-File`` response header.
+  Without a profile directory a summary is returned instead.
+
+The middleware is only installed when profiling is enabled, so normal deployments pay
+nothing. cProfile sees the whole event-loop thread, so work from other requests
+interleaved at await points can appear in a profile; profile on a quiet worker. Sync
+handlers run in the thread pool, out of that profiler's sight: routes built with
+``ProfiledRoute`` profile them in their worker thread as well, and the two profiles are
+merged.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import inspect
+import json
+import pstats
+import re
+import time
+import uuid
+from collections.abc import Callable
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_FILE_HEADER = b"x-profile-file"
+
+# Worker-thread profiles of the request being profiled (None when it is not). Thread-pool
+# calls copy the request's context, so the handler's wrapper finds the same list.
+_thread_profiles: ContextVar[list[cProfile.Profile] | None] = ContextVar(
+    "waterfront_thread_profiles", default=None
+)
+
+
+def profile_in_thread(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a sync handler so it is profiled in its own thread during a profiled request."""
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        profiles = _thread_profiles.get()
+        if profiles is None:
+            return func(*args, **kwargs)
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # Python 3.12+: the request's profiler already sees every thread
+            return func(*args, **kwargs)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            profiles.append(profiler)
+
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """API route whose sync endpoint is wrapped with ``profile_in_thread``."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        if not inspect.iscoroutinefunction(endpoint):
+            endpoint = profile_in_thread(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def merge_profiles(profilers: list[cProfile.Profile]) -> pstats.Stats:
+    """One set of stats from several profilers."""
+    stats = pstats.Stats(profilers[0])
+    for profiler in profilers[1:]:
+        stats.add(profiler)
+    return stats
+
+
+def top_functions(
+    profile: cProfile.Profile | pstats.Stats, limit: int = 25
+) -> list[dict[str, Any]]:
+    """The `limit` functions with the largest cumulative time."""
+    stats = profile if isinstance(profile, pstats.Stats) else pstats.Stats(profile)
+    rows = []
+    for (filename, line, func), (_, ncalls, tottime, cumtime, _) in stats.stats.items():  # type: ignore[attr-defined]
+        rows.append(
+            {
+                "function": f"{filename}:{line}({func})",
+                "ncalls": ncalls,
+                "tottime_s": tottime,
+                "cumtime_s": cumtime,
+            }
+        )
+    rows.sort(key=lambda r: r["cumtime_s"], reverse=True)
+    return rows[:limit]
+
+
+def _profile_filename(scope: Scope) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", scope["path"]).strip("-") or "root"
+    stamp = time.strftime("%Y%m%dT%H%M%S")
+    return f"{stamp}-{scope['method'].lower()}-{slug}-{uuid.uuid4().hex[:8]}.prof"
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling requests that carry the X-Profile header."""
+
+    def __init__(self, app: ASGIApp, profile_dir: Path | None = None, top_n: int = 25) -> None:
+        self.app = app
+        self.profile_dir = profile_dir
+        self.top_n = top_n
+        self._active = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        mode = self._requested_mode(scope)
+        if mode is None or self._active:
+            # Only one cProfile profiler can be active per interpreter.
+            await self.app(scope, receive, send)
+            return
+        if mode == "summary" or self.profile_dir is None:
+            await self._summary(scope, receive, send)
+        else:
+            await self._store(scope, receive, send, self.profile_dir)
+
+    @staticmethod
+    def _requested_mode(scope: Scope) -> str | None:
+        if scope["type"] != "http":
+            return None
+        for key, value in scope["headers"]:
+            if key == PROFILE_HEADER:
+                return value.decode("latin-1").strip().lower() or None
+        return None
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send) -> pstats.Stats:
+        profiler = cProfile.Profile()
+        profiles: list[cProfile.Profile] = []
+        token = _thread_profiles.set(profiles)
+        self._active = True
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.disable()
+            self._active = False
+            _thread_profiles.reset(token)
+        return merge_profiles([profiler, *profiles])
+
+    async def _summary(self, scope: Scope, receive: Receive, send: Send) -> None:
+        status = 500
+
+        async def capture(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        start = time.perf_counter()
+        stats = await self._profile(scope, receive, capture)
+        body = json.dumps(
+            {
+                "path": scope["path"],
+                "status_code": status,
+                "elapsed_s": time.perf_counter() - start,
+                "top_cumulative": top_functions(stats, self.top_n),
+            }
+        ).encode()
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _store(self, scope: Scope, receive: Receive, send: Send, profile_dir: Path) -> None:
+        path = profile_dir / _profile_filename(scope)
+
+        async def tag(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_FILE_HEADER, str(path).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        stats = await self._profile(scope, receive, tag)
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        stats.dump_stats(path)
@@ -0,0 +1,416 @@
+"""
+Incremental project analyses over a dependency graph of calculations.
+
+A project analysis is a graph of nodes, each a calculation with named inputs and named
+outputs; a node's inputs are either project inputs or outputs of other nodes. ``Project``
+holds the current input values and evaluates the graph incrementally:
+
+- changing an input invalidates only the nodes downstream of it, so a new berthing speed
+  reruns the berthing and fender nodes but not the wave solver;
+- node outputs are memoized by a hash of the node's input values, so returning to an
+  earlier value is a cache hit, and a node whose upstream results came out unchanged is
+  not rerun;
+- every evaluation reports, per node, whether it was computed, served from the memo,
+  left unchanged or still clean, and how long it took.
+
+Inputs may be scalars or whole columns (numpy arrays): the default graph is built on the
+array kernels in ``vectorized``, so one project can hold every row of a batch project,
+with invalid elements coming out as NaN.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import numpy as np
+
+from . import timing, tracing, vectorized
+
+NodeStatus = Literal["computed", "cached", "unchanged", "clean"]
+
+
+@dataclass(frozen=True)
+class Node:
+    """A calculation called with its `inputs` as keyword arguments; returns its `outputs`."""
+
+    name: str
+    inputs: tuple[str, ...]
+    outputs: tuple[str, ...]
+    fn: Callable[..., Mapping[str, Any]]
+
+
+def fingerprint(value: Any) -> str:
+    """Hash of a value: arrays by dtype, shape and contents; numbers by float value."""
+    if isinstance(value, np.ndarray):
+        h = hashlib.blake2b(f"{value.dtype.str}{value.shape}".encode(), digest_size=16)
+        h.update(np.ascontiguousarray(value).data)
+        return h.hexdigest()
+    if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+        return f"f:{float(value)!r}"
+    return f"r:{value!r}"
+
+
+def _freeze(value: Any) -> Any:
+    """Arrays are copied read-only so a caller cannot change them behind the hashes."""
+    if isinstance(value, np.ndarray):
+        value = value.copy()
+        value.flags.writeable = False
+    return value
+
+
+class ProjectGraph:
+    """A validated, topologically ordered set of nodes."""
+
+    def __init__(self, nodes: Iterable[Node], defaults: Mapping[str, Any] | None = None) -> None:
+        nodes = list(nodes)
+        self.nodes: dict[str, Node] = {}
+        self.producers: dict[str, str] = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise ValueError(f"Duplicate node {node.name!r}")
+            self.nodes[node.name] = node
+            for out in node.outputs:
+                if out in self.producers:
+                    raise ValueError(f"Output {out!r} is produced by two nodes")
+                self.producers[out] = node.name
+        self.inputs: frozenset[str] = frozenset(
+            i for node in nodes for i in node.inputs if i not in self.producers
+        )
+        self.defaults = dict(defaults or {})
+        unknown = set(self.defaults) - self.inputs
+        if unknown:
+            raise ValueError(f"Defaults for unknown inputs: {', '.join(sorted(unknown))}")
+        self.order = self._topological_order()
+        self._downstream = {name: self._consumers_of(name) for name in self.inputs}
+
+    def _deps(self, node: Node) -> list[str]:
+        return [self.producers[i] for i in node.inputs if i in self.producers]
+
+    def _topological_order(self) -> list[str]:
+        order: list[str] = []
+        state: dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(name: str) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Dependency cycle through node {name!r}")
+            state[name] = 1
+            for dep in self._deps(self.nodes[name]):
+                visit(dep)
+            state[name] = 2
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name)
+        return order
+
+    def _consumers_of(self, value: str) -> frozenset[str]:
+        """Every node that depends, directly or transitively, on `value`."""
+        found: set[str] = set()
+        pending = [value]
+        while pending:
+            v = pending.pop()
+            for node in self.nodes.values():
+                if v in node.inputs and node.name not in found:
+                    found.add(node.name)
+                    pending.extend(node.outputs)
+        return frozenset(found)
+
+    def downstream(self, input_name: str) -> frozenset[str]:
+        """Names of the nodes invalidated by a change to project input `input_name`."""
+        return self._downstream[input_name]
+
+    def upstream(self, targets: Iterable[str] | None = None) -> list[Node]:
+        """
+        Nodes needed for `targets` (node or output names; all nodes when None), in
+        evaluation order.
+        """
+        if targets is None:
+            return [self.nodes[name] for name in self.order]
+        needed: set[str] = set()
+        pending = []
+        for target in targets:
+            name = target if target in self.nodes else self.producers.get(target)
+            if name is None:
+                raise ValueError(f"Unknown node or output {target!r}")
+            pending.append(name)
+        while pending:
+            name = pending.pop()
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self._deps(self.nodes[name]))
+        return [self.nodes[name] for name in self.order if name in needed]
+
+
+@dataclass(frozen=True)
+class NodeRun:
+    """What an evaluation did for one node, and its wall time."""
+
+    node: str
+    status: NodeStatus
+    elapsed_s: float
+
+
+@dataclass(frozen=True)
+class Evaluation:
+    """Output values of the evaluated nodes and what was done for each node."""
+
+    values: dict[str, Any]
+    runs: tuple[NodeRun, ...]
+
+    @property
+    def computed(self) -> list[str]:
+        """Nodes whose function actually ran."""
+        return [r.node for r in self.runs if r.status == "computed"]
+
+    @property
+    def elapsed_s(self) -> float:
+        return sum(r.elapsed_s for r in self.runs)
+
+
+@dataclass(frozen=True)
+class _Memo:
+    """Outputs (and their fingerprints) of a node for one input hash."""
+
+    values: dict[str, Any]
+    fingerprints: dict[str, str]
+
+
+class Project:
+    """
+    Input values of one project (scalars or equal-length columns) and the memoized
+    results of its graph. `cache_size` bounds the memoized results kept per node.
+    """
+
+    def __init__(
+        self,
+        inputs: Mapping[str, Any] | None = None,
+        graph: ProjectGraph | None = None,
+        cache_size: int = 16,
+    ) -> None:
+        if cache_size < 1:
+            raise ValueError("cache_size must be >= 1")
+        self.graph = graph or WATERFRONT_GRAPH
+        self.cache_size = cache_size
+        self._values: dict[str, Any] = {}
+        self._fingerprints: dict[str, str] = {}
+        self._dirty: set[str] = set(self.graph.nodes)
+        self._keys: dict[str, str] = {}
+        self._memo: dict[str, OrderedDict[str, _Memo]] = {
+            n: OrderedDict() for n in self.graph.nodes
+        }
+        self.update({**self.graph.defaults, **(inputs or {})})
+
+    def update(self, values: Mapping[str, Any] | None = None, **kwargs: Any) -> set[str]:
+        """Set project inputs; returns the nodes invalidated (none for unchanged values)."""
+        invalidated: set[str] = set()
+        for name, value in {**(values or {}), **kwargs}.items():
+            if name not in self.graph.inputs:
+                raise ValueError(f"Unknown project input {name!r}")
+            fp = fingerprint(value)
+            if self._fingerprints.get(name) == fp:
+                continue
+            self._values[name] = _freeze(value)
+            self._fingerprints[name] = fp
+            invalidated |= self.graph.downstream(name)
+        self._dirty |= invalidated
+        return invalidated
+
+    def __getitem__(self, name: str) -> Any:
+        """Current value of an input or of an already evaluated output."""
+        return self._values[name]
+
+    def _key(self, node: Node) -> str:
+        h = hashlib.blake2b(node.name.encode(), digest_size=16)
+        for name in node.inputs:
+            h.update(b"\0" + self._fingerprints[name].encode())
+        return h.hexdigest()
+
+    def _compute(self, node: Node) -> _Memo:
+        args = {name: self._values[name] for name in node.inputs}
+        with timing.timer(f"project.{node.name}"), tracing.span("project.node", node=node.name):
+            out = dict(node.fn(**args))
+        if set(out) != set(node.outputs):
+            raise ValueError(f"Node {node.name!r} returned {sorted(out)}, not {list(node.outputs)}")
+        values = {name: _freeze(out[name]) for name in node.outputs}
+        return _Memo(values, {name: fingerprint(v) for name, v in values.items()})
+
+    def evaluate(self, targets: Iterable[str] | None = None) -> Evaluation:
+        """
+        Bring the nodes needed for `targets` (node or output names; every node when None)
+        up to date and return their outputs. Raises ValueError when a needed project input
+        has not been set.
+        """
+        nodes = self.graph.upstream(targets)
+        missing = sorted(
+            {i for node in nodes for i in node.inputs if i in self.graph.inputs} - set(self._values)
+        )
+        if missing:
+            raise ValueError(f"Project inputs not set: {', '.join(missing)}")
+        runs = []
+        for node in nodes:
+            start = time.perf_counter()
+            status: NodeStatus = "clean"
+            if node.name in self._dirty:
+                key = self._key(node)
+                memo = self._memo[node.name]
+                if key == self._keys.get(node.name):
+                    status = "unchanged"
+                else:
+                    if key in memo:
+                        status = "cached"
+                        memo.move_to_end(key)
+                    else:
+                        status = "computed"
+                        memo[key] = self._compute(node)
+                        if len(memo) > self.cache_size:
+                            memo.popitem(last=False)
+                    self._values.update(memo[key].values)
+                    self._fingerprints.update(memo[key].fingerprints)
+                    self._keys[node.name] = key
+                self._dirty.discard(node.name)
+            runs.append(NodeRun(node.name, status, time.perf_counter() - start))
+        values = {out: self._values[out] for node in nodes for out in node.outputs}
+        return Evaluation(values, tuple(runs))
+
+
+def _waves(design_Tp_s: Any, water_depth_m: Any) -> dict[str, Any]:
+    w = vectorized.wave_properties(design_Tp_s, water_depth_m)
+    return {
+        "wave_k": w["k"],
+        "wavelength_m": w["wavelength_m"],
+        "celerity_mps": w["celerity_mps"],
+        "group_celerity_mps": w["group_celerity_mps"],
+        "shoaling_coefficient": w["shoaling_coefficient"],
+    }
+
+
+def _kinematics(
+    design_wave_Hs_m: Any, design_Tp_s: Any, wave_k: Any, water_depth_m: Any
+) -> dict[str, Any]:
+    u, a = vectorized.surface_kinematics(design_wave_Hs_m, design_Tp_s, wave_k, water_depth_m)
+    return {"morison_u_amp_mps": u, "morison_a_amp_mps2": a}
+
+
+def _morison(
+    pile_D_m: Any,
+    morison_u_amp_mps: Any,
+    morison_a_amp_mps2: Any,
+    morison_Cd: Any,
+    morison_Cm: Any,
+) -> dict[str, Any]:
+    F = vectorized.morison_inline_max_per_length_N(
+        pile_D_m, morison_u_amp_mps, morison_a_amp_mps2, morison_Cd, morison_Cm
+    )
+    return {"morison_force_per_length_Npm": F}
+
+
+def _pile_axial(
+    pile_length_m: Any,
+    pile_perimeter_m: Any,
+    pile_tip_area_m2: Any,
+    pile_unit_skin_kPa: Any,
+    pile_unit_end_bearing_kPa: Any,
+) -> dict[str, Any]:
+    Q = vectorized.pile_axial_capacity_kN(
+        pile_length_m,
+        pile_perimeter_m,
+        pile_tip_area_m2,
+        pile_unit_skin_kPa,
+        pile_unit_end_bearing_kPa,
+    )
+    return {"pile_capacity_kN": Q}
+
+
+def _mooring(
+    mooring_wind_area_m2: Any,
+    mooring_current_area_m2: Any,
+    mooring_wind_mps: Any,
+    mooring_current_mps: Any,
+) -> dict[str, Any]:
+    F = vectorized.mooring_total_load_N(
+        mooring_wind_area_m2, mooring_current_area_m2, mooring_wind_mps, mooring_current_mps
+    )
+    return {"mooring_total_load_N": F}
+
+
+def _berthing(berthing_mass_tonnes: Any, berthing_speed_knots: Any) -> dict[str, Any]:
+    E = vectorized.berthing_energy_J(berthing_mass_tonnes, berthing_speed_knots)
+    return {"berthing_energy_J": E}
+
+
+def _fender(berthing_energy_J: Any) -> dict[str, Any]:
+    return {"fender_reaction_kN": vectorized.fender_reaction_kN(berthing_energy_J)}
+
+
+def _seawall(seawall_mu: Any, seawall_W_kN: Any, seawall_T_kN: Any) -> dict[str, Any]:
+    return {"seawall_sliding_fs": vectorized.sliding_fs(seawall_mu, seawall_W_kN, seawall_T_kN)}
+
+
+# Input and output names follow the report template and ``batch`` result columns, so the
+# columns from ``batch.input_values(chunk)`` can be passed to ``Project`` as they are.
+WATERFRONT_NODES = (
+    Node(
+        "waves",
+        ("design_Tp_s", "water_depth_m"),
+        ("wave_k", "wavelength_m", "celerity_mps", "group_celerity_mps", "shoaling_coefficient"),
+        _waves,
+    ),
+    Node(
+        "kinematics",
+        ("design_wave_Hs_m", "design_Tp_s", "wave_k", "water_depth_m"),
+        ("morison_u_amp_mps", "morison_a_amp_mps2"),
+        _kinematics,
+    ),
+    Node(
+        "morison",
+        ("pile_D_m", "morison_u_amp_mps", "morison_a_amp_mps2", "morison_Cd", "morison_Cm"),
+        ("morison_force_per_length_Npm",),
+        _morison,
+    ),
+    Node(
+        "pile_axial",
+        (
+            "pile_length_m",
+            "pile_perimeter_m",
+            "pile_tip_area_m2",
+            "pile_unit_skin_kPa",
+            "pile_unit_end_bearing_kPa",
+        ),
+        ("pile_capacity_kN",),
+        _pile_axial,
+    ),
+    Node(
+        "mooring",
+        (
+            "mooring_wind_area_m2",
+            "mooring_current_area_m2",
+            "mooring_wind_mps",
+            "mooring_current_mps",
+        ),
+        ("mooring_total_load_N",),
+        _mooring,
+    ),
+    Node(
+        "berthing",
+        ("berthing_mass_tonnes", "berthing_speed_knots"),
+        ("berthing_energy_J",),
+        _berthing,
+    ),
+    Node("fender", ("berthing_energy_J",), ("fender_reaction_kN",), _fender),
+    Node(
+        "seawall",
+        ("seawall_mu", "seawall_W_kN", "seawall_T_kN"),
+        ("seawall_sliding_fs",),
+        _seawall,
+    ),
+)
+WATERFRONT_GRAPH = ProjectGraph(WATERFRONT_NODES, defaults={"morison_Cd": 1.0, "morison_Cm": 2.0})
@@ -0,0 +1,347 @@
+"""
+First- and second-order reliability methods (FORM/SORM) for the screening limit states.
+
+A limit state ``g(x)`` is negative on failure: seawall sliding ``g = FS - 1`` with
+``FS = mu W / T``, and pile axial capacity against an axial demand, ``g = Q - demand``.
+Random variables are normal or lognormal (given by their own mean and standard deviation)
+and may be correlated; they are mapped to independent standard normals ``u`` through the
+Nataf transformation, which is exact for these two distributions. The design point is
+found with the Hasofer-Lind-Rackwitz-Fiessler (HL-RF) iteration using closed-form
+gradients of ``g``; ``beta = |u*|`` (negative when the mean point already fails) and
+``Pf = Phi(-beta)``. Breitung's second-order correction uses the curvatures of the limit
+state surface at the design point, from finite differences of the closed-form gradient.
+
+Every parameter may be an array: each element is an independent structure (a wall or a
+pile) and all of them iterate together, with converged elements dropped from later
+iterations, so thousands of walls cost a few dozen array operations.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Literal
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from . import tracing, vectorized
+from .uncertainty import LogNormal, Normal
+
+Gradient = Callable[..., dict[str, np.ndarray]]
+
+
+@dataclass(frozen=True)
+class LimitState:
+    """`g` and its gradient by variable, both called with every variable as a keyword."""
+
+    name: str
+    variables: tuple[str, ...]
+    g: Callable[..., np.ndarray]
+    gradient: Gradient
+
+
+def _sliding_g(mu: np.ndarray, W_kN: np.ndarray, T_kN: np.ndarray) -> np.ndarray:
+    return vectorized.sliding_fs(mu, W_kN, T_kN) - 1.0
+
+
+def _sliding_gradient(mu: np.ndarray, W_kN: np.ndarray, T_kN: np.ndarray) -> dict[str, np.ndarray]:
+    return {"mu": W_kN / T_kN, "W_kN": mu / T_kN, "T_kN": -mu * W_kN / T_kN**2}
+
+
+def _pile_g(
+    shaft_length_m: np.ndarray,
+    perimeter_m: np.ndarray,
+    area_tip_m2: np.ndarray,
+    unit_skin_kPa: np.ndarray,
+    unit_end_bearing_kPa: np.ndarray,
+    demand_kN: np.ndarray,
+) -> np.ndarray:
+    Q = vectorized.pile_axial_capacity_kN(
+        shaft_length_m, perimeter_m, area_tip_m2, unit_skin_kPa, unit_end_bearing_kPa
+    )
+    return Q - demand_kN
+
+
+def _pile_gradient(
+    shaft_length_m: np.ndarray,
+    perimeter_m: np.ndarray,
+    area_tip_m2: np.ndarray,
+    unit_skin_kPa: np.ndarray,
+    unit_end_bearing_kPa: np.ndarray,
+    demand_kN: np.ndarray,
+) -> dict[str, np.ndarray]:
+    return {
+        "shaft_length_m": unit_skin_kPa * perimeter_m,
+        "perimeter_m": unit_skin_kPa * shaft_length_m,
+        "area_tip_m2": unit_end_bearing_kPa,
+        "unit_skin_kPa": perimeter_m * shaft_length_m,
+        "unit_end_bearing_kPa": area_tip_m2,
+        "demand_kN": -np.ones_like(demand_kN),
+    }
+
+
+LIMIT_STATES: dict[str, LimitState] = {
+    "seawall-sliding": LimitState(
+        "seawall-sliding", ("mu", "W_kN", "T_kN"), _sliding_g, _sliding_gradient
+    ),
+    "pile-axial": LimitState(
+        "pile-axial",
+        (
+            "shaft_length_m",
+            "perimeter_m",
+            "area_tip_m2",
+            "unit_skin_kPa",
+            "unit_end_bearing_kPa",
+            "demand_kN",
+        ),
+        _pile_g,
+        _pile_gradient,
+    ),
+}
+
+
+@dataclass(frozen=True)
+class RandomVariable:
+    """A normal or lognormal variable; `mean` and `std` may be arrays (one per structure)."""
+
+    dist: Literal["normal", "lognormal"]
+    mean: ArrayLike
+    std: ArrayLike
+
+    @classmethod
+    def of(cls, spec: RandomVariable | Normal | LogNormal) -> RandomVariable:
+        if isinstance(spec, RandomVariable):
+            return spec
+        return cls("lognormal" if isinstance(spec, LogNormal) else "normal", spec.mean, spec.std)
+
+
+Variable = RandomVariable | Normal | LogNormal
+
+
+@dataclass(frozen=True)
+class FormResult:
+    """
+    Reliability index, first-order failure probability and its second-order (Breitung)
+    refinement, HL-RF iteration count and convergence per structure, the design point in
+    physical units and the direction cosines ``alpha`` of the design point in standard
+    normal space (``u* = beta alpha``; the importance factors are alpha**2).
+    """
+
+    beta: np.ndarray
+    pf: np.ndarray
+    pf_sorm: np.ndarray
+    iterations: np.ndarray
+    converged: np.ndarray
+    design_point: dict[str, np.ndarray]
+    alpha: dict[str, np.ndarray]
+
+
+# Step in standard normal space for the finite-difference Hessian of the SORM correction.
+HESSIAN_STEP = 1e-4
+
+_erfc = np.vectorize(math.erfc, otypes=[float])
+
+
+def normal_cdf(x: ArrayLike) -> np.ndarray:
+    """Standard normal CDF, accurate in the far tails."""
+    return 0.5 * _erfc(-np.asarray(x, dtype=float) / math.sqrt(2.0))
+
+
+def _breitung(
+    pf: np.ndarray, beta: np.ndarray, alpha: np.ndarray, hess: np.ndarray, grad_norm: np.ndarray
+) -> np.ndarray:
+    """
+    Breitung's SORM estimate Pf * prod(1 + beta kappa_i)^-1/2, with the principal
+    curvatures kappa_i of the limit state surface at the design point; NaN where the
+    formula does not apply (beta kappa_i <= -1).
+    """
+    n, k = alpha.shape
+    if k == 1:
+        return pf
+    # Householder reflection taking e_k to -+alpha: its other columns span the tangent plane.
+    v = alpha.copy()
+    v[:, -1] += np.where(alpha[:, -1] >= 0, 1.0, -1.0)
+    P = np.eye(k) - 2.0 * v[:, :, None] * v[:, None, :] / (v**2).sum(axis=1)[:, None, None]
+    tangent = np.einsum("nji,njl,nlm->nim", P, hess, P)[:, :-1, :-1]
+    kappa = np.linalg.eigvalsh(tangent / grad_norm[:, :, None])
+    factor = 1.0 + beta[:, None] * kappa
+    with np.errstate(invalid="ignore"):
+        correction = np.prod(np.where(factor > 0, factor, np.nan) ** -0.5, axis=1)
+    return pf * correction
+
+
+def _equivalent_correlation(
+    kinds: Sequence[str], cov: np.ndarray, sigma_ln: np.ndarray, rho: np.ndarray
+) -> np.ndarray:
+    """
+    Correlation of the underlying standard normals (n, k, k) for correlation `rho` (k, k)
+    between normal/lognormal variables with coefficients of variation `cov` (n, k).
+    """
+    n, k = cov.shape
+    R0 = np.broadcast_to(np.eye(k), (n, k, k)).copy()
+    for i in range(k):
+        for j in range(i + 1, k):
+            r = rho[i, j]
+            if r == 0.0:
+                continue
+            ln_i, ln_j = kinds[i] == "lognormal", kinds[j] == "lognormal"
+            if ln_i and ln_j:
+                value = np.log1p(r * cov[:, i] * cov[:, j]) / (sigma_ln[:, i] * sigma_ln[:, j])
+            elif ln_i:
+                value = r * cov[:, i] / sigma_ln[:, i]
+            elif ln_j:
+                value = r * cov[:, j] / sigma_ln[:, j]
+            else:
+                value = np.full(n, r)
+            R0[:, i, j] = R0[:, j, i] = value
+    return R0
+
+
+def form(
+    limit_state: str | LimitState,
+    variables: Mapping[str, Variable | ArrayLike],
+    correlation: Mapping[tuple[str, str], float] | None = None,
+    *,
+    tol: float = 1e-6,
+    max_iter: int = 100,
+) -> FormResult:
+    """
+    FORM analysis of `limit_state` with every one of its variables given either as a
+    random variable or as a fixed value. `correlation` maps pairs of random variables to
+    their correlation coefficient (0 when absent). Arrays give one analysis per element;
+    results have the broadcast shape of all parameters.
+    """
+    ls = LIMIT_STATES.get(limit_state) if isinstance(limit_state, str) else limit_state
+    if ls is None:
+        raise ValueError(
+            f"Unknown limit state {limit_state!r}; choose from {', '.join(LIMIT_STATES)}"
+        )
+    missing = [v for v in ls.variables if v not in variables]
+    unknown = sorted(set(variables) - set(ls.variables))
+    if missing or unknown:
+        raise ValueError(
+            f"{ls.name} takes {', '.join(ls.variables)};"
+            f" missing: {', '.join(missing) or '-'}, unknown: {', '.join(unknown) or '-'}"
+        )
+    specs: dict[str, RandomVariable] = {}
+    fixed: dict[str, np.ndarray] = {}
+    for v in ls.variables:
+        value = variables[v]
+        if isinstance(value, (RandomVariable, Normal, LogNormal)):
+            specs[v] = RandomVariable.of(value)
+        else:
+            fixed[v] = np.asarray(value, dtype=float)
+    if not specs:
+        raise ValueError("At least one variable must be random")
+    random = list(specs)
+    shape = np.broadcast_shapes(
+        *(np.shape(s.mean) for s in specs.values()),
+        *(np.shape(s.std) for s in specs.values()),
+        *(f.shape for f in fixed.values()),
+    )
+    n, k = math.prod(shape), len(random)
+
+    def column(x: ArrayLike) -> np.ndarray:
+        return np.broadcast_to(np.asarray(x, dtype=float), shape).ravel()
+
+    mean = np.stack([column(s.mean) for s in specs.values()], axis=1)
+    std = np.stack([column(s.std) for s in specs.values()], axis=1)
+    kinds = [s.dist for s in specs.values()]
+    lognormal = np.array([kind == "lognormal" for kind in kinds])
+    if not (std > 0).all() or not (mean[:, lognormal] > 0).all():
+        raise ValueError("Standard deviations, and lognormal means, must be > 0")
+    fixed_flat = {v: column(x) for v, x in fixed.items()}
+    cov = std / np.where(mean != 0, np.abs(mean), 1.0)
+    sigma_ln = np.where(lognormal, np.sqrt(np.log1p(cov**2)), 1.0)
+    mu_ln = np.where(lognormal, np.log(np.where(lognormal, mean, 1.0)) - 0.5 * sigma_ln**2, 0.0)
+
+    rho = np.eye(k)
+    for (a, b), r in (correlation or {}).items():
+        if a not in random or b not in random or a == b:
+            raise ValueError(f"Correlation pair ({a}, {b}) must name two random variables")
+        if not -1.0 < r < 1.0:
+            raise ValueError("Correlation coefficients must be within (-1, 1)")
+        i, j = random.index(a), random.index(b)
+        rho[i, j] = rho[j, i] = r
+    R0 = _equivalent_correlation(kinds, cov, sigma_ln, rho)
+    try:
+        L = np.linalg.cholesky(R0)
+    except np.linalg.LinAlgError:
+        raise ValueError("Correlation matrix is not positive definite") from None
+
+    def evaluate(rows: np.ndarray, u: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Physical point, g and the gradient of g in u-space for the given structures."""
+        z = np.einsum("nij,nj->ni", L[rows], u)
+        x = np.where(
+            lognormal,
+            np.exp(mu_ln[rows] + sigma_ln[rows] * z),
+            mean[rows] + std[rows] * z,
+        )
+        dx_dz = np.where(lognormal, sigma_ln[rows] * x, std[rows])
+        args = {v: x[:, i] for i, v in enumerate(random)}
+        args.update({v: f[rows] for v, f in fixed_flat.items()})
+        with np.errstate(divide="ignore", invalid="ignore"):
+            g = np.asarray(ls.g(**args), dtype=float)
+            grad_x = ls.gradient(**args)
+        dg_dz = np.stack([np.asarray(grad_x[v], dtype=float) for v in random], axis=1) * dx_dz
+        return x, g, np.einsum("nji,nj->ni", L[rows], dg_dz)
+
+    u = np.zeros((n, k))
+    g0 = np.zeros(n)
+    iterations = np.zeros(n, dtype=np.int64)
+    converged = np.zeros(n, dtype=bool)
+    active = np.arange(n)
+    with tracing.span("reliability.form", limit_state=ls.name, structures=n):
+        for it in range(max_iter):
+            if not len(active):
+                break
+            ua = u[active]
+            _, g, grad = evaluate(active, ua)
+            if it == 0:
+                g0[active] = g
+            norm2 = (grad**2).sum(axis=1)
+            ok = np.isfinite(g) & np.isfinite(norm2) & (norm2 > 0)
+            u_new = (((grad * ua).sum(axis=1) - g) / np.where(ok, norm2, 1.0))[:, None] * grad
+            step = np.linalg.norm(u_new - ua, axis=1)
+            scale = np.maximum(1.0, np.linalg.norm(u_new, axis=1))
+            done = (
+                ok
+                & (step <= tol * scale)
+                & (np.abs(g) <= tol * np.maximum(np.abs(g0[active]), 1e-12))
+            )
+            u[active[ok]] = u_new[ok]
+            iterations[active] += 1
+            converged[active[done]] = True
+            active = active[ok & ~done]
+
+        rows = np.arange(n)
+        x, g, grad = evaluate(rows, u)
+        # Hessian of G in u-space at the design point, by central differences of the
+        # closed-form gradient, for the second-order correction.
+        hess = np.empty((n, k, k))
+        for j in range(k):
+            step_u = np.zeros(k)
+            step_u[j] = HESSIAN_STEP
+            hess[:, :, j] = (evaluate(rows, u + step_u)[2] - evaluate(rows, u - step_u)[2]) / (
+                2 * HESSIAN_STEP
+            )
+    norm = np.linalg.norm(u, axis=1)
+    beta = np.where(converged, np.where(g0 < 0, -norm, norm), np.nan)
+    grad_norm = np.linalg.norm(grad, axis=1, keepdims=True)
+    alpha = -grad / np.where(grad_norm > 0, grad_norm, 1.0)
+    pf = normal_cdf(-beta)
+    return FormResult(
+        beta=beta.reshape(shape),
+        pf=pf.reshape(shape),
+        pf_sorm=_breitung(
+            pf, beta, alpha, 0.5 * (hess + hess.transpose(0, 2, 1)), grad_norm
+        ).reshape(shape),
+        iterations=iterations.reshape(shape),
+        converged=converged.reshape(shape),
+        design_point={v: x[:, i].reshape(shape) for i, v in enumerate(random)},
+        alpha={v: alpha[:, i].reshape(shape) for i, v in enumerate(random)},
+    )
@@ -1,5 +1,5 @@
 """
-Report template generation.
+Report template generation (CSV, or Parquet for a ``.parquet`` path).
 
 Author: Nik Jois <nikjois@llamasearch.ai>
 """
@@ -10,28 +10,35 @@ from pathlib import Path
 
 import pandas as pd
 
+from .columnar import write_table
+
+REPORT_COLUMNS = [
+    "project",
+    "location",
+    "jurisdiction",
+    "waterbody",
+    "design_wave_Hs_m",
+    "design_Tp_s",
+    "water_depth_m",
+    "pile_D_m",
+    "morison_Cd",
+    "morison_Cm",
+    "mooring_wind_area_m2",
+    "mooring_current_area_m2",
+    "mooring_wind_mps",
+    "mooring_current_mps",
+    "berthing_mass_tonnes",
+    "berthing_speed_knots",
+    "seawall_mu",
+    "seawall_W_kN",
+    "seawall_T_kN",
+    "notes",
+]
+
+
+TEXT_COLUMNS = frozenset({"project", "location", "jurisdiction", "waterbody", "notes"})
+REPORT_DTYPES = {c: "string" if c in TEXT_COLUMNS else "float64" for c in REPORT_COLUMNS}
+
 
 def write_report_template(path: Path) -> None:
-    cols = [
-        "project",
-        "location",
-        "jurisdiction",
-        "waterbody",
-        "design_wave_Hs_m",
-        "design_Tp_s",
-        "water_depth_m",
-        "pile_D_m",
-        "morison_Cd",
-        "morison_Cm",
-        "mooring_wind_area_m2",
-        "mooring_current_area_m2",
-        "mooring_wind_mps",
-        "mooring_current_mps",
-        "berthing_mass_tonnes",
-        "berthing_speed_knots",
-        "seawall_mu",
-        "seawall_W_kN",
-        "seawall_T_kN",
-        "notes",
-    ]
-    pd.DataFrame(columns=cols).to_csv(path, index=False)
+    write_table(pd.DataFrame(columns=REPORT_COLUMNS), path, dtypes=REPORT_DTYPES)
@@ -0,0 +1,132 @@
+"""
+Optimized response encoding for array-heavy and static API endpoints.
+
+Arrays are serialized straight from numpy with orjson when it is installed (stdlib json
+otherwise), skipping per-element Pydantic validation. Clients that send
+``Accept: application/msgpack`` receive a compact MessagePack body instead of JSON.
+Compression above a size threshold is handled by Starlette's GZipMiddleware in server.py.
+Static reference payloads are serialized once and served with a strong ETag so clients and
+proxies can revalidate with If-None-Match and receive 304 Not Modified.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without the 'fast' extra
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - exercised only without the 'fast' extra
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_ALIASES = frozenset(
+    {"application/msgpack", "application/x-msgpack", "application/vnd.msgpack"}
+)
+_JSON_RANGES = frozenset({"application/json", "application/*", "*/*"})
+
+
+def _to_builtin(obj: Any) -> Any:
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+def dumps_json(content: Any) -> bytes:
+    """Serialize content (numpy arrays allowed) to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_to_builtin, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, default=_to_builtin, separators=(",", ":")).encode()
+
+
+def dumps_msgpack(content: Any) -> bytes:
+    """Serialize content (numpy arrays allowed) to MessagePack bytes."""
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed; install the 'fast' extra")
+    return msgpack.packb(content, default=_to_builtin, use_bin_type=True)
+
+
+def _quality(media_range: str) -> tuple[str, float]:
+    media_type, *params = (part.strip() for part in media_range.split(";"))
+    q = 1.0
+    for param in params:
+        key, _, value = param.partition("=")
+        if key.strip() == "q":
+            try:
+                q = float(value)
+            except ValueError:
+                q = 0.0
+    return media_type.lower(), q
+
+
+def wants_msgpack(accept: str) -> bool:
+    """True when the Accept header prefers MessagePack over JSON."""
+    msgpack_q = 0.0
+    json_q = 0.0
+    for media_range in accept.split(","):
+        if not media_range.strip():
+            continue
+        media_type, q = _quality(media_range)
+        if media_type in _MSGPACK_ALIASES:
+            msgpack_q = max(msgpack_q, q)
+        elif media_type in _JSON_RANGES:
+            json_q = max(json_q, q)
+    return msgpack_q > 0.0 and msgpack_q >= json_q
+
+
+def negotiated_response(request: Request, content: Any, status_code: int = 200) -> Response:
+    """Encode content as MessagePack or JSON according to the request's Accept header."""
+    headers = {"Vary": "Accept"}
+    if msgpack is not None and wants_msgpack(request.headers.get("accept", "")):
+        return Response(
+            dumps_msgpack(content), status_code, headers=headers, media_type=MSGPACK_MEDIA_TYPE
+        )
+    return Response(dumps_json(content), status_code, headers=headers, media_type=JSON_MEDIA_TYPE)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match evaluation (weak comparison, as RFC 9110 requires for this header)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+@dataclass(frozen=True)
+class StaticPayload:
+    """A JSON body serialized once, with a strong ETag and Cache-Control for conditional GET."""
+
+    body: bytes
+    etag: str
+    cache_control: str
+
+    @classmethod
+    def from_content(cls, content: Any, max_age_s: int = 3600) -> StaticPayload:
+        body = dumps_json(content)
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        return cls(body=body, etag=etag, cache_control=f"public, max-age={max_age_s}")
+
+    def response(self, request: Request) -> Response:
+        """200 with the cached body, or 304 when the client already holds this version."""
+        headers = {"ETag": self.etag, "Cache-Control": self.cache_control}
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(self.body, headers=headers, media_type=JSON_MEDIA_TYPE)
@@ -0,0 +1,230 @@
+"""
+Local SQLite store of calculation results.
+
+Every stored result carries the calculation name, its inputs and outputs as JSON, the
+package version that produced it, the project and jurisdiction it belongs to (when
+known) and where it ran (``cli``, ``api``, ``stdio`` or ``batch``). Results are keyed by
+``input_hash``: a SHA-256 of the calculation name and canonical JSON of the inputs, so
+the same inputs hash identically from the CLI, the API and the stdio worker, and a rerun
+can tell which inputs already have a result for the current version.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+from collections.abc import Iterable, Mapping
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from . import __version__
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    calc TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    version TEXT NOT NULL,
+    project TEXT,
+    jurisdiction TEXT,
+    source TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    outputs TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_input ON results (input_hash, version);
+CREATE INDEX IF NOT EXISTS results_calc ON results (calc, created_at);
+CREATE INDEX IF NOT EXISTS results_project ON results (project, calc);
+CREATE INDEX IF NOT EXISTS results_jurisdiction ON results (jurisdiction, calc);
+"""
+
+# Host parameters per IN (...) lookup; below SQLite's historical limit of 999.
+_LOOKUP_BATCH = 900
+
+
+def canonical_inputs(inputs: Mapping[str, Any]) -> str:
+    """Inputs as JSON with sorted keys and no whitespace (the form that is hashed)."""
+    return json.dumps(inputs, sort_keys=True, separators=(",", ":"))
+
+
+def input_hash(calc: str, inputs: Mapping[str, Any] | str) -> str:
+    """SHA-256 of the calculation name and its canonical inputs (str: already canonical)."""
+    text = inputs if isinstance(inputs, str) else canonical_inputs(inputs)
+    return hashlib.sha256(f"{calc}\n{text}".encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class StoredResult:
+    """One stored calculation run."""
+
+    id: int
+    calc: str
+    input_hash: str
+    version: str
+    project: str | None
+    jurisdiction: str | None
+    source: str
+    inputs: dict[str, Any]
+    outputs: dict[str, Any]
+    created_at: str
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class ResultRecord:
+    """A result to insert; `inputs` is canonical JSON and `outputs` a JSON object."""
+
+    calc: str
+    inputs: str
+    outputs: str
+    project: str | None = None
+    jurisdiction: str | None = None
+
+
+class ResultsStore:
+    """Append-only results table with lookups by project, jurisdiction, calc and hash."""
+
+    def __init__(self, path: Path, version: str = __version__) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.version = version
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+
+    def record(
+        self,
+        calc: str,
+        inputs: Mapping[str, Any],
+        outputs: Mapping[str, Any],
+        *,
+        source: str,
+        project: str | None = None,
+        jurisdiction: str | None = None,
+    ) -> str:
+        """Store one result and return its input hash."""
+        text = canonical_inputs(inputs)
+        self.record_many(
+            [ResultRecord(calc, text, json.dumps(outputs), project, jurisdiction)], source=source
+        )
+        return input_hash(calc, text)
+
+    def record_many(self, records: Iterable[ResultRecord], *, source: str) -> int:
+        """Store many results in one transaction; returns the number stored."""
+        now = datetime.now(UTC).isoformat(timespec="milliseconds")
+        rows = [
+            (
+                r.calc,
+                input_hash(r.calc, r.inputs),
+                self.version,
+                r.project,
+                r.jurisdiction,
+                source,
+                r.inputs,
+                r.outputs,
+                now,
+            )
+            for r in records
+        ]
+        with self._lock:
+            with self._db:  # one transaction
+                self._db.execute("BEGIN")
+                self._db.executemany(
+                    "INSERT INTO results (calc, input_hash, version, project, jurisdiction,"
+                    " source, inputs, outputs, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        return len(rows)
+
+    def existing_hashes(self, hashes: Iterable[str]) -> set[str]:
+        """The subset of `hashes` that already have a result for this store's version."""
+        wanted = list(dict.fromkeys(hashes))
+        found: set[str] = set()
+        with self._lock:
+            for i in range(0, len(wanted), _LOOKUP_BATCH):
+                batch = wanted[i : i + _LOOKUP_BATCH]
+                marks = ",".join("?" * len(batch))
+                rows = self._db.execute(
+                    f"SELECT DISTINCT input_hash FROM results"
+                    f" WHERE version = ? AND input_hash IN ({marks})",
+                    (self.version, *batch),
+                ).fetchall()
+                found.update(r[0] for r in rows)
+        return found
+
+    def stored_outputs(self, hashes: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Latest outputs for each of `hashes` that has a result for this store's version."""
+        wanted = list(dict.fromkeys(hashes))
+        found: dict[str, dict[str, Any]] = {}
+        with self._lock:
+            for i in range(0, len(wanted), _LOOKUP_BATCH):
+                batch = wanted[i : i + _LOOKUP_BATCH]
+                marks = ",".join("?" * len(batch))
+                rows = self._db.execute(
+                    f"SELECT input_hash, outputs FROM results"
+                    f" WHERE version = ? AND input_hash IN ({marks}) ORDER BY id",
+                    (self.version, *batch),
+                ).fetchall()
+                # Later rows overwrite earlier ones, so the newest result wins.
+                found.update((r[0], json.loads(r[1])) for r in rows)
+        return found
+
+    def query(
+        self,
+        *,
+        calc: str | None = None,
+        project: str | None = None,
+        jurisdiction: str | None = None,
+        input_hash: str | None = None,
+        version: str | None = None,
+        limit: int = 100,
+    ) -> list[StoredResult]:
+        """Most recent results first, filtered by any of the given fields."""
+        if limit < 1:
+            raise ValueError("limit must be >= 1")
+        filters = {
+            "calc": calc,
+            "project": project,
+            "jurisdiction": jurisdiction,
+            "input_hash": input_hash,
+            "version": version,
+        }
+        where = [f"{col} = ?" for col, value in filters.items() if value is not None]
+        args = [value for value in filters.values() if value is not None]
+        sql = "SELECT * FROM results"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id DESC LIMIT ?"
+        with self._lock:
+            rows = self._db.execute(sql, (*args, limit)).fetchall()
+        return [
+            StoredResult(
+                id=r["id"],
+                calc=r["calc"],
+                input_hash=r["input_hash"],
+                version=r["version"],
+                project=r["project"],
+                jurisdiction=r["jurisdiction"],
+                source=r["source"],
+                inputs=json.loads(r["inputs"]),
+                outputs=json.loads(r["outputs"]),
+                created_at=r["created_at"],
+            )
+            for r in rows
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
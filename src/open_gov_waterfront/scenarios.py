@@ -0,0 +1,287 @@
+"""
+Scenario matrices: calculations swept over the cartesian product of named axes.
+
+A study declares its axes (state, return period, sea-level-rise scenario, vessel class,
+pile size, ...) and the calculations to run. The product is never materialized:
+combinations are numbered ``0 .. size - 1`` in C order (last axis fastest) and generated
+chunk by chunk from those numbers, so memory is bounded by the chunk size however large
+the product is.
+
+An axis is either a sequence of values for the parameter of the same name, or a mapping
+from labels to values; a label's value may itself be a mapping of several parameters (a
+vessel class setting both ``mass_tonnes`` and ``speed_knots``). Axes with text values
+(``["CA", "OH"]``) only label combinations unless ``derive`` turns them into parameters.
+Calculations are the array forms in ``calcs.ARRAY_CALCS`` and take their usual parameter
+names.
+
+Runs reduce to an envelope (maximum and minimum of each output, and the combinations
+attaining them), overall or per group of axes. Criteria prune combinations as soon as the
+column they test is available: a combination failing one is counted, left out of the
+envelope and not evaluated by later calculations.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import numpy as np
+import pandas as pd
+
+from .calcs import ArrayCalc, array_calc
+
+DEFAULT_CHUNK = 65_536
+
+AxisValues = Sequence[Any] | Mapping[Any, Any]
+Columns = dict[str, np.ndarray]
+
+
+def _label(value: Any) -> str:
+    return f"{value:g}" if isinstance(value, (int, float, np.number)) else str(value)
+
+
+@dataclass(frozen=True)
+class Axis:
+    """One axis: a label per position and the parameter columns it sets."""
+
+    name: str
+    labels: tuple[str, ...]
+    columns: dict[str, np.ndarray]
+
+    @classmethod
+    def of(cls, name: str, values: AxisValues) -> Axis:
+        """Build an axis from a sequence of values or a mapping of labels to values."""
+        if isinstance(values, Mapping):
+            labels = tuple(str(k) for k in values)
+            items = list(values.values())
+        else:
+            items = list(values)
+            labels = tuple(_label(v) for v in items)
+        if not items:
+            raise ValueError(f"Axis {name!r} has no values")
+        if all(isinstance(v, Mapping) for v in items):
+            params = list(items[0])
+            if any(list(v) != params for v in items):
+                raise ValueError(f"Every value of axis {name!r} must set the same parameters")
+            columns = {p: np.asarray([v[p] for v in items]) for p in params}
+        elif any(isinstance(v, Mapping) for v in items):
+            raise ValueError(f"Axis {name!r} mixes parameter mappings and plain values")
+        else:
+            columns = {name: np.asarray(items)}
+        return cls(name, labels, columns)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+
+Op = Literal["<=", "<", ">=", ">"]
+
+_OPS: dict[str, Callable[[np.ndarray, float], np.ndarray]] = {
+    "<=": np.less_equal,
+    "<": np.less,
+    ">=": np.greater_equal,
+    ">": np.greater,
+}
+
+
+@dataclass(frozen=True)
+class Criterion:
+    """Pass condition ``column op limit``; NaN (invalid) results fail."""
+
+    column: str
+    op: Op
+    limit: float
+
+    def __post_init__(self) -> None:
+        if self.op not in _OPS:
+            raise ValueError(f"Unknown comparison {self.op!r}; use one of {', '.join(_OPS)}")
+
+    @property
+    def label(self) -> str:
+        return f"{self.column} {self.op} {self.limit:g}"
+
+    def passes(self, values: np.ndarray) -> np.ndarray:
+        return _OPS[self.op](np.asarray(values, dtype=float), self.limit)
+
+
+@dataclass(frozen=True)
+class ScenarioResult:
+    """
+    Counts and envelope of a run. `envelope` has one row per group (one row overall
+    without grouping) with the group's axis labels, ``combinations``, ``passed``, and per
+    output ``<out>_max``, ``<out>_argmax``, ``<out>_min`` and ``<out>_argmin``; the
+    ``arg`` columns hold combination numbers (see ``ScenarioStudy.combination``) and are
+    -1 where no passing combination had a valid result.
+    """
+
+    combinations: int
+    evaluated: dict[str, int]
+    failed: dict[str, int]
+    envelope: pd.DataFrame
+
+
+class _Extreme:
+    """Running per-group maximum of an output and the first combination attaining it."""
+
+    def __init__(self, groups: int) -> None:
+        self.best = np.full(groups, -np.inf)
+        self.index = np.full(groups, -1, dtype=np.int64)
+
+    def update(self, group: np.ndarray, values: np.ndarray, index: np.ndarray) -> None:
+        ok = ~np.isnan(values)
+        group, values, index = group[ok], values[ok], index[ok]
+        if not len(values):
+            return
+        order = np.lexsort((index, -values, group))
+        group, values, index = group[order], values[order], index[order]
+        first = np.r_[True, group[1:] != group[:-1]]
+        group, values, index = group[first], values[first], index[first]
+        better = values > self.best[group]
+        self.best[group[better]] = values[better]
+        self.index[group[better]] = index[better]
+
+
+class ScenarioStudy:
+    """
+    Calculations over the product of `axes`, with `fixed` parameters shared by every
+    combination and an optional `derive` step adding columns computed from the others
+    (e.g. design water depth from a base depth and the sea-level-rise axis).
+    """
+
+    def __init__(
+        self,
+        axes: Mapping[str, AxisValues],
+        calcs: Sequence[str | ArrayCalc],
+        fixed: Mapping[str, Any] | None = None,
+        derive: Callable[[Columns], Mapping[str, np.ndarray]] | None = None,
+    ) -> None:
+        if not axes:
+            raise ValueError("A study needs at least one axis")
+        self.axes = [Axis.of(name, values) for name, values in axes.items()]
+        self.calcs = [array_calc(c) if isinstance(c, str) else c for c in calcs]
+        self.fixed = dict(fixed or {})
+        self.derive = derive
+        seen: set[str] = set(self.fixed)
+        for col in (c for ax in self.axes for c in ax.columns):
+            if col in seen:
+                raise ValueError(f"Parameter {col!r} is set more than once")
+            seen.add(col)
+        for calc in self.calcs:
+            clash = seen & set(calc.outputs)
+            if clash:
+                raise ValueError(f"{calc.name} outputs clash with: {', '.join(sorted(clash))}")
+            seen |= set(calc.outputs)
+        self.shape = tuple(len(ax) for ax in self.axes)
+        self.size = math.prod(self.shape)
+
+    def _axis(self, name: str) -> int:
+        for i, ax in enumerate(self.axes):
+            if ax.name == name:
+                return i
+        raise ValueError(f"Unknown axis {name!r}")
+
+    def combination(self, index: int) -> dict[str, str]:
+        """Axis labels of combination number `index`."""
+        if not 0 <= index < self.size:
+            raise ValueError(f"Combination {index} is out of range 0..{self.size - 1}")
+        codes = np.unravel_index(index, self.shape)
+        return {ax.name: ax.labels[int(c)] for ax, c in zip(self.axes, codes, strict=True)}
+
+    def chunks(
+        self, chunk_size: int = DEFAULT_CHUNK
+    ) -> Iterator[tuple[np.ndarray, tuple[np.ndarray, ...], Columns]]:
+        """
+        Combination numbers, per-axis positions and input columns (axes, fixed and
+        derived), `chunk_size` combinations at a time.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        for start in range(0, self.size, chunk_size):
+            index = np.arange(start, min(start + chunk_size, self.size), dtype=np.int64)
+            codes = np.unravel_index(index, self.shape)
+            columns: Columns = {}
+            for ax, code in zip(self.axes, codes, strict=True):
+                for name, values in ax.columns.items():
+                    columns[name] = values[code]
+            for name, value in self.fixed.items():
+                columns[name] = np.broadcast_to(np.asarray(value), index.shape)
+            if self.derive is not None:
+                columns.update({k: np.asarray(v) for k, v in self.derive(columns).items()})
+            yield index, codes, columns
+
+    def run(
+        self,
+        outputs: Sequence[str] | None = None,
+        by: Sequence[str] = (),
+        criteria: Sequence[Criterion] = (),
+        chunk_size: int = DEFAULT_CHUNK,
+    ) -> ScenarioResult:
+        """
+        Evaluate every combination and reduce `outputs` (all calculation outputs when
+        None) to their envelope per group of the `by` axes.
+        """
+        produced = [out for calc in self.calcs for out in calc.outputs]
+        outputs = list(produced if outputs is None else outputs)
+        unknown = set(outputs) - set(produced)
+        if unknown:
+            raise ValueError(f"Not a calculation output: {', '.join(sorted(unknown))}")
+        by_axes = [self._axis(name) for name in by]
+        by_shape = tuple(self.shape[i] for i in by_axes)
+        groups = math.prod(by_shape)
+        total = np.zeros(groups, dtype=np.int64)
+        passed = np.zeros(groups, dtype=np.int64)
+        maxima = {out: _Extreme(groups) for out in outputs}
+        minima = {out: _Extreme(groups) for out in outputs}
+        evaluated = {calc.name: 0 for calc in self.calcs}
+        failed = {c.label: 0 for c in criteria}
+        pending = list(criteria)
+
+        for index, codes, columns in self.chunks(chunk_size):
+            group = (
+                np.ravel_multi_index([codes[i] for i in by_axes], by_shape)
+                if by_axes
+                else np.zeros(len(index), dtype=np.int64)
+            )
+            total += np.bincount(group, minlength=groups)
+            checks = list(pending)
+            for calc in [None, *self.calcs]:
+                if calc is not None:
+                    columns.update(calc(columns))
+                    evaluated[calc.name] += len(index)
+                keep = np.ones(len(index), dtype=bool)
+                for crit in [c for c in checks if c.column in columns]:
+                    ok = crit.passes(columns[crit.column]) & keep
+                    failed[crit.label] += int(keep.sum() - ok.sum())
+                    keep = ok
+                    checks.remove(crit)
+                if not keep.all():
+                    index, group = index[keep], group[keep]
+                    columns = {k: v[keep] for k, v in columns.items()}
+            if checks:
+                missing = ", ".join(c.column for c in checks)
+                raise ValueError(f"Criteria test columns no step produces: {missing}")
+            passed += np.bincount(group, minlength=groups)
+            for out in outputs:
+                if len(index):
+                    values = np.asarray(columns[out], dtype=float)
+                    maxima[out].update(group, values, index)
+                    minima[out].update(group, -values, index)
+
+        envelope: dict[str, Any] = {}
+        if by_axes:
+            positions = np.unravel_index(np.arange(groups), by_shape)
+            for i, pos in zip(by_axes, positions, strict=True):
+                envelope[self.axes[i].name] = np.asarray(self.axes[i].labels)[pos]
+        envelope["combinations"] = total
+        envelope["passed"] = passed
+        for out in outputs:
+            hi, lo = maxima[out], minima[out]
+            envelope[f"{out}_max"] = np.where(hi.index >= 0, hi.best, np.nan)
+            envelope[f"{out}_argmax"] = hi.index
+            envelope[f"{out}_min"] = np.where(lo.index >= 0, -lo.best, np.nan)
+            envelope[f"{out}_argmin"] = lo.index
+        return ScenarioResult(self.size, evaluated, failed, pd.DataFrame(envelope))
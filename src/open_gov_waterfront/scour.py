@@ -6,9 +6,11 @@ Author: Nik Jois <nikjois@llamasearch.ai>
 
 from __future__ import annotations
 
+from .timing import timed
 from .utils import g
 
 
+@timed
 def pile_scour_depth_m(D_m: float, U_mps: float, K: float = 2.0, m: float = 1.0) -> float:
     """
     Screening scour at a cylindrical pile in steady current:
@@ -6,7 +6,10 @@ Author: Nik Jois <nikjois@llamasearch.ai>
 
 from __future__ import annotations
 
+from .timing import timed
 
+
+@timed
 def sliding_fs(mu: float, W_kN: float, T_kN: float) -> float:
     """
     Factor of safety against sliding: FS = (mu * W) / T
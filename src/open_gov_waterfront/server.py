@@ -7,22 +7,37 @@ Author: Nik Jois <nikjois@llamasearch.ai>
 from __future__ import annotations
 
 import logging
-from collections.abc import AsyncGenerator
+import threading
+from collections.abc import AsyncGenerator, Mapping
 from contextlib import asynccontextmanager
+from typing import Any
 
-from fastapi import FastAPI, HTTPException
+import anyio.to_thread
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-
-from . import __version__
-from .berthing import berthing_energy_J, fender_reaction_kN
-from .corrosion import CorrosionInputs, remaining_thickness_mm
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, Response
+from pydantic import BaseModel, ValidationError
+
+from . import __version__, calcs, tracing
+from .admission import AdmissionLimits, AdmissionMiddleware, build_gates
+from .jobs import JOBS_DB, JobQueue
+from .metrics import (
+    PROMETHEUS_MEDIA_TYPE,
+    MetricsMiddleware,
+    MetricsRegistry,
+    admission_collector,
+    dispersion_cache_collector,
+    timing_collector,
+)
 from .models import (
     BerthingRequest,
     BerthingResponse,
     CorrosionRequest,
     CorrosionResponse,
     HealthResponse,
+    JobRequest,
+    JobResponse,
     MooringRequest,
     MooringResponse,
     MorisonRequest,
@@ -33,25 +48,43 @@ from .models import (
     ScourResponse,
     SeawallRequest,
     SeawallResponse,
+    TideRequest,
+    TideResponse,
     WaveRequest,
     WaveResponse,
 )
-from .mooring import EnvLoads, mooring_total_load_N
-from .morison import MorisonCoeffs, morison_inline_max_per_length_N
-from .piles import PileAxialInputs, pile_axial_capacity_kN
-from .scour import pile_scour_depth_m
-from .seawall import sliding_fs
+from .profiling import ProfiledRoute, ProfilingMiddleware
+from .responses import StaticPayload, negotiated_response
+from .results import ResultsStore
+from .settings import APP_IMPORT_PATH, get_settings
 from .states import list_states
-from .waves import celerity_c, group_celerity_cg, shoaling_coefficient, wavelength_L
+from .tracing import TracingMiddleware, span
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def size_thread_pool() -> int:
+    """
+    Raise anyio's thread limit to the admission gates' combined in-flight limits, so every
+    admitted request gets a worker thread at once instead of waiting unseen in the
+    limiter, beyond the gates' queue timeout and metrics. Returns the new limit.
+    """
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    admitted = settings.scalar_max_in_flight + settings.series_max_in_flight
+    limiter.total_tokens = max(limiter.total_tokens, admitted)
+    return int(limiter.total_tokens)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("Starting OpenGov-WaterfrontEngineering API server v%s", __version__)
+    size_thread_pool()
+    if (settings.jobs_dir / JOBS_DB).exists():
+        get_job_queue()  # resume jobs interrupted by the last shutdown
     yield
+    if _job_queue is not None:
+        _job_queue.shutdown(wait=False)
     logger.info("Shutting down OpenGov-WaterfrontEngineering API server")
 
 
@@ -61,7 +94,29 @@ app = FastAPI(
     version=__version__,
     lifespan=lifespan,
 )
+# Lets the profiling hook follow sync handlers into the thread pool; a no-op otherwise.
+app.router.route_class = ProfiledRoute
+
+settings = get_settings()
+admission_gates = build_gates(
+    scalar=AdmissionLimits(
+        max_in_flight=settings.scalar_max_in_flight,
+        max_queue=settings.scalar_max_queue,
+        queue_timeout_s=settings.admission_timeout_s,
+    ),
+    series=AdmissionLimits(
+        max_in_flight=settings.series_max_in_flight,
+        max_queue=settings.series_max_queue,
+        queue_timeout_s=settings.admission_timeout_s,
+    ),
+)
 
+if settings.profiling_enabled:
+    app.add_middleware(
+        ProfilingMiddleware, profile_dir=settings.profile_dir, top_n=settings.profile_top_n
+    )
+app.add_middleware(GZipMiddleware, minimum_size=settings.gzip_min_bytes)
+app.add_middleware(AdmissionMiddleware, gates=admission_gates, retry_after_s=settings.retry_after_s)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -70,6 +125,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+metrics = MetricsRegistry()
+metrics.add_collector(admission_collector(admission_gates))
+metrics.add_collector(dispersion_cache_collector)
+metrics.add_collector(timing_collector)
+# app.routes is the router's own list, so routes declared below are matched too.
+app.add_middleware(MetricsMiddleware, registry=metrics, routes=app.routes)
+if settings.trace_file is not None:
+    tracing.configure(settings.trace_file)
+app.add_middleware(TracingMiddleware)
+
+results_store = ResultsStore(settings.results_db) if settings.results_db is not None else None
+
+
+def _record(calc: str, req: BaseModel, outputs: Mapping[str, Any], request: Request) -> None:
+    """
+    Store a result when a results database is configured; project and jurisdiction come
+    from the X-Project and X-Jurisdiction request headers. Storage errors (a locked
+    database, say) are logged and do not fail the request.
+    """
+    if results_store is None:
+        return
+    try:
+        results_store.record(
+            calc,
+            req.model_dump(),
+            calcs.storable(calc, outputs),
+            source="api",
+            project=request.headers.get("x-project"),
+            jurisdiction=request.headers.get("x-jurisdiction"),
+        )
+    except Exception as e:
+        # The result is already computed; a storage problem must not cost the caller it.
+        logger.warning("Could not record %s result: %s", calc, e)
+
 
 @app.get("/health", response_model=HealthResponse)
 async def health() -> HealthResponse:
@@ -77,10 +166,14 @@ async def health() -> HealthResponse:
     return HealthResponse(status="healthy", version=__version__)
 
 
-@app.get("/states")
-async def get_states() -> JSONResponse:
-    """List supported state profiles."""
-    states = [
+@app.get("/metrics")
+async def get_metrics() -> Response:
+    """Request, latency, admission and cache metrics in Prometheus text format."""
+    return Response(metrics.render(), media_type=PROMETHEUS_MEDIA_TYPE)
+
+
+def _states_content() -> dict[str, list[dict[str, object]]]:
+    states: list[dict[str, object]] = [
         {
             "code": p.code,
             "name": p.name,
@@ -90,135 +183,236 @@ async def get_states() -> JSONResponse:
         }
         for p in list_states()
     ]
-    return JSONResponse(content={"states": states})
+    return {"states": states}
+
+
+# State profiles never change at runtime: serialize once and serve with an ETag.
+STATES_PAYLOAD = StaticPayload.from_content(_states_content())
+
+
+@app.get("/states")
+async def get_states(request: Request) -> Response:
+    """List supported state profiles (supports If-None-Match)."""
+    return STATES_PAYLOAD.response(request)
 
 
+# Calculation handlers are plain functions: FastAPI runs them in its thread pool, so the
+# numpy kernels, serialization and result storage never block the event loop.
 @app.post("/waves", response_model=WaveResponse)
-async def calculate_waves(req: WaveRequest) -> WaveResponse:
+def calculate_waves(req: WaveRequest, request: Request) -> WaveResponse:
     """Calculate linear wave properties."""
     try:
-        L = wavelength_L(req.T_s, req.h_m)
-        c = celerity_c(req.T_s, req.h_m)
-        cg = group_celerity_cg(req.T_s, req.h_m)
-        Ks = shoaling_coefficient(None, req.T_s, req.h_m)
-        return WaveResponse(
-            wavelength_m=L, celerity_mps=c, group_celerity_mps=cg, shoaling_coefficient=Ks
-        )
+        with span("api.waves", T_s=req.T_s, h_m=req.h_m):
+            out = calcs.waves(req)
+            response = WaveResponse(**out)
     except Exception as e:
         logger.error("Error calculating waves: %s", str(e))
         raise HTTPException(status_code=400, detail=str(e))
+    _record("waves", req, out, request)
+    return response
 
 
 @app.post("/morison", response_model=MorisonResponse)
-async def calculate_morison(req: MorisonRequest) -> MorisonResponse:
+def calculate_morison(req: MorisonRequest, request: Request) -> MorisonResponse:
     """Calculate Morison inline force."""
     try:
-        FpL = morison_inline_max_per_length_N(
-            req.D_m, req.u_amp_mps, req.a_amp_mps2, coeffs=MorisonCoeffs(Cd=req.Cd, Cm=req.Cm)
-        )
-        return MorisonResponse(force_per_length_Npm=FpL)
+        with span("api.morison"):
+            out = calcs.morison(req)
+            response = MorisonResponse(**out)
     except Exception as e:
         logger.error("Error calculating Morison force: %s", str(e))
         raise HTTPException(status_code=400, detail=str(e))
+    _record("morison", req, out, request)
+    return response
 
 
 @app.post("/berthing", response_model=BerthingResponse)
-async def calculate_berthing(req: BerthingRequest) -> BerthingResponse:
+def calculate_berthing(req: BerthingRequest, request: Request) -> BerthingResponse:
     """Calculate berthing energy and fender reaction."""
     try:
-        E = berthing_energy_J(req.mass_tonnes, req.speed_knots, Ce=req.Ce, Cc=req.Cc, Cs=req.Cs)
-        RkN = fender_reaction_kN(E, efficiency=req.efficiency, deflection_m=req.deflection_m)
-        return BerthingResponse(energy_J=E, fender_reaction_kN=RkN)
+        with span("api.berthing"):
+            out = calcs.berthing(req)
+            response = BerthingResponse(**out)
     except Exception as e:
         logger.error("Error calculating berthing: %s", str(e))
         raise HTTPException(status_code=400, detail=str(e))
+    _record("berthing", req, out, request)
+    return response
 
 
 @app.post("/mooring", response_model=MooringResponse)
-async def calculate_mooring(req: MooringRequest) -> MooringResponse:
+def calculate_mooring(req: MooringRequest, request: Request) -> MooringResponse:
     """Calculate mooring environmental load."""
     try:
-        env = EnvLoads(
-            A_wind_m2=req.A_wind_m2,
-            A_current_m2=req.A_current_m2,
-            U_wind_mps=req.U_wind_mps,
-            U_current_mps=req.U_current_mps,
-            Cd_wind=req.Cd_wind,
-            Cd_current=req.Cd_current,
-            safety_factor=req.safety_factor,
-        )
-        F = mooring_total_load_N(env)
-        return MooringResponse(total_load_N=F)
+        with span("api.mooring"):
+            out = calcs.mooring(req)
+            response = MooringResponse(**out)
     except Exception as e:
         logger.error("Error calculating mooring load: %s", str(e))
         raise HTTPException(status_code=400, detail=str(e))
+    _record("mooring", req, out, request)
+    return response
 
 
 @app.post("/pile-axial", response_model=PileAxialResponse)
-async def calculate_pile_axial(req: PileAxialRequest) -> PileAxialResponse:
+def calculate_pile_axial(req: PileAxialRequest, request: Request) -> PileAxialResponse:
     """Calculate pile axial capacity."""
     try:
-        Q = pile_axial_capacity_kN(
-            PileAxialInputs(
-                shaft_length_m=req.shaft_length_m,
-                perimeter_m=req.perimeter_m,
-                area_tip_m2=req.area_tip_m2,
-                unit_skin_kPa=req.unit_skin_kPa,
-                unit_end_bearing_kPa=req.unit_end_bearing_kPa,
-            )
-        )
-        return PileAxialResponse(capacity_kN=Q)
+        with span("api.pile_axial"):
+            out = calcs.pile_axial(req)
+            response = PileAxialResponse(**out)
     except Exception as e:
         logger.error("Error calculating pile capacity: %s", str(e))
         raise HTTPException(status_code=400, detail=str(e))
+    _record("pile-axial", req, out, request)
+    return response
 
 
 @app.post("/corrosion", response_model=CorrosionResponse)
-async def calculate_corrosion(req: CorrosionRequest) -> CorrosionResponse:
+def calculate_corrosion(req: CorrosionRequest, request: Request) -> CorrosionResponse:
     """Calculate remaining thickness after corrosion."""
     try:
-        t = remaining_thickness_mm(
-            CorrosionInputs(t0_mm=req.t0_mm, rate_mm_per_year=req.rate_mm_per_year, years=req.years)
-        )
-        return CorrosionResponse(remaining_thickness_mm=t)
+        with span("api.corrosion"):
+            out = calcs.corrosion(req)
+            response = CorrosionResponse(**out)
     except Exception as e:
         logger.error("Error calculating corrosion: %s", str(e))
         raise HTTPException(status_code=400, detail=str(e))
+    _record("corrosion", req, out, request)
+    return response
 
 
 @app.post("/seawall", response_model=SeawallResponse)
-async def calculate_seawall(req: SeawallRequest) -> SeawallResponse:
+def calculate_seawall(req: SeawallRequest, request: Request) -> SeawallResponse:
     """Calculate seawall sliding factor of safety."""
     try:
-        FS = sliding_fs(req.mu, req.W_kN, req.T_kN)
-        return SeawallResponse(sliding_fs=FS)
+        with span("api.seawall"):
+            out = calcs.seawall(req)
+            response = SeawallResponse(**out)
     except Exception as e:
         logger.error("Error calculating seawall FS: %s", str(e))
         raise HTTPException(status_code=400, detail=str(e))
+    _record("seawall", req, out, request)
+    return response
 
 
 @app.post("/scour", response_model=ScourResponse)
-async def calculate_scour(req: ScourRequest) -> ScourResponse:
+def calculate_scour(req: ScourRequest, request: Request) -> ScourResponse:
     """Calculate local scour at pile."""
     try:
-        ys = pile_scour_depth_m(req.D_m, req.U_mps, K=req.K, m=req.m)
-        return ScourResponse(scour_depth_m=ys)
+        with span("api.scour"):
+            out = calcs.scour(req)
+            response = ScourResponse(**out)
     except Exception as e:
         logger.error("Error calculating scour: %s", str(e))
         raise HTTPException(status_code=400, detail=str(e))
+    _record("scour", req, out, request)
+    return response
+
+
+@app.post("/tides", response_model=TideResponse)
+def calculate_tides(req: TideRequest, request: Request) -> Response:
+    """Synthesize a tide series from harmonic constituents (JSON or MessagePack)."""
+    try:
+        with span("api.tides", n_constituents=len(req.constituents)):
+            out = calcs.tides(req)
+            response = negotiated_response(request, out)
+    except Exception as e:
+        logger.error("Error calculating tides: %s", str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+    _record("tides", req, out, request)
+    return response
+
+
+_job_queue: JobQueue | None = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """The server's job queue, created and started on first use."""
+    global _job_queue
+    with _job_queue_lock:  # the job handlers below run concurrently in the thread pool
+        if _job_queue is None:
+            _job_queue = JobQueue(
+                settings.jobs_dir, workers=settings.job_workers, input_dir=settings.job_input_dir
+            )
+            _job_queue.start()
+    return _job_queue
+
+
+# Job and result handlers are plain functions for the same reason as the calculation
+# handlers: their SQLite reads and writes can wait on locks and must not hold up the loop.
+
+
+@app.post("/jobs", response_model=JobResponse, status_code=202)
+def submit_job(req: JobRequest, response: Response) -> JobResponse:
+    """Queue a long-running analysis; poll GET /jobs/{id} for progress and results."""
+    try:
+        job = get_job_queue().submit(req.kind, req.params)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=422,
+            detail=e.errors(include_url=False, include_context=False, include_input=False),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    response.headers["Location"] = f"/jobs/{job.id}"
+    return JobResponse(**job.as_dict())
+
+
+@app.get("/jobs", response_model=list[JobResponse])
+def list_jobs(status: str | None = None, limit: int = 50) -> list[JobResponse]:
+    """Most recent jobs, optionally filtered by status."""
+    return [JobResponse(**j.as_dict()) for j in get_job_queue().store.recent(status, limit)]
+
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+def get_job(job_id: str) -> JobResponse:
+    """Status, progress, result summary and artifact names of a job."""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobResponse(**job.as_dict())
+
+
+@app.get("/jobs/{job_id}/artifacts/{name}")
+def get_job_artifact(job_id: str, name: str) -> FileResponse:
+    """Download an artifact file (.npy arrays, CSV/Parquet tables) of a finished job."""
+    path = get_job_queue().artifact_path(job_id, name)
+    if path is None or not path.is_file():
+        raise HTTPException(status_code=404, detail="Artifact not found")
+    return FileResponse(path, filename=name, media_type="application/octet-stream")
+
+
+@app.get("/results")
+def query_results(
+    calc: str | None = None,
+    project: str | None = None,
+    jurisdiction: str | None = None,
+    input_hash: str | None = None,
+    limit: int = 100,
+) -> list[dict[str, object]]:
+    """Stored results, most recent first (needs WATERFRONT_RESULTS_DB)."""
+    if results_store is None:
+        raise HTTPException(status_code=404, detail="No results store configured")
+    try:
+        found = results_store.query(
+            calc=calc,
+            project=project,
+            jurisdiction=jurisdiction,
+            input_hash=input_hash,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return [r.as_dict() for r in found]
 
 
 def main() -> None:
-    """Run the FastAPI server."""
+    """Run the FastAPI server with the launcher settings (environment and .env)."""
     import uvicorn
 
-    uvicorn.run(
-        "open_gov_waterfront.server:app",
-        host="0.0.0.0",
-        port=8000,
-        log_level="info",
-        reload=False,
-    )
+    uvicorn.run(APP_IMPORT_PATH, **get_settings().uvicorn_kwargs())
 
 
 if __name__ == "__main__":
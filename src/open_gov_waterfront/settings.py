@@ -0,0 +1,109 @@
+"""
+Runtime settings for the API server, loaded from the environment and a .env file.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Literal
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+APP_IMPORT_PATH = "open_gov_waterfront.server:app"
+
+
+class ServerSettings(BaseSettings):
+    """API server settings; every field can be set with a WATERFRONT_ environment variable."""
+
+    model_config = SettingsConfigDict(
+        env_prefix="WATERFRONT_", env_file=".env", env_file_encoding="utf-8", extra="ignore"
+    )
+
+    # Launcher
+    host: str = Field(default="0.0.0.0", description="Bind address")
+    port: int = Field(default=8000, gt=0, lt=65536, description="Bind port")
+    workers: int = Field(default=1, gt=0, description="Worker processes")
+    loop: Literal["auto", "asyncio", "uvloop"] = Field(default="auto", description="Event loop")
+    http: Literal["auto", "h11", "httptools"] = Field(default="auto", description="HTTP parser")
+    timeout_keep_alive: int = Field(default=5, ge=0, description="Keep-alive timeout (s)")
+    backlog: int = Field(default=2048, gt=0, description="Listen socket backlog")
+    limit_concurrency: int | None = Field(
+        default=None, gt=0, description="Connections per worker before uvicorn answers 503"
+    )
+    log_level: Literal["critical", "error", "warning", "info", "debug", "trace"] = "info"
+    access_log: bool = Field(default=True, description="Emit uvicorn access log lines")
+
+    # Admission control
+    scalar_max_in_flight: int = Field(
+        default=64, gt=0, description="Concurrent scalar calculations"
+    )
+    scalar_max_queue: int = Field(default=256, ge=0, description="Scalar requests allowed to wait")
+    series_max_in_flight: int = Field(
+        default=4, gt=0, description="Concurrent series/batch calculations"
+    )
+    series_max_queue: int = Field(
+        default=8, ge=0, description="Series/batch requests allowed to wait"
+    )
+    admission_timeout_s: float = Field(
+        default=2.0, gt=0, description="Longest a queued request waits for a slot (s)"
+    )
+    retry_after_s: int = Field(default=1, ge=0, description="Retry-After value sent with 503 (s)")
+
+    # Responses
+    gzip_min_bytes: int = Field(
+        default=1024, ge=0, description="Responses at least this large are gzip-compressed"
+    )
+
+    # Profiling
+    profiling_enabled: bool = Field(
+        default=False, description="Allow per-request cProfile via the X-Profile header"
+    )
+    profile_dir: Path | None = Field(
+        default=None, description="Directory for stored .prof files; unset returns summaries"
+    )
+    profile_top_n: int = Field(default=25, gt=0, description="Functions listed in summaries")
+
+    # Tracing
+    trace_file: Path | None = Field(
+        default=None, description="Append calculation spans to this JSON-lines file"
+    )
+
+    # Background jobs
+    jobs_dir: Path = Field(
+        default=Path("waterfront_jobs"), description="Job database and artifact directory"
+    )
+    job_workers: int = Field(default=2, gt=0, description="Threads executing background jobs")
+    job_input_dir: Path | None = Field(
+        default=None,
+        description="Directory report jobs may read inputs from (default: <jobs_dir>/inputs)",
+    )
+
+    # Results store
+    results_db: Path | None = Field(
+        default=None, description="Record every calculation in this SQLite results store"
+    )
+
+    def uvicorn_kwargs(self) -> dict[str, Any]:
+        """Keyword arguments for uvicorn.run() built from the launcher settings."""
+        return {
+            "host": self.host,
+            "port": self.port,
+            "workers": self.workers,
+            "loop": self.loop,
+            "http": self.http,
+            "timeout_keep_alive": self.timeout_keep_alive,
+            "backlog": self.backlog,
+            "limit_concurrency": self.limit_concurrency,
+            "log_level": self.log_level,
+            "access_log": self.access_log,
+            "reload": False,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> ServerSettings:
+    return ServerSettings()
@@ -0,0 +1,116 @@
+"""
+Long-lived JSON-lines worker: one calculation request per input line, one result per
+output line, so shell pipelines pay interpreter start-up and imports once instead of per
+calculation.
+
+A request names a calculation from ``calcs.CALCS`` and carries its parameters inline,
+e.g. ``{"calc": "berthing", "mass_tonnes": 50000, "speed_knots": 0.3}``; an optional
+``"id"`` is echoed back. Each reply is ``{"id": ..., "ok": true, "result": {...}}`` or
+``{"id": ..., "ok": false, "error": "..."}``; a bad line never stops the worker, and
+neither does a failure to store a result (it is logged to stderr). Optional
+``"project"`` and ``"jurisdiction"`` fields label the result in the results store. Output
+is flushed after every line so the worker can also be driven request-by-request as a
+coprocess.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import IO, Any
+
+from pydantic import ValidationError
+
+from . import tracing
+from .calcs import storable, validate
+from .responses import dumps_json
+from .results import ResultsStore
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without the 'fast' extra
+    orjson = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+
+def _loads(line: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc']) or 'request'}: {err['msg']}" for err in exc.errors()
+    )
+
+
+def handle_line(line: bytes, results: ResultsStore | None = None) -> dict[str, Any]:
+    """Run the request on one input line and return the reply object."""
+    try:
+        request = _loads(line)
+    except ValueError as e:
+        return {"id": None, "ok": False, "error": f"Invalid JSON: {e}"}
+    if not isinstance(request, dict):
+        return {"id": None, "ok": False, "error": "Request must be a JSON object"}
+    params = dict(request)
+    req_id = params.pop("id", None)
+    name = params.pop("calc", None)
+    project = params.pop("project", None)
+    jurisdiction = params.pop("jurisdiction", None)
+    if not isinstance(name, str):
+        return {"id": req_id, "ok": False, "error": "Request needs a 'calc' name"}
+    try:
+        with tracing.span(f"stdio.{name}"):
+            calc, req = validate(name, params)
+            result = calc.run(req)
+    except ValidationError as e:
+        return {"id": req_id, "ok": False, "error": _validation_message(e)}
+    except Exception as e:
+        return {"id": req_id, "ok": False, "error": str(e)}
+    if results is not None:
+        try:
+            results.record(
+                name,
+                req.model_dump(),
+                storable(name, result),
+                source="stdio",
+                project=project,
+                jurisdiction=jurisdiction,
+            )
+        except Exception as e:
+            # Storage problems (a locked database, say) go to stderr; the reply still stands.
+            logger.warning("Could not record %s result: %s", name, e)
+    return {"id": req_id, "ok": True, "result": result}
+
+
+@dataclass(frozen=True)
+class StdioSummary:
+    """Request and error counts of a worker session."""
+
+    requests: int
+    errors: int
+
+
+def serve(
+    lines: Iterable[bytes], out: IO[bytes], results: ResultsStore | None = None
+) -> StdioSummary:
+    """
+    Answer every non-blank line of `lines` on `out`, in order, until input ends, recording
+    successful results in `results` when given.
+    """
+    requests = errors = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        reply = handle_line(line, results)
+        requests += 1
+        errors += not reply["ok"]
+        out.write(dumps_json(reply) + b"\n")
+        out.flush()
+    return StdioSummary(requests, errors)
@@ -10,6 +10,9 @@ from dataclasses import dataclass
 
 import numpy as np
 
+from . import tracing
+from .timing import timed
+
 
 @dataclass(frozen=True)
 class Constituent:
@@ -18,6 +21,7 @@ class Constituent:
     phase_rad: float
 
 
+@timed
 def tide_series(
     start_s: float, duration_s: float, dt_s: float, constituents: list[Constituent]
 ) -> tuple[np.ndarray, np.ndarray]:
@@ -26,8 +30,16 @@ def tide_series(
     """
     if duration_s <= 0 or dt_s <= 0:
         raise ValueError("duration and dt must be > 0")
-    t = np.arange(0.0, duration_s + 1e-9, dt_s, dtype=float)
-    eta = np.zeros_like(t)
-    for c in constituents:
-        eta += c.amp_m * np.cos(c.omega_rad_s * t + c.phase_rad)
+    with tracing.span("tides.tide_series", n_constituents=len(constituents)) as sp:
+        t = np.arange(0.0, duration_s + 1e-9, dt_s, dtype=float)
+        eta = tide_elevation(t, constituents)
+        sp.set(n_points=int(t.size))
     return t, eta
+
+
+def tide_elevation(t_s: np.ndarray, constituents: list[Constituent]) -> np.ndarray:
+    """Elevation eta (m) at times `t_s`: sum of A cos(omega t + phase)."""
+    eta = np.zeros_like(t_s, dtype=float)
+    for c in constituents:
+        eta += c.amp_m * np.cos(c.omega_rad_s * t_s + c.phase_rad)
+    return eta
@@ -0,0 +1,151 @@
+"""
+Hot-path timing registry for the calculation kernels.
+
+Set ``WATERFRONT_TIMING=1`` before the package is imported to record, per public
+calculation function, the call count, cumulative and maximum wall time, plus named event
+counters such as the Newton iterations spent in ``dispersion_k``. When the variable is
+unset, ``timed`` returns the function unchanged and ``timer`` returns a shared do-nothing
+context manager, so disabled timing costs nothing at call sites.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import threading
+import time
+from collections.abc import Callable
+from types import TracebackType
+from typing import Any, TypeVar
+
+ENV_VAR = "WATERFRONT_TIMING"
+ENABLED = os.getenv(ENV_VAR, "").strip().lower() in {"1", "true", "yes", "on"}
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class TimingStat:
+    """Accumulated timings and event counters for one named kernel."""
+
+    __slots__ = ("calls", "total_s", "max_s", "counters")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.counters: dict[str, int] = {}
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "total_s": self.total_s,
+            "max_s": self.max_s,
+            "mean_s": self.total_s / self.calls if self.calls else 0.0,
+            "counters": dict(self.counters),
+        }
+
+
+_REGISTRY: dict[str, TimingStat] = {}
+# Timed kernels run concurrently in the API's thread pool; updates must not interleave.
+_LOCK = threading.Lock()
+
+
+def _stat(name: str) -> TimingStat:
+    stat = _REGISTRY.get(name)
+    if stat is None:
+        stat = _REGISTRY[name] = TimingStat()
+    return stat
+
+
+def record(name: str, elapsed_s: float) -> None:
+    with _LOCK:
+        stat = _stat(name)
+        stat.calls += 1
+        stat.total_s += elapsed_s
+        if elapsed_s > stat.max_s:
+            stat.max_s = elapsed_s
+
+
+def count(name: str, counter: str, n: int = 1) -> None:
+    """Add n to an event counter; guard calls with ``if timing.ENABLED`` on hot paths."""
+    with _LOCK:
+        counters = _stat(name).counters
+        counters[counter] = counters.get(counter, 0) + n
+
+
+def kernel_name(fn: Callable[..., Any]) -> str:
+    return f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__qualname__}"
+
+
+def timed(fn: F) -> F:
+    """Record call count and wall time of fn; returns fn itself when timing is disabled."""
+    if not ENABLED:
+        return fn
+    name = kernel_name(fn)
+    perf_counter = time.perf_counter
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            record(name, perf_counter() - start)
+
+    return wrapper  # type: ignore[return-value]
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        record(self.name, time.perf_counter() - self.start)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name: str) -> _Timer | _NullTimer:
+    """Context manager timing a block under `name` (shared no-op when disabled)."""
+    return _Timer(name) if ENABLED else _NULL_TIMER
+
+
+def snapshot() -> dict[str, dict[str, Any]]:
+    """Copy of the registry, sorted by cumulative time (largest first)."""
+    with _LOCK:
+        items = sorted(_REGISTRY.items(), key=lambda kv: kv[1].total_s, reverse=True)
+        return {name: stat.as_dict() for name, stat in items}
+
+
+def reset() -> None:
+    with _LOCK:
+        _REGISTRY.clear()
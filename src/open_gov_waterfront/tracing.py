@@ -0,0 +1,262 @@
+"""
+Local structured tracing of calculation pipelines to an append-only JSON-lines file.
+
+Spans nest through a context variable, so a CLI command or HTTP request span becomes the
+parent of the calculation spans opened beneath it, in the same thread or task. Each span
+is written as one JSON object when it ends::
+
+    {"trace_id": ..., "span_id": ..., "parent_id": ..., "name": "waves.dispersion_k",
+     "start_unix_s": ..., "duration_s": ..., "pid": ..., "attrs": {"iterations": 5}}
+
+Tracing is enabled by setting ``WATERFRONT_TRACE_FILE`` (or calling ``configure``). When
+disabled, ``span`` returns a shared no-op span. ``summarize`` folds a trace file into
+per-stage totals for ``opengov-waterfront trace-summary``.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import Iterable
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, TextIO
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+ENV_VAR = "WATERFRONT_TRACE_FILE"
+ENABLED = False
+
+
+class _JsonLinesSink:
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._fh: TextIO = path.open("a", buffering=1, encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def write(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            self._fh.write(line)
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+_sink: _JsonLinesSink | None = None
+_current: ContextVar[Span | None] = ContextVar("waterfront_current_span", default=None)
+
+
+def configure(path: str | Path | None) -> None:
+    """Send spans to `path` (appending), or disable tracing when path is None."""
+    global ENABLED, _sink
+    if _sink is not None:
+        _sink.close()
+    _sink = _JsonLinesSink(Path(path)) if path else None
+    ENABLED = _sink is not None
+
+
+class Span:
+    """A timed, attributed unit of work; use as a context manager."""
+
+    __slots__ = ("name", "attrs", "trace_id", "span_id", "parent_id", "_wall", "_start", "_token")
+
+    def __init__(self, name: str, attrs: dict[str, Any]) -> None:
+        self.name = name
+        self.attrs = attrs
+        self.trace_id = ""
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id: str | None = None
+        self._wall = 0.0
+        self._start = 0.0
+        self._token: Token[Span | None] | None = None
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> Span:
+        parent = _current.get()
+        if parent is None:
+            self.trace_id = uuid.uuid4().hex
+        else:
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+        self._token = _current.set(self)
+        self._wall = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        duration = time.perf_counter() - self._start
+        if self._token is not None:
+            _current.reset(self._token)
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        sink = _sink
+        if sink is not None:
+            sink.write(
+                {
+                    "trace_id": self.trace_id,
+                    "span_id": self.span_id,
+                    "parent_id": self.parent_id,
+                    "name": self.name,
+                    "start_unix_s": self._wall,
+                    "duration_s": duration,
+                    "pid": os.getpid(),
+                    "attrs": self.attrs,
+                }
+            )
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def set(self, **attrs: Any) -> None:
+        return None
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, **attrs: Any) -> Span | _NullSpan:
+    """Open a span named `name` with attributes (shared no-op when tracing is disabled)."""
+    if not ENABLED:
+        return _NULL_SPAN
+    return Span(name, attrs)
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a root span per HTTP request while tracing is enabled."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not ENABLED or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        with Span("http", {"method": scope["method"], "path": scope["path"]}) as sp:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = getattr(scope.get("route"), "path", None) or scope["path"]
+                sp.name = f"http {scope['method']} {route}"
+                sp.set(status_code=status)
+
+
+@dataclass(frozen=True)
+class StageSummary:
+    """Aggregate of all spans sharing the same root-to-leaf name path."""
+
+    path: tuple[str, ...]
+    count: int
+    total_s: float
+    self_s: float
+    max_s: float
+
+    @property
+    def depth(self) -> int:
+        return len(self.path) - 1
+
+
+def read_trace(path: str | Path) -> list[dict[str, Any]]:
+    """Load span records from a JSON-lines trace file, skipping blank or truncated lines."""
+    records = []
+    with Path(path).open(encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def summarize(records: Iterable[dict[str, Any]]) -> list[StageSummary]:
+    """
+    Fold spans into per-stage totals keyed by name path, in flame-graph order: each
+    stage is followed by its children, siblings sorted by total time (largest first).
+    Self time is a span's duration minus the time spent in its direct children.
+    """
+    spans = {r["span_id"]: r for r in records}
+    child_time: dict[str, float] = defaultdict(float)
+    for r in spans.values():
+        if r.get("parent_id") in spans:
+            child_time[r["parent_id"]] += r["duration_s"]
+
+    paths: dict[str, tuple[str, ...]] = {}
+
+    def path_of(span_id: str) -> tuple[str, ...]:
+        chain = []
+        sid: str | None = span_id
+        while sid is not None and sid in spans and sid not in paths:
+            chain.append(sid)
+            sid = spans[sid].get("parent_id")
+        prefix = paths.get(sid, ()) if sid is not None else ()
+        for cid in reversed(chain):
+            prefix = (*prefix, spans[cid]["name"])
+            paths[cid] = prefix
+        return paths[span_id]
+
+    agg: dict[tuple[str, ...], list[float]] = {}
+    for sid, r in spans.items():
+        p = path_of(sid)
+        entry = agg.setdefault(p, [0, 0.0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += r["duration_s"]
+        entry[2] += max(0.0, r["duration_s"] - child_time[sid])
+        entry[3] = max(entry[3], r["duration_s"])
+
+    children: dict[tuple[str, ...], list[tuple[str, ...]]] = defaultdict(list)
+    for p in agg:
+        children[p[:-1]].append(p)
+
+    ordered: list[StageSummary] = []
+
+    def visit(parent: tuple[str, ...]) -> None:
+        for p in sorted(children[parent], key=lambda c: agg[c][1], reverse=True):
+            count, total, self_s, max_s = agg[p]
+            ordered.append(StageSummary(p, int(count), total, self_s, max_s))
+            visit(p)
+
+    visit(())
+    return ordered
+
+
+configure(os.getenv(ENV_VAR) or None)
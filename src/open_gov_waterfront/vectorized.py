@@ -0,0 +1,224 @@
+"""
+Array versions of the screening calculations for batch runs.
+
+Each function takes numpy arrays (or scalars) that broadcast together and evaluates the
+same formula as its scalar counterpart in one pass. Unlike the scalar functions,
+elements with invalid inputs (non-positive, NaN) produce NaN instead of raising, so one
+bad row does not abort a batch; callers report those rows themselves.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from .timing import timed
+from .utils import g, rho_air, rho_water
+
+FloatArray = NDArray[np.float64]
+
+
+def _positive(*arrays: FloatArray) -> NDArray[np.bool_]:
+    ok = np.ones(np.broadcast_shapes(*(a.shape for a in arrays)), dtype=bool)
+    for a in arrays:
+        ok &= a > 0  # NaN compares False
+    return ok
+
+
+@timed
+def dispersion_k(
+    T_s: ArrayLike, h_m: ArrayLike, tol: float = 1e-10, iters: int = 100
+) -> FloatArray:
+    """
+    Wavenumber k (1/m) solving omega^2 = g k tanh(kh) elementwise by Newton iteration
+    from the deep-water guess; iteration stops once every element has converged.
+    """
+    T, h = np.broadcast_arrays(np.asarray(T_s, dtype=float), np.asarray(h_m, dtype=float))
+    shape = T.shape
+    T, h = T.ravel(), h.ravel()
+    ok = _positive(T, h)
+    omega2 = np.where(ok, (2.0 * np.pi / np.where(ok, T, 1.0)) ** 2, np.nan)
+    h = np.where(ok, h, np.nan)
+    k = omega2 / g
+    active = ok.copy()
+    for _ in range(iters):
+        if not active.any():
+            break
+        ka, ha = k[active], h[active]
+        th = np.tanh(ka * ha)
+        f = g * ka * th - omega2[active]
+        df = g * th + g * ka * ha * (1.0 - th * th)
+        step = f / df
+        k[active] = ka - step
+        active[active] = np.abs(step) >= tol
+    return np.where(k > 0, k, np.nan).reshape(shape)
+
+
+@timed
+def wave_properties(T_s: ArrayLike, h_m: ArrayLike) -> dict[str, FloatArray]:
+    """
+    Wavelength, celerity, group celerity and shoaling coefficient (deep-water cg0 =
+    g T / 4 pi) from one dispersion solve.
+    """
+    T = np.asarray(T_s, dtype=float)
+    k = dispersion_k(T, h_m)
+    h = np.asarray(h_m, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        omega = 2.0 * np.pi / T
+        c = omega / k
+        n = 0.5 * (1.0 + (2.0 * k * h) / np.sinh(2.0 * k * h))
+        cg = n * c
+        cg0 = (g * T) / (4.0 * np.pi)
+        return {
+            "k": k,
+            "wavelength_m": 2.0 * np.pi / k,
+            "celerity_mps": c,
+            "group_celerity_mps": cg,
+            "shoaling_coefficient": np.sqrt(cg0 / cg),
+        }
+
+
+@timed
+def surface_kinematics(
+    H_m: ArrayLike, T_s: ArrayLike, k: ArrayLike, h_m: ArrayLike
+) -> tuple[FloatArray, FloatArray]:
+    """
+    Linear-wave horizontal velocity and acceleration amplitudes at the still-water
+    level: u = (H/2) omega / tanh(kh), a = omega u.
+    """
+    H = np.asarray(H_m, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        omega = 2.0 * np.pi / np.asarray(T_s, dtype=float)
+        u = 0.5 * H * omega / np.tanh(np.asarray(k, dtype=float) * np.asarray(h_m, dtype=float))
+    u = np.where(H >= 0, u, np.nan)
+    return u, omega * u
+
+
+@timed
+def morison_inline_max_per_length_N(
+    D_m: ArrayLike,
+    u_amp_mps: ArrayLike,
+    a_amp_mps2: ArrayLike,
+    Cd: ArrayLike = 1.0,
+    Cm: ArrayLike = 2.0,
+    rho: float = rho_water,
+) -> FloatArray:
+    """F/L_max = 0.5*rho*Cd*D*u^2 + rho*Cm*(pi*D^2/4)*a; NaN where D <= 0."""
+    D = np.asarray(D_m, dtype=float)
+    u = np.asarray(u_amp_mps, dtype=float)
+    drag = 0.5 * rho * np.asarray(Cd, dtype=float) * D * (u**2)
+    inertia = rho * np.asarray(Cm, dtype=float) * (np.pi * (D**2) / 4.0) * np.asarray(a_amp_mps2)
+    return np.where(D > 0, drag + inertia, np.nan)
+
+
+@timed
+def mooring_total_load_N(
+    A_wind_m2: ArrayLike,
+    A_current_m2: ArrayLike,
+    U_wind_mps: ArrayLike,
+    U_current_mps: ArrayLike,
+    Cd_wind: ArrayLike = 1.0,
+    Cd_current: ArrayLike = 1.0,
+    safety_factor: ArrayLike = 1.5,
+) -> FloatArray:
+    """(0.5 rho_air Cd A U^2 + 0.5 rho_water Cd A U^2) * SF for wind and current."""
+    Fw = 0.5 * rho_air * np.asarray(Cd_wind) * np.asarray(A_wind_m2) * np.square(U_wind_mps)
+    Fc = (
+        0.5
+        * rho_water
+        * np.asarray(Cd_current)
+        * np.asarray(A_current_m2)
+        * np.square(U_current_mps)
+    )
+    return np.asarray((Fw + Fc) * np.asarray(safety_factor), dtype=float)
+
+
+@timed
+def berthing_energy_J(
+    mass_tonnes: ArrayLike,
+    speed_knots: ArrayLike,
+    Ce: ArrayLike = 1.0,
+    Cc: ArrayLike = 1.0,
+    Cs: ArrayLike = 1.0,
+) -> FloatArray:
+    """E = 0.5 m v^2 Ce Cc Cs (tonnes, knots); NaN where mass or speed <= 0."""
+    m, v = np.broadcast_arrays(
+        np.asarray(mass_tonnes, dtype=float), np.asarray(speed_knots, dtype=float)
+    )
+    E = 0.5 * (m * 1000.0) * (v * 0.514444) ** 2 * np.asarray(Ce) * np.asarray(Cc) * np.asarray(Cs)
+    return np.where(_positive(m, v), E, np.nan)
+
+
+@timed
+def fender_reaction_kN(
+    energy_J: ArrayLike, efficiency: ArrayLike = 0.7, deflection_m: ArrayLike = 0.5
+) -> FloatArray:
+    """R = E / (eff * deflection) in kN; NaN where efficiency or deflection <= 0."""
+    eff = np.asarray(efficiency, dtype=float)
+    defl = np.asarray(deflection_m, dtype=float)
+    E = np.asarray(energy_J, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        R = E / (eff * defl) / 1000.0
+    return np.where(_positive(eff, defl), R, np.nan)
+
+
+@timed
+def sliding_fs(mu: ArrayLike, W_kN: ArrayLike, T_kN: ArrayLike) -> FloatArray:
+    """FS = mu W / T; NaN where any input <= 0."""
+    m, W, T = np.broadcast_arrays(
+        np.asarray(mu, dtype=float), np.asarray(W_kN, dtype=float), np.asarray(T_kN, dtype=float)
+    )
+    ok = _positive(m, W, T)
+    return np.where(ok, m * W / np.where(ok, T, 1.0), np.nan)
+
+
+@timed
+def pile_axial_capacity_kN(
+    shaft_length_m: ArrayLike,
+    perimeter_m: ArrayLike,
+    area_tip_m2: ArrayLike,
+    unit_skin_kPa: ArrayLike,
+    unit_end_bearing_kPa: ArrayLike,
+) -> FloatArray:
+    """Q = qs * perimeter * length + qb * tip area (kN); NaN where any input < 0."""
+    L, P, A, qs, qb = np.broadcast_arrays(
+        *(
+            np.asarray(x, dtype=float)
+            for x in (shaft_length_m, perimeter_m, area_tip_m2, unit_skin_kPa, unit_end_bearing_kPa)
+        )
+    )
+    ok = (L >= 0) & (P >= 0) & (A >= 0) & (qs >= 0) & (qb >= 0)
+    return np.where(ok, qs * P * L + qb * A, np.nan)
+
+
+@timed
+def remaining_thickness_mm(
+    t0_mm: ArrayLike, rate_mm_per_year: ArrayLike, years: ArrayLike
+) -> FloatArray:
+    """t = max(0, t0 - rate * years); NaN where t0 <= 0 or rate or years < 0."""
+    t0, rate, yrs = np.broadcast_arrays(
+        np.asarray(t0_mm, dtype=float),
+        np.asarray(rate_mm_per_year, dtype=float),
+        np.asarray(years, dtype=float),
+    )
+    ok = (t0 > 0) & (rate >= 0) & (yrs >= 0)
+    return np.where(ok, np.maximum(t0 - rate * yrs, 0.0), np.nan)
+
+
+@timed
+def pile_scour_depth_m(
+    D_m: ArrayLike, U_mps: ArrayLike, K: ArrayLike = 2.0, m: ArrayLike = 1.0
+) -> FloatArray:
+    """y_s = K D (U / sqrt(g D))^m; NaN where D, K or m <= 0 or U < 0."""
+    D, U, K_, m_ = np.broadcast_arrays(
+        np.asarray(D_m, dtype=float),
+        np.asarray(U_mps, dtype=float),
+        np.asarray(K, dtype=float),
+        np.asarray(m, dtype=float),
+    )
+    ok = _positive(D, K_, m_) & (U >= 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        y = K_ * D * (U / np.sqrt(g * D)) ** m_
+    return np.where(ok, y, np.nan)
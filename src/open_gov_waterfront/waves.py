@@ -7,42 +7,78 @@ Author: Nik Jois <nikjois@llamasearch.ai>
 from __future__ import annotations
 
 import math
+from functools import lru_cache
+from typing import NamedTuple
 
+from . import timing, tracing
+from .timing import timed
 from .utils import g
 
 
+@timed
 def dispersion_k(T_s: float, h_m: float, tol: float = 1e-10, iters: int = 100) -> float:
     """
     Solve linear wave dispersion for wavenumber k (1/m): omega^2 = g k tanh(kh).
+    Solutions are memoized, since wavelength, celerity, group celerity and shoaling for the
+    same (T, h) all start from the same k.
     """
     if T_s <= 0 or h_m <= 0:
         raise ValueError("T and h must be > 0")
-    omega = 2.0 * math.pi / T_s
-    # Deep-water initial guess
-    k = (omega**2) / g
-    for _ in range(iters):
-        f = g * k * math.tanh(k * h_m) - omega**2
-        df = g * math.tanh(k * h_m) + g * k * h_m * (1.0 / math.cosh(k * h_m)) ** 2
-        step = f / df
-        k -= step
-        if abs(step) < tol:
-            break
+    return _solve_dispersion(float(T_s), float(h_m), tol, iters)
+
+
+@lru_cache(maxsize=4096)
+def _solve_dispersion(T_s: float, h_m: float, tol: float, iters: int) -> float:
+    with tracing.span("waves.dispersion_k", T_s=T_s, h_m=h_m) as sp:
+        omega = 2.0 * math.pi / T_s
+        # Deep-water initial guess
+        k = (omega**2) / g
+        n_iter = 0
+        for n_iter in range(1, iters + 1):
+            f = g * k * math.tanh(k * h_m) - omega**2
+            df = g * math.tanh(k * h_m) + g * k * h_m * (1.0 / math.cosh(k * h_m)) ** 2
+            step = f / df
+            k -= step
+            if abs(step) < tol:
+                break
+        sp.set(iterations=n_iter)
+    if timing.ENABLED:
+        timing.count("waves.dispersion_k", "newton_solves")
+        timing.count("waves.dispersion_k", "newton_iterations", n_iter)
     if k <= 0:
         raise RuntimeError("Failed to solve dispersion.")
     return float(k)
 
 
+class CacheStats(NamedTuple):
+    """Counters of a memoization cache."""
+
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+
+def dispersion_cache_info() -> CacheStats:
+    """Hit/miss/size counters of the dispersion solution cache."""
+    info = _solve_dispersion.cache_info()
+    return CacheStats(info.hits, info.misses, info.maxsize, info.currsize)
+
+
+@timed
 def wavelength_L(T_s: float, h_m: float) -> float:
     k = dispersion_k(T_s, h_m)
     return float(2.0 * math.pi / k)
 
 
+@timed
 def celerity_c(T_s: float, h_m: float) -> float:
     k = dispersion_k(T_s, h_m)
     omega = 2.0 * math.pi / T_s
     return float(omega / k)
 
 
+@timed
 def group_celerity_cg(T_s: float, h_m: float) -> float:
     k = dispersion_k(T_s, h_m)
     c = celerity_c(T_s, h_m)
@@ -50,6 +86,7 @@ def group_celerity_cg(T_s: float, h_m: float) -> float:
     return float(n * c)
 
 
+@timed
 def shoaling_coefficient(K0: float | None, T_s: float, h_m: float) -> float:
     """
     Shoaling coefficient Ks = sqrt(cg0/cg). If K0 (deep-water group velocity) not provided,
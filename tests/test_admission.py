@@ -0,0 +1,178 @@
+"""
+Tests for API admission control and load shedding.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import anyio.to_thread
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from open_gov_waterfront import calcs, server
+from open_gov_waterfront.admission import (
+    AdmissionGate,
+    AdmissionLimits,
+    AdmissionMiddleware,
+    build_gates,
+    classify_path,
+)
+
+
+def _blocking_app(release: asyncio.Event) -> tuple[FastAPI, dict[str, AdmissionGate]]:
+    """App with one blocking series endpoint, one cheap scalar endpoint and /health."""
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health() -> dict[str, str]:
+        return {"status": "healthy"}
+
+    @app.post("/waves")
+    async def waves() -> dict[str, float]:
+        return {"wavelength_m": 1.0}
+
+    @app.post("/tides")
+    async def tides() -> dict[str, list[float]]:
+        await release.wait()
+        return {"eta_m": [0.0]}
+
+    gates = build_gates(
+        scalar=AdmissionLimits(max_in_flight=2, max_queue=2, queue_timeout_s=1.0),
+        series=AdmissionLimits(max_in_flight=1, max_queue=0, queue_timeout_s=1.0),
+    )
+    app.add_middleware(AdmissionMiddleware, gates=gates, retry_after_s=3)
+    return app, gates
+
+
+def test_classify_path() -> None:
+    """Test endpoint classification and exemptions."""
+    assert classify_path("/health") is None
+    assert classify_path("/tides") == "series"
+    assert classify_path("/waves") == "scalar"
+
+
+def test_invalid_limits() -> None:
+    """Test that non-positive limits are rejected."""
+    with pytest.raises(ValueError):
+        AdmissionGate(AdmissionLimits(max_in_flight=0, max_queue=1))
+
+
+async def test_gate_queue_and_handoff() -> None:
+    """Test that a queued waiter receives the released slot in FIFO order."""
+    gate = AdmissionGate(AdmissionLimits(max_in_flight=1, max_queue=1, queue_timeout_s=1.0))
+    assert await gate.acquire()
+    waiter = asyncio.create_task(gate.acquire())
+    await asyncio.sleep(0)
+    assert gate.queued == 1
+    assert not await gate.acquire()  # queue full: shed immediately
+    gate.release()
+    assert await waiter
+    assert gate.in_flight == 1 and gate.queued == 0
+    gate.release()
+    assert gate.in_flight == 0
+    assert gate.rejected == 1
+
+
+async def test_gate_queue_timeout() -> None:
+    """Test that a waiter gives up after the queue timeout."""
+    gate = AdmissionGate(AdmissionLimits(max_in_flight=1, max_queue=1, queue_timeout_s=0.01))
+    assert await gate.acquire()
+    assert not await gate.acquire()
+    assert gate.queued == 0
+    gate.release()
+    assert gate.in_flight == 0
+
+
+async def test_series_flood_is_shed_while_scalar_stays_fast() -> None:
+    """Test 503 + Retry-After for a series flood while scalar and /health are served."""
+    release = asyncio.Event()
+    app, gates = _blocking_app(release)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        held = asyncio.create_task(client.post("/tides"))
+        while gates["series"].in_flight == 0:
+            await asyncio.sleep(0)
+
+        flood = await asyncio.gather(*(client.post("/tides") for _ in range(20)))
+        assert all(r.status_code == 503 for r in flood)
+        assert flood[0].headers["retry-after"] == "3"
+
+        latencies = []
+        for _ in range(20):
+            t0 = time.perf_counter()
+            r = await client.post("/waves")
+            latencies.append(time.perf_counter() - t0)
+            assert r.status_code == 200
+        assert max(latencies) < 0.5
+        assert (await client.get("/health")).status_code == 200
+
+        release.set()
+        assert (await held).status_code == 200
+    assert gates["series"].in_flight == 0
+    assert gates["series"].rejected == 20
+
+
+async def test_real_tides_flood_leaves_event_loop_free(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that /tides kernels run off the event loop while a flood is shed."""
+    release = threading.Event()
+    kernel = calcs.tides
+
+    def held_tides(req: object) -> object:
+        release.wait(timeout=2)  # blocks a worker thread, never the event loop
+        return kernel(req)
+
+    monkeypatch.setattr(calcs, "tides", held_tides)
+    gate = server.admission_gates["series"]
+    slots, queue = gate.limits.max_in_flight, gate.limits.max_queue
+    rejected = gate.rejected
+    body = {
+        "duration_s": 3600.0,
+        "dt_s": 60.0,
+        "constituents": [{"amp_m": 1.0, "period_s": 44712.0}],
+    }
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        flood = [
+            asyncio.create_task(client.post("/tides", json=body)) for _ in range(slots + queue + 10)
+        ]
+
+        async def saturated() -> None:
+            while gate.in_flight < slots or gate.queued < queue or gate.rejected < rejected + 10:
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(saturated(), timeout=5)
+        latencies = []
+        for _ in range(20):
+            t0 = time.perf_counter()
+            r = await client.post("/waves", json={"T_s": 8.0, "h_m": 10.0})
+            latencies.append(time.perf_counter() - t0)
+            assert r.status_code == 200
+        assert max(latencies) < 0.5
+        assert (await client.get("/health")).status_code == 200
+
+        release.set()
+        replies = await asyncio.gather(*flood)
+    codes = [r.status_code for r in replies]
+    assert codes.count(200) == slots + queue and codes.count(503) == 10
+    assert all(len(r.json()["eta_m"]) == 61 for r in replies if r.status_code == 200)
+    assert gate.in_flight == 0
+
+
+def test_thread_pool_fits_admitted_requests() -> None:
+    """Test that server start-up gives every admitted request its own worker thread."""
+
+    async def limit() -> float:
+        return anyio.to_thread.current_default_thread_limiter().total_tokens
+
+    admitted = server.settings.scalar_max_in_flight + server.settings.series_max_in_flight
+    assert admitted > 40  # anyio's default limit, which the defaults exceed
+    with TestClient(server.app) as client:
+        assert client.portal is not None
+        assert client.portal.call(limit) == admitted
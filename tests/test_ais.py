@@ -0,0 +1,181 @@
+"""
+Tests for streaming berthing energy statistics over AIS event logs.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from open_gov_waterfront.ais import (
+    BINS_PER_DECADE,
+    evaluate_events,
+    summarize_log,
+    vessel_type_key,
+)
+from open_gov_waterfront.cli import app
+from open_gov_waterfront.vectorized import berthing_energy_J
+
+HALF_BIN = 10 ** (1 / (2 * BINS_PER_DECADE)) - 1
+
+
+def _log(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "berth": rng.choice(["B1", "B2", "B3"], n),
+            "vessel_type": rng.choice(["Container", "tanker", "Ro-Ro", "kayak"], n),
+            "displacement_tonnes": rng.lognormal(10.0, 1.0, n),
+            "speed_knots": rng.lognormal(-1.5, 0.4, n),
+        }
+    )
+
+
+def test_event_energies_use_vessel_type_defaults() -> None:
+    """Test per-type coefficients, column overrides and unknown-type counting."""
+    events = pd.DataFrame(
+        {
+            "berth": ["A", "A", "A"],
+            "vessel_type": ["Container Ship", "ro-ro", "kayak"],
+            "displacement_tonnes": [50_000.0, 20_000.0, 1_000.0],
+            "speed_knots": [0.3, 0.4, 0.5],
+            "Ce": [np.nan, 0.9, np.nan],
+        }
+    )
+    unknown: dict[str, int] = {}
+    result = evaluate_events(events, unknown=unknown)
+    expected = berthing_energy_J([50_000.0, 20_000.0, 1_000.0], [0.3, 0.4, 0.5], [0.5, 0.9, 0.5])
+    np.testing.assert_allclose(result["energy_J"], expected)
+    np.testing.assert_allclose(result["fender_reaction_kN"], expected / 0.35 / 1000.0)
+    assert unknown == {"kayak": 1}
+    assert vessel_type_key(" Bulk-Carrier ") == "bulk"
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_streamed_stats_match_in_memory(tmp_path: Path, suffix: str) -> None:
+    """Test that chunked per-berth statistics match a whole-table computation."""
+    df = _log(30_000)
+    path = tmp_path / f"log{suffix}"
+    if suffix == ".parquet":
+        pytest.importorskip("pyarrow")
+        df.to_parquet(path)
+    else:
+        df.to_csv(path, index=False)
+    summary = summarize_log(path, chunksize=7_000, thresholds=[1e5, 1e6])
+    assert summary.events == 30_000 and summary.chunks == 5
+    assert summary.unknown_types.keys() == {"kayak"}
+    energy = evaluate_events(df)["energy_J"].to_numpy()
+    for berth, stats in summary.berths.items():
+        e = energy[(df["berth"] == berth).to_numpy()]
+        assert stats.events == len(e) and stats.invalid == 0
+        assert stats.mean_J == pytest.approx(e.mean())
+        assert stats.std_J == pytest.approx(e.std(ddof=1))
+        assert stats.max_J == pytest.approx(e.max()) and stats.min_J == pytest.approx(e.min())
+        assert stats.exceedance == {1e5: int((e > 1e5).sum()), 1e6: int((e > 1e6).sum())}
+        for q, value in stats.percentiles_J.items():
+            exact = np.percentile(e, q, method="inverted_cdf")
+            assert value == pytest.approx(exact, rel=HALF_BIN * 1.001)
+        assert int(summary.histograms[berth].sum()) == len(e)
+
+
+def test_invalid_and_unassigned_events(tmp_path: Path) -> None:
+    """Test that bad inputs are counted per berth and events without a berth are set apart."""
+    path = tmp_path / "log.csv"
+    pd.DataFrame(
+        {
+            "berth": ["A", "A", "", "B"],
+            "vessel_type": ["tanker", "tanker", "tanker", None],
+            "displacement_tonnes": [80_000.0, -1.0, 50_000.0, 10_000.0],
+            "speed_knots": [0.2, 0.2, 0.2, 0.3],
+        }
+    ).to_csv(path, index=False)
+    summary = summarize_log(path, percentiles=[99.9])
+    assert summary.unassigned == 1 and summary.invalid == 1
+    a, b = summary.berths["A"], summary.berths["B"]
+    assert (a.events, a.invalid) == (2, 1)
+    assert a.percentiles_J[99.9] == a.max_J == a.min_J
+    assert b.max_J == pytest.approx(berthing_energy_J(10_000.0, 0.3, 0.5))
+    assert summary.unknown_types == {}
+
+
+def test_events_out_and_errors(tmp_path: Path) -> None:
+    """Test writing per-event results and rejecting logs without the required columns."""
+    path, events = tmp_path / "log.csv", tmp_path / "events.csv"
+    _log(100).to_csv(path, index=False)
+    summarize_log(path, chunksize=30, events_out=events)
+    written = pd.read_csv(events)
+    assert len(written) == 100 and {"energy_J", "fender_reaction_kN", "berth"} <= set(written)
+    pd.DataFrame({"berth": ["A"]}).to_csv(path, index=False)
+    with pytest.raises(ValueError, match="missing required columns"):
+        summarize_log(path)
+    with pytest.raises(ValueError, match="chunksize"):
+        summarize_log(path, chunksize=0)
+
+
+def test_parquet_events_out_with_changing_column_types(tmp_path: Path) -> None:
+    """Test that Parquet event output survives columns whose parsed type changes by chunk."""
+    pytest.importorskip("pyarrow")
+    path, events = tmp_path / "log.csv", tmp_path / "events.parquet"
+    path.write_text(
+        "berth,vessel_type,displacement_tonnes,speed_knots,Ce\n"
+        "1,tanker,50000,1,\n"
+        "2,tanker,60000,1,\n"
+        "A,container,10000.5,0.25,0.6\n"
+        "B,7,20000,0.3,\n"
+    )
+    summary = summarize_log(path, chunksize=2, events_out=events)
+    written = pd.read_parquet(events)
+    assert summary.events == len(written) == 4
+    assert written["displacement_tonnes"].dtype == "float64"
+    assert written["berth"].tolist() == ["1", "2", "A", "B"]
+    np.testing.assert_allclose(written["displacement_tonnes"], [50000, 60000, 10000.5, 20000])
+
+
+def test_parquet_events_out_with_sparse_extra_column(tmp_path: Path) -> None:
+    """Test that an unknown text column empty in the first chunk reaches Parquet output."""
+    pytest.importorskip("pyarrow")
+    path, events = tmp_path / "log.csv", tmp_path / "events.parquet"
+    log = _log(30)
+    log["note"] = [None] * 20 + ["late"] * 10
+    log["mmsi"] = 366000000 + np.arange(30)
+    log.to_csv(path, index=False)
+    summary = summarize_log(path, chunksize=10, events_out=events)
+    written = pd.read_parquet(events)
+    assert summary.events == len(written) == 30
+    assert written["note"].isna().sum() == 20 and (written["note"][20:] == "late").all()
+    assert written["mmsi"].tolist() == [str(366000000 + i) for i in range(30)]
+
+
+def test_cli_ais_berthing(tmp_path: Path) -> None:
+    """Test the ais-berthing command's JSON rows."""
+    path = tmp_path / "log.csv"
+    _log(500).to_csv(path, index=False)
+    result = CliRunner().invoke(
+        app, ["--output", "json", "ais-berthing", str(path), "--threshold", "1e6"]
+    )
+    assert result.exit_code == 0, result.output
+    rows = [json.loads(line) for line in result.output.splitlines()]
+    assert {r["berth"] for r in rows} == {"B1", "B2", "B3"}
+    assert sum(r["events"] for r in rows) == 500
+    assert "p99.9_J" in rows[0] and "exceed_1e+06_J" in rows[0]
+
+
+def test_cli_ais_berthing_json_without_nan(tmp_path: Path) -> None:
+    """Test that berths with NaN statistics give valid JSON lines with nulls."""
+    path = tmp_path / "log.csv"
+    one = {"berth": "B9", "vessel_type": "tanker", "displacement_tonnes": 5e4, "speed_knots": 0.2}
+    bad = {"berth": "B8", "vessel_type": "tanker", "displacement_tonnes": -1, "speed_knots": 0.2}
+    pd.concat([_log(20), pd.DataFrame([one, bad])]).to_csv(path, index=False)
+    result = CliRunner().invoke(app, ["--output", "json", "ais-berthing", str(path)])
+    assert result.exit_code == 0, result.output
+    assert "NaN" not in result.output
+    rows = {r["berth"]: r for r in map(json.loads, result.output.splitlines())}
+    assert rows["B9"]["events"] == 1 and None in rows["B9"].values()
+    assert rows["B8"]["mean_J"] is None
@@ -0,0 +1,144 @@
+"""
+Tests for the bulk report runner.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from open_gov_waterfront.batch import (
+    OUTPUT_COLUMNS,
+    process_chunk,
+    resolve_workers,
+    run_report,
+)
+from open_gov_waterfront.cli import app
+from open_gov_waterfront.columnar import estimate_rows
+from open_gov_waterfront.reports import REPORT_COLUMNS
+from open_gov_waterfront.seawall import sliding_fs
+from open_gov_waterfront.waves import wavelength_L
+
+
+def _projects(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "project": [f"P{i}" for i in range(n)],
+            "location": "Long Beach",
+            "jurisdiction": "CA",
+            "waterbody": "Pacific Ocean",
+            "design_wave_Hs_m": rng.uniform(0.5, 4.0, n),
+            "design_Tp_s": rng.uniform(4.0, 15.0, n),
+            "water_depth_m": rng.uniform(2.0, 30.0, n),
+            "pile_D_m": 1.0,
+            "morison_Cd": 1.0,
+            "morison_Cm": 2.0,
+            "mooring_wind_area_m2": 1000.0,
+            "mooring_current_area_m2": 500.0,
+            "mooring_wind_mps": 20.0,
+            "mooring_current_mps": 1.0,
+            "berthing_mass_tonnes": 50000.0,
+            "berthing_speed_knots": 0.3,
+            "seawall_mu": 0.6,
+            "seawall_W_kN": 1000.0,
+            "seawall_T_kN": 400.0,
+            "notes": "",
+        },
+        columns=REPORT_COLUMNS,
+    )
+
+
+def test_process_chunk_results() -> None:
+    """Test that results match the scalar calculations and error columns are empty."""
+    df = _projects(5)
+    out = process_chunk(df)
+    assert list(out.columns) == REPORT_COLUMNS + OUTPUT_COLUMNS
+    expected = [wavelength_L(t, h) for t, h in zip(df.design_Tp_s, df.water_depth_m, strict=True)]
+    np.testing.assert_allclose(out["wavelength_m"], expected)
+    assert out["seawall_sliding_fs"].tolist() == [sliding_fs(0.6, 1000.0, 400.0)] * 5
+    assert (out["waves_error"] == "").all()
+
+
+def test_process_chunk_row_errors() -> None:
+    """Test that bad inputs only affect their own row and calculation."""
+    df = _projects(4).astype({"seawall_mu": object})
+    df.loc[1, "design_Tp_s"] = -2.0
+    df.loc[2, "seawall_mu"] = "n/a"
+    df.loc[3, "morison_Cd"] = np.nan  # optional: falls back to the default
+    out = process_chunk(df)
+    assert out.loc[1, "waves_error"] == "design_Tp_s must be > 0"
+    assert out.loc[1, "morison_error"] == "design_Tp_s must be > 0"
+    assert np.isnan(out.loc[1, "wavelength_m"])
+    assert out.loc[1, "seawall_error"] == ""
+    assert out.loc[2, "seawall_error"] == "seawall_mu is missing or not a number"
+    assert np.isnan(out.loc[2, "seawall_sliding_fs"])
+    assert out.loc[2, "waves_error"] == ""
+    assert out.loc[3, "morison_error"] == ""
+    assert out.loc[3, "morison_force_per_length_Npm"] > 0
+
+
+def test_run_report_chunks(tmp_path: Path) -> None:
+    """Test that a chunked run writes every row once, in order."""
+    src, dst = tmp_path / "in.csv", tmp_path / "out.csv"
+    _projects(25).to_csv(src, index=False)
+    summary = run_report(src, dst, chunksize=10)
+    assert (summary.rows, summary.chunks) == (25, 3)
+    out = pd.read_csv(dst, keep_default_na=False)
+    assert out["project"].tolist() == [f"P{i}" for i in range(25)]
+    assert list(out.columns) == REPORT_COLUMNS + OUTPUT_COLUMNS
+
+
+def test_run_report_parallel_matches_serial(tmp_path: Path) -> None:
+    """Test that a process-pool run writes the same file as a serial run."""
+    src = tmp_path / "in.csv"
+    df = _projects(50).astype({"seawall_mu": object})
+    df.loc[7, "seawall_mu"] = "bad"
+    df.to_csv(src, index=False)
+    done: list[int] = []
+    serial = run_report(src, tmp_path / "serial.csv", chunksize=7)
+    parallel = run_report(
+        src, tmp_path / "parallel.csv", chunksize=7, workers=2, progress=done.append
+    )
+    assert (tmp_path / "serial.csv").read_bytes() == (tmp_path / "parallel.csv").read_bytes()
+    assert parallel.error_rows == serial.error_rows == {**serial.error_rows, "seawall": 1}
+    assert sum(done) == 50 and len(done) == parallel.chunks == 8
+
+
+def test_resolve_workers_and_estimate_rows(tmp_path: Path) -> None:
+    """Test worker-count resolution and the row estimate used for progress."""
+    assert resolve_workers(3) == 3
+    assert resolve_workers(0) >= 1
+    with pytest.raises(ValueError):
+        resolve_workers(-1)
+    src = tmp_path / "in.csv"
+    _projects(12).to_csv(src, index=False)
+    assert estimate_rows(src) == 12
+
+
+def test_run_report_empty_and_missing_columns(tmp_path: Path) -> None:
+    """Test a header-only template and rejection of inputs missing required columns."""
+    src, dst = tmp_path / "in.csv", tmp_path / "out.csv"
+    pd.DataFrame(columns=REPORT_COLUMNS).to_csv(src, index=False)
+    assert run_report(src, dst).rows == 0
+    assert list(pd.read_csv(dst).columns) == REPORT_COLUMNS + OUTPUT_COLUMNS
+
+    pd.DataFrame({"project": ["x"]}).to_csv(src, index=False)
+    with pytest.raises(ValueError, match="missing required columns"):
+        run_report(src, dst)
+
+
+def test_cli_run_report(tmp_path: Path) -> None:
+    """Test the run-report command."""
+    src, dst = tmp_path / "in.csv", tmp_path / "out.csv"
+    _projects(3).to_csv(src, index=False)
+    result = CliRunner().invoke(app, ["run-report", str(src), "--out", str(dst)])
+    assert result.exit_code == 0, result.output
+    assert "3 rows" in result.output
+    assert len(pd.read_csv(dst)) == 3
@@ -0,0 +1,42 @@
+"""
+Tests for the benchmark suite.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+from open_gov_waterfront.server import admission_gates
+
+SUITE = Path(__file__).resolve().parents[1] / "benchmarks" / "suite.py"
+
+
+@pytest.fixture(scope="module")
+def suite() -> ModuleType:
+    spec = importlib.util.spec_from_file_location("bench_suite", SUITE)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_concurrent_api_cases_run_on_server_app(
+    suite: ModuleType, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that every api case at c=16 completes against the real app without 503s."""
+    monkeypatch.setattr(suite, "API_REQUESTS", 48)
+    limits = {name: gate.limits for name, gate in admission_gates.items()}
+    cases = [c for c in suite.all_cases() if c.group == "api" and c.name.endswith("[c=16]")]
+    assert any("/tides" in c.name for c in cases)
+    for case in cases:
+        result = suite.measure(case, repeat=1)
+        assert result["ops"] == 48 and result["best_s"] > 0
+    assert {name: gate.limits for name, gate in admission_gates.items()} == limits
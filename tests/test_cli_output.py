@@ -0,0 +1,86 @@
+"""
+Tests for the machine-readable CLI output formats.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from open_gov_waterfront.cli import app
+from open_gov_waterfront.seawall import sliding_fs
+from open_gov_waterfront.waves import wavelength_L
+
+runner = CliRunner()
+
+
+def _run(*args: str) -> str:
+    result = runner.invoke(app, list(args))
+    assert result.exit_code == 0, result.output
+    return result.stdout
+
+
+def test_json_record_full_precision() -> None:
+    """Test that JSON output carries unrounded values under API field names."""
+    data = json.loads(_run("--output", "json", "waves", "--T", "8", "--h", "10"))
+    assert set(data) == {
+        "wavelength_m",
+        "celerity_mps",
+        "group_celerity_mps",
+        "shoaling_coefficient",
+    }
+    assert data["wavelength_m"] == wavelength_L(8.0, 10.0)
+
+
+def test_csv_and_plain_records() -> None:
+    """Test CSV (header plus one row) and plain (key=value lines) records."""
+    rows = list(
+        csv.reader(io.StringIO(_run("-o", "csv", "berthing", "--mass", "5e4", "--speed", "0.3")))
+    )
+    assert rows[0] == ["energy_J", "fender_reaction_kN"] and len(rows) == 2
+    plain = _run("-o", "plain", "seawall-slide", "--mu", "0.6", "--W", "1000", "--T", "400")
+    assert plain == f"sliding_fs={sliding_fs(0.6, 1000, 400)}\n"
+
+
+@pytest.mark.parametrize("fmt", ["json", "csv", "plain"])
+def test_tides_streams_rows(fmt: str) -> None:
+    """Test that tides writes one line per time step instead of a summary."""
+    out = _run("-o", fmt, "tides", "--A1", "0.5", "--T1", "44714", "--dur", "3000", "--dt", "600")
+    lines = out.splitlines()
+    assert len(lines) == 6 + (fmt == "csv")
+    if fmt == "json":
+        assert json.loads(lines[0]) == {"t_s": 0.0, "eta_m": 0.5}
+    elif fmt == "csv":
+        assert lines[:2] == ["t_s,eta_m", "0.0,0.5"]
+    else:
+        assert lines[0] == "0.0 0.5"
+
+
+def test_tides_to_file_emits_summary(tmp_path: Path) -> None:
+    """Test that with --out the series goes to the file and stdout gets a summary."""
+    out = tmp_path / "tide.csv"
+    data = json.loads(
+        _run("-o", "json", "tides", "--A1", "0.5", "--T1", "44714", "--out", str(out))
+    )
+    assert data["points"] == 73 and data["eta_max_m"] == 0.5
+    assert len(out.read_text().splitlines()) == 74
+
+
+def test_list_states_rows_and_rich_default() -> None:
+    """Test tabular output for list-states and that the default stays Rich."""
+    rows = [json.loads(line) for line in _run("-o", "json", "list-states").splitlines()]
+    assert [r["code"] for r in rows] == ["CA", "IN", "OH"]
+    assert "Sliding FS" in _run("seawall-slide", "--mu", "0.6", "--W", "1000", "--T", "400")
+
+
+def test_invalid_output_format() -> None:
+    """Test that an unknown format is rejected."""
+    result = runner.invoke(app, ["-o", "yaml", "list-states"])
+    assert result.exit_code == 2
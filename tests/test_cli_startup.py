@@ -0,0 +1,56 @@
+"""
+Start-up cost of the CLI: scalar commands must not import the array, table or HTTP
+stacks, and their imports must stay within a time budget.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+# Modules only the array, table and HTTP commands need.
+HEAVY_MODULES = {"numpy", "pandas", "pyarrow", "httpx", "pydantic", "fastapi", "starlette"}
+
+# Total import time of a scalar command, summed over top-level imports. Measured at
+# about 130 ms locally, against about 550 ms when pandas was imported eagerly.
+STARTUP_BUDGET_MS = 350.0
+
+
+def _import_profile(*args: str) -> tuple[set[str], float]:
+    """Modules imported by a CLI run and their total import time in ms."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "open_gov_waterfront.cli", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules: set[str] = set()
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative_us, name = line.removeprefix("import time:").split("|")
+        modules.add(name.strip())
+        if not name.startswith("  "):  # top level; nested imports are in its cumulative time
+            total_us += int(cumulative_us)
+    return modules, total_us / 1000.0
+
+
+def test_scalar_command_skips_heavy_imports() -> None:
+    """Test that a scalar command loads none of the heavy dependencies."""
+    modules, _ = _import_profile("seawall-slide", "--mu", "0.5", "--W", "100", "--T", "40")
+    assert not {m.split(".")[0] for m in modules} & HEAVY_MODULES
+
+
+def test_scalar_command_import_budget() -> None:
+    """Test that a scalar command's imports fit the start-up budget."""
+    _, total_ms = _import_profile("berthing", "--mass", "50000", "--speed", "0.3")
+    assert total_ms < STARTUP_BUDGET_MS
+
+
+def test_heavy_command_still_works() -> None:
+    """Test that commands with deferred imports load them when run."""
+    modules, _ = _import_profile("tides", "--A1", "0.5", "--T1", "44714")
+    assert "numpy" in modules
@@ -0,0 +1,115 @@
+"""
+Tests for CSV/Parquet batch I/O.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from open_gov_waterfront import columnar
+from open_gov_waterfront.batch import run_report
+from open_gov_waterfront.cli import app
+
+from .test_batch import _projects
+
+pytest.importorskip("pyarrow")
+
+
+def test_is_parquet() -> None:
+    """Test format selection by suffix."""
+    assert columnar.is_parquet(Path("a.parquet"))
+    assert columnar.is_parquet(Path("a.PQ"))
+    assert not columnar.is_parquet(Path("a.csv"))
+
+
+@pytest.mark.parametrize("name", ["t.csv", "t.parquet"])
+def test_writer_chunks_roundtrip_with_projection(tmp_path: Path, name: str) -> None:
+    """Test chunked writes, column projection and chunked reads for both formats."""
+    path = tmp_path / name
+    dtypes = {"x": "float64", "label": "string"}
+    with columnar.TableWriter(path, dtypes=dtypes) as writer:
+        writer.write(pd.DataFrame({"label": ["a", "b"], "x": [1.0, 2.0], "y": [0, 1]}))
+        writer.write(pd.DataFrame({"label": [None, None], "x": ["3", "bad"], "y": [2, 3]}))
+    assert columnar.read_columns(path) == ["label", "x", "y"]
+    assert columnar.estimate_rows(path) == 4
+    chunks = list(columnar.iter_chunks(path, chunksize=3, columns=["y", "x"]))
+    assert [list(c.columns) for c in chunks] == [["x", "y"], ["x", "y"]]
+    df = pd.concat(chunks, ignore_index=True)
+    assert df["y"].tolist() == [0, 1, 2, 3]
+    x = pd.to_numeric(df["x"], errors="coerce").to_numpy()
+    np.testing.assert_array_equal(x[:3], [1.0, 2.0, 3.0])
+    if columnar.is_parquet(path):
+        assert np.isnan(x[3])
+
+
+def test_parquet_row_groups_follow_chunks(tmp_path: Path) -> None:
+    """Test that each written chunk becomes one Parquet row group."""
+    import pyarrow.parquet as pq
+
+    path = tmp_path / "t.parquet"
+    with columnar.TableWriter(path) as writer:
+        for i in range(3):
+            writer.write(pd.DataFrame({"v": np.arange(5.0) + i}))
+    assert pq.ParquetFile(path).num_row_groups == 3
+
+
+def test_run_report_parquet_matches_csv(tmp_path: Path) -> None:
+    """Test a Parquet round trip of the bulk runner against its CSV output."""
+    df = _projects(30)
+    df.to_csv(tmp_path / "in.csv", index=False)
+    df.to_parquet(tmp_path / "in.parquet", index=False)
+    run_report(tmp_path / "in.csv", tmp_path / "out.csv", chunksize=8)
+    run_report(tmp_path / "in.parquet", tmp_path / "out.parquet", chunksize=8, workers=2)
+    csv_out = pd.read_csv(tmp_path / "out.csv")
+    pq_out = pd.read_parquet(tmp_path / "out.parquet")
+    assert list(pq_out.columns) == list(csv_out.columns)
+    np.testing.assert_allclose(pq_out["mooring_total_load_N"], csv_out["mooring_total_load_N"])
+    assert (pq_out["waves_error"] == "").all()
+
+    summary = run_report(
+        tmp_path / "in.parquet", tmp_path / "slim.parquet", keep=["project"], chunksize=8
+    )
+    assert summary.rows == 30
+    slim = pd.read_parquet(tmp_path / "slim.parquet")
+    assert slim.columns[0] == "project" and "seawall_mu" not in slim.columns
+    with pytest.raises(ValueError, match="not in the input"):
+        run_report(tmp_path / "in.csv", tmp_path / "x.csv", keep=["nope"])
+
+
+@pytest.mark.parametrize("source", ["in.csv", "in.parquet"])
+def test_run_report_parquet_sparse_extra_column(tmp_path: Path, source: str) -> None:
+    """Test Parquet output when an extra text column is empty for the first chunks."""
+    df = _projects(200)
+    df["remarks"] = [None] * 150 + ["x"] * 50
+    df["ref_no"] = [None] * 150 + [7] * 50
+    src = tmp_path / source
+    if columnar.is_parquet(src):
+        df.to_parquet(src, index=False)
+    else:
+        df.to_csv(src, index=False)
+    summary = run_report(src, tmp_path / "out.parquet", chunksize=100)
+    assert summary.rows == 200
+    out = pd.read_parquet(tmp_path / "out.parquet")
+    assert out["remarks"].isna().sum() == 150 and (out["remarks"][150:] == "x").all()
+    assert out["ref_no"][150:].astype(float).eq(7).all()
+    assert out["seawall_mu"].dtype == np.float64
+
+
+def test_cli_parquet_outputs(tmp_path: Path) -> None:
+    """Test Parquet output from report-template and tides."""
+    runner = CliRunner()
+    template = tmp_path / "template.parquet"
+    result = runner.invoke(app, ["report-template", "--out", str(template)])
+    assert result.exit_code == 0
+    assert pd.read_parquet(template).empty
+    series = tmp_path / "tide.parquet"
+    result = runner.invoke(app, ["tides", "--A1", "0.5", "--T1", "44714", "--out", str(series)])
+    assert result.exit_code == 0, result.output
+    assert list(pd.read_parquet(series).columns) == ["t_s", "eta_m"]
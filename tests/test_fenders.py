@@ -0,0 +1,156 @@
+"""
+Tests for indexed fender catalog selection.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from open_gov_waterfront.cli import app
+from open_gov_waterfront.fenders import (
+    NONE,
+    FenderCatalog,
+    FenderModel,
+    catalog_from_records,
+    load_catalog,
+)
+
+CATALOG = [
+    {
+        "model": "SC-500",
+        "energy_kJ": 60,
+        "reaction_kN": 300,
+        "deflection_m": 0.36,
+        "mass_kg": 250,
+        "cost": 4000,
+    },
+    {
+        "model": "SC-800",
+        "energy_kJ": 180,
+        "reaction_kN": 560,
+        "deflection_m": 0.58,
+        "mass_kg": 800,
+        "cost": 9000,
+    },
+    {
+        "model": "SC-1000",
+        "energy_kJ": 350,
+        "reaction_kN": 700,
+        "deflection_m": 0.72,
+        "mass_kg": 1500,
+        "cost": 14000,
+    },
+    {
+        "model": "CE-1000",
+        "energy_kJ": 400,
+        "reaction_kN": 900,
+        "deflection_m": 0.6,
+        "mass_kg": 1200,
+        "cost": 16000,
+    },
+]
+
+
+def test_select_matches_brute_force() -> None:
+    """Test batched selections against a scan of random catalogs, for both objectives."""
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        n = int(rng.integers(1, 40))
+        models = [
+            FenderModel(
+                f"F{i}",
+                float(rng.integers(1, 15)) * 50,
+                float(rng.integers(1, 15)) * 100,
+                0.5,
+                float(rng.integers(1, 8)),
+                float(rng.integers(1, 8)),
+            )
+            for i in range(n)
+        ]
+        catalog = FenderCatalog(models)
+        energy, reaction = rng.uniform(0, 800e3, 300), rng.uniform(0, 1600, 300)
+        for by, field in (("mass", "mass_kg"), ("cost", "cost")):
+            chosen = catalog.select(energy, reaction, by=by)
+            for E, R, k in zip(energy, reaction, chosen, strict=True):
+                fits = [m for m in models if m.energy_kJ >= E / 1000 and m.reaction_kN <= R]
+                if not fits:
+                    assert k == NONE
+                    continue
+                assert models[k] in fits
+                assert getattr(models[k], field) == min(getattr(m, field) for m in fits)
+
+
+def test_objectives_ties_and_limits() -> None:
+    """Test lightest versus cheapest picks, exact rated limits, ties and NaN limits."""
+    catalog = catalog_from_records(CATALOG)
+    assert catalog.pick(300e3, 1000.0).model == "CE-1000"
+    assert catalog.pick(300e3, 1000.0, by="cost").model == "SC-1000"
+    assert catalog.pick(60e3, 300.0).model == "SC-500"
+    assert catalog.pick(60e3, 299.0) is None
+    assert catalog.pick(500e3, 1000.0) is None
+    twins = FenderCatalog(
+        [FenderModel("A", 100, 500, 0.5, 10), FenderModel("B", 200, 400, 0.5, 10)]
+    )
+    assert twins.pick(50e3, 1000.0).model == "B"  # equal mass: lower reaction wins
+    chosen = catalog.select([[50e3], [np.nan]], [400.0, 1000.0])
+    assert chosen.shape == (2, 2) and chosen[0].tolist() == [0, 0]
+    assert chosen[1].tolist() == [NONE, NONE]
+
+
+def test_load_json_and_csv(tmp_path: Path) -> None:
+    """Test loading catalogs from JSON and CSV, with an optional column left blank."""
+    json_path = tmp_path / "fenders.json"
+    json_path.write_text(json.dumps({"fenders": CATALOG}))
+    assert [m.model for m in load_catalog(json_path)] == [r["model"] for r in CATALOG]
+    csv_path = tmp_path / "fenders.csv"
+    frame = pd.DataFrame(CATALOG)
+    frame.loc[0, "cost"] = np.nan
+    frame.to_csv(csv_path, index=False)
+    catalog = load_catalog(csv_path)
+    assert catalog[2] == FenderModel("SC-1000", 350.0, 700.0, 0.72, 1500.0, 14000.0)
+    assert catalog.pick(50e3, 400.0).model == "SC-500"
+    with pytest.raises(ValueError, match="without cost: SC-500"):
+        catalog.select(50e3, 400.0, by="cost")
+
+
+def test_rejects_bad_catalogs() -> None:
+    """Test validation of entries, duplicates and objectives."""
+    with pytest.raises(ValueError, match="missing: reaction_kN"):
+        catalog_from_records([{"model": "X", "energy_kJ": 1, "deflection_m": 0.1}])
+    with pytest.raises(ValueError, match="must be > 0"):
+        FenderModel("X", 0.0, 100.0, 0.5)
+    with pytest.raises(ValueError, match="Duplicate"):
+        catalog_from_records([CATALOG[0], CATALOG[0]])
+    with pytest.raises(ValueError, match="at least one"):
+        FenderCatalog([])
+    with pytest.raises(ValueError, match="Unknown objective"):
+        catalog_from_records(CATALOG).select(1.0, 1.0, by="price")  # type: ignore[arg-type]
+
+
+def test_cli_select_fenders(tmp_path: Path) -> None:
+    """Test the select-fenders command for a table of berths."""
+    catalog, berths = tmp_path / "fenders.json", tmp_path / "berths.csv"
+    catalog.write_text(json.dumps(CATALOG))
+    pd.DataFrame(
+        {
+            "berth": ["B1", "B2", "B3"],
+            "energy_J": [50e3, 300e3, 900e3],
+            "max_reaction_kN": [400.0, 1000.0, 1000.0],
+        }
+    ).to_csv(berths, index=False)
+    result = CliRunner().invoke(
+        app, ["-o", "json", "select-fenders", str(catalog), "--berths", str(berths)]
+    )
+    assert result.exit_code == 0, result.output
+    rows = [json.loads(line) for line in result.output.splitlines()]
+    assert [r["fender_model"] for r in rows] == ["SC-500", "CE-1000", None]
+    missing = CliRunner().invoke(app, ["select-fenders", str(catalog), "--energy", "1e5"])
+    assert missing.exit_code == 2
@@ -0,0 +1,183 @@
+"""
+Tests for the background job queue and the /jobs API.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import io
+import math
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from open_gov_waterfront import jobs, server
+from open_gov_waterfront.jobs import JobQueue
+from open_gov_waterfront.tides import Constituent, tide_series
+
+from .test_batch import _projects
+
+TIDE_PARAMS = {
+    "constituents": [{"amp_m": 0.5, "period_s": 44714.0}, {"amp_m": 0.2, "period_s": 43200.0}],
+    "duration_s": 30 * 86400.0,
+    "dt_s": 60.0,
+}
+
+
+@pytest.fixture
+def queue(tmp_path: Path) -> Iterator[JobQueue]:
+    q = JobQueue(tmp_path / "jobs", workers=2)
+    q.start()
+    yield q
+    q.shutdown()
+
+
+def test_tide_job_writes_memmapped_artifacts(
+    queue: JobQueue, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a tide job generated in blocks matches the one-shot series."""
+    monkeypatch.setattr(jobs, "TIDE_BLOCK_POINTS", 10_000)
+    job = queue.wait(queue.submit("tides", TIDE_PARAMS).id)
+    assert job.status == "succeeded" and job.progress == 1.0
+    assert job.artifacts == ["t_s.npy", "eta_m.npy"]
+    cons = [
+        Constituent(0.5, 2 * math.pi / 44714.0, 0.0),
+        Constituent(0.2, 2 * math.pi / 43200.0, 0.0),
+    ]
+    t_ref, eta_ref = tide_series(0.0, 30 * 86400.0, 60.0, cons)
+    path = queue.artifact_path(job.id, "eta_m.npy")
+    assert path is not None
+    eta = np.load(path, mmap_mode="r")
+    assert isinstance(eta, np.memmap)
+    np.testing.assert_allclose(eta, eta_ref, atol=1e-12)
+    np.testing.assert_array_equal(np.load(path.with_name("t_s.npy")), t_ref)
+    assert job.result is not None and job.result["points"] == t_ref.size
+    assert job.result["eta_max_m"] == pytest.approx(eta_ref.max())
+    assert queue.artifact_path(job.id, "../jobs.sqlite3") is None
+
+
+def test_report_job_and_failures(queue: JobQueue, tmp_path: Path) -> None:
+    """Test a report job, a failing job and submit-time validation."""
+    queue.input_dir.mkdir(parents=True)
+    _projects(25).to_csv(queue.input_dir / "projects.csv", index=False)
+    job = queue.wait(queue.submit("report", {"input_path": "projects.csv", "chunksize": 10}).id)
+    assert job.status == "succeeded" and job.result is not None
+    assert job.result["rows"] == 25 and job.result["chunks"] == 3
+    report = queue.artifact_path(job.id, "report.csv")
+    assert report is not None and len(pd.read_csv(report)) == 25
+
+    failed = queue.wait(queue.submit("report", {"input_path": "nope.csv"}).id)
+    assert failed.status == "failed" and "not found" in (failed.error or "")
+    with pytest.raises(ValueError, match="Unknown job kind"):
+        queue.submit("nope", {})
+    with pytest.raises(ValidationError):
+        queue.submit("tides", {"constituents": [], "duration_s": 10})
+
+
+def test_report_job_inputs_stay_in_input_dir(queue: JobQueue, tmp_path: Path) -> None:
+    """Test that report jobs cannot read files outside the job input directory."""
+    secret = tmp_path / "secret.csv"
+    _projects(3).to_csv(secret, index=False)
+    for path in (str(secret), "../secret.csv", "a/../../secret.csv", "C:/secret.csv"):
+        with pytest.raises(ValidationError, match="input directory"):
+            queue.submit("report", {"input_path": path})
+    queue.input_dir.mkdir(parents=True)
+    (queue.input_dir / "link.csv").symlink_to(secret)
+    escaped = queue.wait(queue.submit("report", {"input_path": "link.csv"}).id)
+    assert escaped.status == "failed" and "outside" in (escaped.error or "")
+
+
+def test_interrupted_jobs_resume_on_start(tmp_path: Path) -> None:
+    """Test that queued jobs and running jobs of a dead owner run after restart."""
+    first = JobQueue(tmp_path, workers=1)
+    params = {**TIDE_PARAMS, "duration_s": 86400.0}
+    running = first.store.create("tides", params)
+    assert first.store.claim(running.id, "dead-worker")
+    first.store._execute("UPDATE jobs SET heartbeat_at = 0 WHERE id = ?", (running.id,))
+    queued = first.store.create("tides", params)
+    first.store.close()
+
+    second = JobQueue(tmp_path, workers=1)
+    second.start()
+    try:
+        assert second.wait(running.id).status == "succeeded"
+        assert second.wait(queued.id).status == "succeeded"
+    finally:
+        second.shutdown()
+
+
+def test_claims_are_exclusive_across_processes(tmp_path: Path) -> None:
+    """Test that only one of several stores sharing a database claims a queued job."""
+    stores = [jobs.JobStore(tmp_path / jobs.JOBS_DB) for _ in range(3)]
+    try:
+        job = stores[0].create("tides", TIDE_PARAMS)
+        claims = [store.claim(job.id, f"worker-{i}") for i, store in enumerate(stores)]
+        assert claims.count(True) == 1
+        assert stores[1].get(job.id).status == "running"  # type: ignore[union-attr]
+    finally:
+        for store in stores:
+            store.close()
+
+
+def test_sibling_start_leaves_live_jobs_alone(tmp_path: Path) -> None:
+    """Test that a starting queue keeps a live owner's job and takes over a stale one."""
+    queue = JobQueue(tmp_path, workers=1, heartbeat_s=0.05, stale_after_s=0.5)
+    store = queue.store
+    live = store.create("tides", TIDE_PARAMS)
+    assert store.claim(live.id, "sibling")
+    stale = store.create("tides", TIDE_PARAMS)
+    assert store.claim(stale.id, "gone")
+    store._execute("UPDATE jobs SET heartbeat_at = 0 WHERE id = ?", (stale.id,))
+    queue.start()
+    try:
+        assert queue.wait(stale.id).status == "succeeded"
+        job = store.get(live.id)
+        assert job is not None and job.status == "running"
+        store.heartbeat("sibling")
+        assert store.requeue_stale(0.5) == 0
+        # Once the sibling stops beating, the live queue's heartbeat thread takes over.
+        assert queue.wait(live.id, timeout_s=10.0).status == "succeeded"
+    finally:
+        queue.shutdown()
+
+
+def test_server_job_queue_created_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that threaded job handlers racing on first use share one queue."""
+    monkeypatch.setattr(server, "_job_queue", None)
+    monkeypatch.setattr(server.settings, "jobs_dir", tmp_path)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        queues = list(pool.map(lambda _: server.get_job_queue(), range(16)))
+    try:
+        assert all(q is queues[0] for q in queues)
+    finally:
+        queues[0].shutdown()
+
+
+def test_jobs_api(queue: JobQueue, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test submitting, polling, listing and downloading through the API."""
+    monkeypatch.setattr(server, "_job_queue", queue)
+    client = TestClient(server.app)
+    r = client.post("/jobs", json={"kind": "tides", "params": TIDE_PARAMS})
+    assert r.status_code == 202
+    job_id = r.json()["id"]
+    assert r.headers["location"] == f"/jobs/{job_id}"
+    queue.wait(job_id)
+    body = client.get(f"/jobs/{job_id}").json()
+    assert body["status"] == "succeeded" and body["artifacts"] == ["t_s.npy", "eta_m.npy"]
+    r = client.get(f"/jobs/{job_id}/artifacts/t_s.npy")
+    assert r.status_code == 200
+    assert np.load(io.BytesIO(r.content)).size == body["result"]["points"]
+    assert [j["id"] for j in client.get("/jobs?status=succeeded").json()] == [job_id]
+
+    assert client.get("/jobs/missing").status_code == 404
+    assert client.get(f"/jobs/{job_id}/artifacts/other.npy").status_code == 404
+    assert client.post("/jobs", json={"kind": "nope"}).status_code == 400
+    bad = client.post("/jobs", json={"kind": "tides", "params": {"constituents": []}})
+    assert bad.status_code == 422
@@ -0,0 +1,77 @@
+"""
+Tests for the API load generator.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from open_gov_waterfront import loadtest
+from open_gov_waterfront.cli import app
+
+
+def test_parse_mix() -> None:
+    """Test that mixes are normalized and names without weights count as 1."""
+    assert loadtest.parse_mix("waves=3,tides") == {"waves": 0.75, "tides": 0.25}
+    assert loadtest.parse_mix("waves=1,seawall=0") == {"waves": 1.0}
+    assert set(loadtest.parse_mix("all")) == set(loadtest.ENDPOINTS)
+
+
+@pytest.mark.parametrize("spec", ["bogus", "waves=x", "waves=-1", "waves=0", ""])
+def test_parse_mix_invalid(spec: str) -> None:
+    """Test that unknown endpoints and bad weights are rejected."""
+    with pytest.raises(ValueError):
+        loadtest.parse_mix(spec)
+
+
+def test_percentile() -> None:
+    """Test nearest-rank percentiles."""
+    values = [float(i) for i in range(101)]
+    assert loadtest.percentile(values, 0.5) == 50.0
+    assert loadtest.percentile(values, 0.99) == 99.0
+    assert loadtest.percentile([], 0.5) == 0.0
+
+
+def test_run_load_in_process() -> None:
+    """Test that an in-process run sends exactly the requested number of requests."""
+    mix = loadtest.parse_mix("all")
+    result = asyncio.run(
+        loadtest.run_load(mix, concurrency=4, duration_s=None, requests=40, seed=1)
+    )
+    total = result.total()
+    assert result.target == "in-process"
+    assert len(total.latencies_s) == 40
+    assert total.errors == 0 and total.shed == 0
+    summary = result.as_dict()["total"]
+    assert summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"] <= summary["max_ms"]
+
+
+def test_run_load_requires_stop_condition() -> None:
+    """Test that a run needs a duration or a request count."""
+    with pytest.raises(ValueError):
+        asyncio.run(loadtest.run_load({"waves": 1.0}, duration_s=None, requests=None))
+
+
+def test_cli_loadtest(tmp_path: Path) -> None:
+    """Test the loadtest subcommand and its JSON output."""
+    out = tmp_path / "load.json"
+    result = CliRunner().invoke(
+        app, ["loadtest", "--mix", "waves,seawall", "--requests", "10", "--json-out", str(out)]
+    )
+    assert result.exit_code == 0, result.output
+    data = json.loads(out.read_text())
+    assert data["total"]["requests"] == 10
+    assert set(data["endpoints"]) <= {"waves", "seawall"}
+
+
+def test_cli_loadtest_bad_mix() -> None:
+    """Test that an invalid mix exits with status 2."""
+    result = CliRunner().invoke(app, ["loadtest", "--mix", "bogus"])
+    assert result.exit_code == 2
@@ -0,0 +1,97 @@
+"""
+Tests for request instrumentation and the /metrics endpoint.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from open_gov_waterfront.admission import AdmissionGate, AdmissionLimits
+from open_gov_waterfront.metrics import MetricsRegistry, admission_collector
+from open_gov_waterfront.server import admission_gates, app
+
+client = TestClient(app)
+
+
+def _sample(text: str, prefix: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{prefix} not found")
+
+
+def test_registry_histogram_buckets() -> None:
+    """Test cumulative bucket counts, sum and error counting."""
+    registry = MetricsRegistry(buckets=(0.01, 0.1))
+    registry.observe("POST", "/waves", 200, 0.005)
+    registry.observe("POST", "/waves", 200, 0.05)
+    registry.observe("POST", "/waves", 400, 0.5)
+    text = registry.render()
+    labels = 'method="POST",route="/waves"'
+    assert (
+        _sample(text, f'waterfront_http_request_duration_seconds_bucket{{{labels},le="0.01"}}') == 1
+    )
+    assert (
+        _sample(text, f'waterfront_http_request_duration_seconds_bucket{{{labels},le="0.1"}}') == 2
+    )
+    assert (
+        _sample(text, f'waterfront_http_request_duration_seconds_bucket{{{labels},le="+Inf"}}') == 3
+    )
+    assert _sample(text, f"waterfront_http_request_duration_seconds_count{{{labels}}}") == 3
+    assert _sample(
+        text, f"waterfront_http_request_duration_seconds_sum{{{labels}}}"
+    ) == pytest.approx(0.555)
+    assert _sample(text, f"waterfront_http_request_errors_total{{{labels}}}") == 1
+    assert _sample(text, f'waterfront_http_requests_total{{{labels},status="200"}}') == 2
+
+
+def test_registry_invalid_buckets() -> None:
+    """Test that unsorted buckets are rejected."""
+    with pytest.raises(ValueError):
+        MetricsRegistry(buckets=(1.0, 0.1))
+
+
+def test_admission_collector() -> None:
+    """Test admission gate gauges in exposition output."""
+    gate = AdmissionGate(AdmissionLimits(max_in_flight=1, max_queue=0))
+    gate.in_flight = 1
+    gate.rejected = 4
+    registry = MetricsRegistry()
+    registry.add_collector(admission_collector({"series": gate}))
+    text = registry.render()
+    assert _sample(text, 'waterfront_admission_in_flight{endpoint_class="series"}') == 1
+    assert _sample(text, 'waterfront_admission_rejected_total{endpoint_class="series"}') == 4
+
+
+def test_metrics_endpoint() -> None:
+    """Test per-route counters, route templating and cache counters at /metrics."""
+    before = client.get("/metrics").text
+    key = 'waterfront_http_requests_total{method="POST",route="/waves",status="200"}'
+    start = _sample(before, key) if key in before else 0.0
+    client.post("/waves", json={"T_s": 10.0, "h_m": 50.0})
+    client.get("/no-such-route")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert _sample(text, key) == start + 1
+    assert 'route="unmatched",status="404"' in text
+    assert "waterfront_http_requests_in_flight 1" in text
+    assert _sample(text, "waterfront_dispersion_cache_hits_total") > 0
+    assert 'waterfront_admission_in_flight{endpoint_class="scalar"}' in text
+
+
+def test_shed_requests_are_labelled_by_route(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that 503s from admission control count under their route, not unmatched."""
+    gate = admission_gates["series"]
+    monkeypatch.setattr(gate, "limits", AdmissionLimits(max_in_flight=1, max_queue=0))
+    monkeypatch.setattr(gate, "in_flight", 1)  # the only slot is taken
+    key = 'waterfront_http_requests_total{method="POST",route="/tides",status="503"}'
+    before = client.get("/metrics").text
+    start = _sample(before, key) if key in before else 0.0
+    body = {"constituents": [{"amp_m": 1.0, "period_s": 44712.0}]}
+    assert client.post("/tides", json=body).status_code == 503
+    assert _sample(client.get("/metrics").text, key) == start + 1
@@ -0,0 +1,83 @@
+"""
+Tests for the on-demand request profiling hook.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import pstats
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from open_gov_waterfront.profiling import ProfilingMiddleware
+from open_gov_waterfront.server import app as server_app
+from open_gov_waterfront.waves import wavelength_L
+
+
+def _app(profile_dir: Path | None) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/waves")
+    async def waves() -> dict[str, float]:
+        return {"wavelength_m": wavelength_L(9.0, 21.0)}
+
+    app.add_middleware(ProfilingMiddleware, profile_dir=profile_dir, top_n=5)
+    return app
+
+
+def test_profiling_disabled_by_default() -> None:
+    """Test that the server does not install the middleware unless enabled."""
+    assert all(m.cls is not ProfilingMiddleware for m in server_app.user_middleware)
+
+
+def test_request_without_header_is_untouched(tmp_path: Path) -> None:
+    """Test that requests without X-Profile pass straight through."""
+    client = TestClient(_app(tmp_path))
+    response = client.post("/waves")
+    assert response.status_code == 200
+    assert "wavelength_m" in response.json()
+    assert "x-profile-file" not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_profile_summary() -> None:
+    """Test that X-Profile: summary returns the top cumulative functions."""
+    client = TestClient(_app(None))
+    response = client.post("/waves", headers={"X-Profile": "summary"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status_code"] == 200
+    assert data["path"] == "/waves"
+    assert len(data["top_cumulative"]) == 5
+    cumtimes = [row["cumtime_s"] for row in data["top_cumulative"]]
+    assert cumtimes == sorted(cumtimes, reverse=True)
+
+
+def test_profile_stored_to_directory(tmp_path: Path) -> None:
+    """Test that stats are written to the profile directory and named in a header."""
+    client = TestClient(_app(tmp_path / "profiles"))
+    response = client.post("/waves", headers={"X-Profile": "1"})
+    assert response.status_code == 200
+    assert "wavelength_m" in response.json()
+    path = Path(response.headers["x-profile-file"])
+    assert path.parent == tmp_path / "profiles"
+    stats = pstats.Stats(str(path))
+    assert any(func == "wavelength_L" for _, _, func in stats.stats)  # type: ignore[attr-defined]
+
+
+def test_profile_summary_sees_threaded_handlers_on_server_app() -> None:
+    """Test that kernel frames of a sync handler appear in the server app's profile."""
+    client = TestClient(ProfilingMiddleware(server_app, top_n=1000))
+    response = client.post(
+        "/waves", json={"T_s": 9.37, "h_m": 23.1}, headers={"X-Profile": "summary"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status_code"] == 200
+    functions = " ".join(row["function"] for row in data["top_cumulative"])
+    assert "(_solve_dispersion)" in functions and "(wavelength_L)" in functions
+    assert "calcs.py" in functions
+    assert client.post("/waves", json={"T_s": 9.37, "h_m": 23.1}).json()["wavelength_m"] > 0
@@ -0,0 +1,137 @@
+"""
+Tests for incremental project analyses over the calculation graph.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pytest
+
+from open_gov_waterfront import batch
+from open_gov_waterfront.project import Node, Project, ProjectGraph, fingerprint
+
+from .test_batch import _projects
+
+INPUTS = {
+    "design_Tp_s": 10.0,
+    "water_depth_m": 20.0,
+    "design_wave_Hs_m": 2.0,
+    "pile_D_m": 1.0,
+    "berthing_mass_tonnes": 50000.0,
+    "berthing_speed_knots": 0.3,
+    "seawall_mu": 0.6,
+    "seawall_W_kN": 1000.0,
+    "seawall_T_kN": 400.0,
+}
+
+
+def _statuses(project: Project, targets: list[str]) -> dict[str, str]:
+    return {r.node: r.status for r in project.evaluate(targets).runs}
+
+
+def test_changing_berthing_speed_skips_wave_solver() -> None:
+    """Test that only nodes downstream of a changed input are rerun."""
+    project = Project(INPUTS)
+    targets = ["morison", "fender", "seawall"]
+    first = project.evaluate(targets)
+    assert first.computed == ["waves", "kinematics", "morison", "berthing", "fender", "seawall"]
+    assert all(r.elapsed_s >= 0 for r in first.runs)
+
+    assert project.update(berthing_speed_knots=0.4) == {"berthing", "fender"}
+    statuses = _statuses(project, targets)
+    assert statuses == {
+        "waves": "clean",
+        "kinematics": "clean",
+        "morison": "clean",
+        "berthing": "computed",
+        "fender": "computed",
+        "seawall": "clean",
+    }
+    assert project["fender_reaction_kN"] == pytest.approx(
+        first.values["fender_reaction_kN"] * (0.4 / 0.3) ** 2
+    )
+
+
+def test_memo_and_unchanged_results() -> None:
+    """Test memo hits on earlier values and early cut-off on identical upstream outputs."""
+    project = Project(INPUTS)
+    project.evaluate(["fender"])
+    assert project.update(berthing_speed_knots=0.3) == set()
+    project.update(berthing_speed_knots=0.4)
+    project.evaluate(["fender"])
+    project.update(berthing_speed_knots=0.3)
+    assert _statuses(project, ["fender"]) == {"berthing": "cached", "fender": "cached"}
+
+    # Same energy from a different mass and speed: the fender node is not rerun.
+    project.update(berthing_mass_tonnes=200000.0, berthing_speed_knots=0.15)
+    assert _statuses(project, ["fender"]) == {"berthing": "computed", "fender": "unchanged"}
+
+
+def test_columns_match_batch_results() -> None:
+    """Test whole-column projects against the batch runner, then a one-column change."""
+    chunk = _projects(200)
+    project = Project(batch.input_values(chunk))
+    targets = ["waves", "morison", "mooring", "fender", "seawall"]
+    values = project.evaluate(targets).values
+    expected = batch.process_chunk(chunk)
+    for name, cols in batch.RESULT_COLUMNS.items():
+        ok = (expected[f"{name}_error"] == "").to_numpy()
+        for col in cols:
+            np.testing.assert_allclose(values[col][ok], expected[col].to_numpy()[ok], rtol=1e-12)
+
+    speeds = batch.input_values(chunk)["berthing_speed_knots"] * 1.1
+    project.update(berthing_speed_knots=speeds)
+    evaluation = project.evaluate(targets)
+    assert evaluation.computed == ["berthing", "fender"]
+    with pytest.raises(ValueError, match="read-only"):
+        project["berthing_speed_knots"][0] = 1.0
+
+
+def test_missing_and_unknown_inputs() -> None:
+    """Test errors for unset inputs, unknown inputs and unknown targets."""
+    project = Project(INPUTS)
+    with pytest.raises(ValueError, match="pile_length_m"):
+        project.evaluate(["pile_capacity_kN"])
+    project.update(
+        pile_length_m=20.0,
+        pile_perimeter_m=2.0,
+        pile_tip_area_m2=0.3,
+        pile_unit_skin_kPa=50.0,
+        pile_unit_end_bearing_kPa=5000.0,
+    )
+    assert project.evaluate(["pile_capacity_kN"]).values["pile_capacity_kN"] == pytest.approx(
+        3500.0
+    )
+    with pytest.raises(ValueError, match="Unknown project input"):
+        project.update(wave_k=1.0)
+    with pytest.raises(ValueError, match="Unknown node"):
+        project.evaluate(["nope"])
+
+
+def test_graph_validation_and_fingerprints() -> None:
+    """Test cycle and duplicate-output detection, memo bounds and value hashing."""
+
+    def ident(**kw: Any) -> dict[str, Any]:
+        return {"b": kw["a"]}
+
+    with pytest.raises(ValueError, match="cycle"):
+        ProjectGraph([Node("x", ("a",), ("b",), ident), Node("y", ("b",), ("a",), ident)])
+    with pytest.raises(ValueError, match="two nodes"):
+        ProjectGraph([Node("x", ("a",), ("b",), ident), Node("y", ("a",), ("b",), ident)])
+    calls = []
+
+    def double(a: float) -> dict[str, Any]:
+        calls.append(a)
+        return {"b": 2 * a}
+
+    project = Project({"a": 1.0}, ProjectGraph([Node("x", ("a",), ("b",), double)]), cache_size=1)
+    for a in (1.0, 2.0, 1.0):
+        project.update(a=a)
+        project.evaluate()
+    assert calls == [1.0, 2.0, 1.0]
+    assert fingerprint(1) == fingerprint(np.float64(1.0)) != fingerprint(np.array([1.0]))
+    assert fingerprint(np.arange(3.0)) != fingerprint(np.arange(3.0).astype(np.float32))
@@ -0,0 +1,155 @@
+"""
+Tests for the FORM reliability solver.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from open_gov_waterfront.reliability import LIMIT_STATES, RandomVariable, form, normal_cdf
+from open_gov_waterfront.uncertainty import LogNormal, Normal
+
+PILE_FIXED = {"shaft_length_m": 20.0, "perimeter_m": 2.0, "area_tip_m2": 0.3}
+
+
+def _ln(mean: float, std: float) -> tuple[float, float]:
+    s = math.sqrt(math.log1p((std / mean) ** 2))
+    return math.log(mean) - 0.5 * s * s, s
+
+
+@pytest.mark.parametrize("rho", [0.0, 0.5, -0.3])
+def test_lognormal_sliding_is_exact(rho: float) -> None:
+    """Test beta for all-lognormal sliding, whose limit state is linear in log space."""
+    result = form(
+        "seawall-sliding",
+        {
+            "mu": LogNormal(0.6, 0.09),
+            "W_kN": LogNormal(1000.0, 100.0),
+            "T_kN": LogNormal(300.0, 60.0),
+        },
+        {("W_kN", "T_kN"): rho},
+    )
+    (m1, s1), (m2, s2), (m3, s3) = _ln(0.6, 0.09), _ln(1000.0, 100.0), _ln(300.0, 60.0)
+    rho_ln = math.log1p(rho * 0.1 * 0.2) / (s2 * s3)
+    expected = (m1 + m2 - m3) / math.sqrt(s1**2 + s2**2 + s3**2 - 2 * rho_ln * s2 * s3)
+    assert bool(result.converged) and result.beta == pytest.approx(expected, rel=1e-8)
+    assert result.pf == pytest.approx(0.5 * math.erfc(expected / math.sqrt(2)), rel=1e-6)
+    assert result.pf_sorm == pytest.approx(result.pf, rel=1e-6)  # flat surface
+    alpha = np.array([result.alpha[v] for v in ("mu", "W_kN", "T_kN")])
+    assert (alpha**2).sum() == pytest.approx(1.0)
+    fs = result.design_point["mu"] * result.design_point["W_kN"] / result.design_point["T_kN"]
+    assert fs == pytest.approx(1.0, abs=1e-6)
+
+
+def test_correlated_normal_pile_capacity_is_exact() -> None:
+    """Test a linear pile limit state with correlated normal resistance and demand."""
+    result = form(
+        "pile-axial",
+        {
+            **PILE_FIXED,
+            "unit_skin_kPa": Normal(50.0, 10.0),
+            "unit_end_bearing_kPa": 5000.0,
+            "demand_kN": Normal(2000.0, 300.0),
+        },
+        {("unit_skin_kPa", "demand_kN"): 0.4},
+    )
+    sigma_r = 40.0 * 10.0
+    expected = 1500.0 / math.sqrt(sigma_r**2 + 300.0**2 - 2 * 0.4 * sigma_r * 300.0)
+    assert result.beta == pytest.approx(expected, rel=1e-9)
+    assert result.iterations <= 3
+
+
+def test_batch_matches_single_structures() -> None:
+    """Test that a batch of walls gives each wall's own answer and keeps the shape."""
+    rng = np.random.default_rng(0)
+    mu = rng.uniform(0.5, 0.7, (40, 50))
+    W = rng.uniform(800.0, 1200.0, (40, 50))
+    T = rng.uniform(200.0, 400.0, 50)
+    corr = {("mu", "T_kN"): -0.2}
+    batch = form(
+        "seawall-sliding",
+        {
+            "mu": RandomVariable("lognormal", mu, 0.08),
+            "W_kN": RandomVariable("normal", W, 100.0),
+            "T_kN": RandomVariable("lognormal", T, 60.0),
+        },
+        corr,
+    )
+    assert batch.beta.shape == (40, 50) and batch.converged.all()
+    for i, j in [(0, 0), (7, 3), (39, 49)]:
+        one = form(
+            "seawall-sliding",
+            {
+                "mu": LogNormal(mu[i, j], 0.08),
+                "W_kN": Normal(W[i, j], 100.0),
+                "T_kN": LogNormal(T[j], 60.0),
+            },
+            corr,
+        )
+        assert batch.beta[i, j] == pytest.approx(float(one.beta), rel=1e-9)
+        assert batch.design_point["T_kN"][i, j] == pytest.approx(float(one.design_point["T_kN"]))
+
+
+def test_form_agrees_with_monte_carlo() -> None:
+    """Test FORM and SORM for a mixed normal/lognormal wall against brute-force sampling."""
+    result = form(
+        "seawall-sliding",
+        {"mu": LogNormal(0.6, 0.09), "W_kN": Normal(1000.0, 150.0), "T_kN": LogNormal(280.0, 60.0)},
+    )
+    rng = np.random.default_rng(5)
+    n = 2_000_000
+    mu = LogNormal(0.6, 0.09).sample(rng, n)
+    W = rng.normal(1000.0, 150.0, n)
+    T = LogNormal(280.0, 60.0).sample(rng, n)
+    pf_mc = np.mean(mu * W / T < 1.0)
+    # FORM ignores the curvature the normal W_kN gives in log space; SORM recovers it.
+    assert float(result.pf) == pytest.approx(pf_mc, rel=0.15)
+    assert float(result.pf_sorm) == pytest.approx(pf_mc, rel=0.03)
+
+
+def test_failing_mean_and_gradients() -> None:
+    """Test a negative beta when the mean fails, and the closed-form gradients."""
+    result = form("seawall-sliding", {"mu": Normal(0.3, 0.05), "W_kN": 1000.0, "T_kN": 400.0})
+    assert result.beta < 0 and result.pf > 0.5
+    points = {
+        "seawall-sliding": {"mu": 0.55, "W_kN": 900.0, "T_kN": 310.0},
+        "pile-axial": {
+            **PILE_FIXED,
+            "unit_skin_kPa": 45.0,
+            "unit_end_bearing_kPa": 4000.0,
+            "demand_kN": 1800.0,
+        },
+    }
+    for name, x in points.items():
+        ls = LIMIT_STATES[name]
+        grad = ls.gradient(**{k: np.asarray(v) for k, v in x.items()})
+        for var in ls.variables:
+            h = 1e-6 * x[var]
+            up, down = dict(x), dict(x)
+            up[var] += h
+            down[var] -= h
+            fd = (ls.g(**up) - ls.g(**down)) / (2 * h)
+            assert grad[var] == pytest.approx(fd, rel=1e-6), (name, var)
+    assert normal_cdf(-8.0) == pytest.approx(6.22096e-16, rel=1e-5)
+
+
+def test_invalid_problems() -> None:
+    """Test errors for unknown limit states, variables, correlations and parameters."""
+    walls = {"mu": LogNormal(0.6, 0.09), "W_kN": 1000.0, "T_kN": LogNormal(300.0, 60.0)}
+    with pytest.raises(ValueError, match="Unknown limit state"):
+        form("overturning", walls)
+    with pytest.raises(ValueError, match="missing: T_kN"):
+        form("seawall-sliding", {"mu": LogNormal(0.6, 0.09), "W_kN": 1000.0})
+    with pytest.raises(ValueError, match="two random variables"):
+        form("seawall-sliding", walls, {("mu", "W_kN"): 0.3})
+    with pytest.raises(ValueError, match="within"):
+        form("seawall-sliding", walls, {("mu", "T_kN"): 1.0})
+    with pytest.raises(ValueError, match="must be random"):
+        form("seawall-sliding", {"mu": 0.6, "W_kN": 1000.0, "T_kN": 300.0})
+    with pytest.raises(ValueError, match="must be > 0"):
+        form("seawall-sliding", {**walls, "mu": RandomVariable("lognormal", [0.6, -0.1], 0.1)})
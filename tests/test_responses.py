@@ -0,0 +1,95 @@
+"""
+Tests for optimized response encoding and negotiation.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from open_gov_waterfront import responses
+from open_gov_waterfront.responses import StaticPayload, dumps_json, etag_matches, wants_msgpack
+from open_gov_waterfront.server import app
+
+client = TestClient(app)
+
+TIDE_PAYLOAD = {
+    "constituents": [{"amp_m": 0.5, "period_s": 44714.0}, {"amp_m": 0.2, "period_s": 43200.0}],
+    "duration_s": 30 * 86400.0,
+    "dt_s": 600.0,
+}
+
+
+def test_dumps_json_numpy() -> None:
+    """Test that numpy arrays and scalars serialize to plain JSON."""
+    content = {"a": np.array([1.0, 2.5]), "b": np.float64(3.0), "c": np.arange(3)[::2]}
+    assert json.loads(dumps_json(content)) == {"a": [1.0, 2.5], "b": 3.0, "c": [0, 2]}
+
+
+def test_dumps_json_stdlib_fallback(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the stdlib encoder used when orjson is not installed."""
+    monkeypatch.setattr(responses, "orjson", None)
+    assert json.loads(dumps_json({"a": np.array([1.0, 2.0])})) == {"a": [1.0, 2.0]}
+    with pytest.raises(TypeError):
+        dumps_json({"a": object()})
+
+
+def test_wants_msgpack() -> None:
+    """Test Accept header negotiation."""
+    assert wants_msgpack("application/msgpack")
+    assert wants_msgpack("application/x-msgpack, application/json;q=0.5")
+    assert not wants_msgpack("application/json, application/msgpack;q=0.5")
+    assert not wants_msgpack("*/*")
+    assert not wants_msgpack("")
+    assert not wants_msgpack("application/msgpack;q=0")
+
+
+def test_tides_msgpack() -> None:
+    """Test MessagePack tide series matches the JSON body and is smaller."""
+    msgpack = pytest.importorskip("msgpack")
+    as_json = client.post("/tides", json=TIDE_PAYLOAD, headers={"Accept-Encoding": "identity"})
+    as_msgpack = client.post(
+        "/tides",
+        json=TIDE_PAYLOAD,
+        headers={"Accept": "application/msgpack", "Accept-Encoding": "identity"},
+    )
+    assert as_msgpack.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(as_msgpack.content) == as_json.json()
+    assert len(as_msgpack.content) < len(as_json.content)
+
+
+def test_tides_gzip_above_threshold() -> None:
+    """Test that large responses are gzip-compressed and small ones are not."""
+    large = client.post("/tides", json=TIDE_PAYLOAD, headers={"Accept-Encoding": "gzip"})
+    assert large.headers["content-encoding"] == "gzip"
+    assert len(large.json()["eta_m"]) == 4321
+    small = client.post(
+        "/seawall",
+        json={"mu": 0.6, "W_kN": 1000.0, "T_kN": 400.0},
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert "content-encoding" not in small.headers
+
+
+def test_etag_matches() -> None:
+    """Test If-None-Match list, wildcard and weak-tag handling."""
+    etag = '"abc"'
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('"x", W/"abc"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"abcd"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_static_payload_is_stable() -> None:
+    """Test that the ETag depends only on content."""
+    a = StaticPayload.from_content({"k": [1, 2]}, max_age_s=60)
+    b = StaticPayload.from_content({"k": [1, 2]})
+    assert a.etag == b.etag
+    assert a.etag != StaticPayload.from_content({"k": [1, 3]}).etag
+    assert a.cache_control == "public, max-age=60"
@@ -0,0 +1,176 @@
+"""
+Tests for the SQLite results store and its CLI, API, stdio and batch integrations.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from typer.testing import CliRunner
+
+from open_gov_waterfront import server
+from open_gov_waterfront.batch import run_report
+from open_gov_waterfront.cli import app
+from open_gov_waterfront.results import ResultsStore, input_hash
+from open_gov_waterfront.stdio import handle_line
+
+from .test_batch import _projects
+
+BERTHING = {
+    "mass_tonnes": 50000.0,
+    "speed_knots": 0.3,
+    "Ce": 1.0,
+    "Cc": 1.0,
+    "Cs": 1.0,
+    "efficiency": 0.7,
+    "deflection_m": 0.5,
+}
+
+
+def test_record_and_query(tmp_path: Path) -> None:
+    """Test filters, ordering and key-order-independent hashing."""
+    store = ResultsStore(tmp_path / "r.db")
+    h1 = store.record("seawall", {"mu": 0.5, "W_kN": 10.0}, {"sliding_fs": 1.0}, source="cli")
+    h2 = store.record(
+        "seawall", {"W_kN": 10.0, "mu": 0.5}, {"sliding_fs": 1.0}, source="api", project="P"
+    )
+    store.record("scour", {"D_m": 1.0}, {"scour_depth_m": 2.0}, source="cli", jurisdiction="OH")
+    assert h1 == h2 == input_hash("seawall", {"mu": 0.5, "W_kN": 10.0})
+    assert [r.source for r in store.query(calc="seawall")] == ["api", "cli"]
+    assert [r.calc for r in store.query(jurisdiction="OH")] == ["scour"]
+    (found,) = store.query(project="P")
+    assert found.inputs == {"W_kN": 10.0, "mu": 0.5} and found.version == store.version
+    assert len(store.query(input_hash=h1, limit=1)) == 1
+    with pytest.raises(ValueError):
+        store.query(limit=0)
+
+
+def test_existing_hashes_by_version(tmp_path: Path) -> None:
+    """Test hash lookups beyond one IN batch and their version scoping."""
+    path = tmp_path / "r.db"
+    old = ResultsStore(path, version="0.0.1")
+    hashes = [old.record("scour", {"D_m": float(i)}, {}, source="cli") for i in range(1000)]
+    old.close()
+    store = ResultsStore(path)
+    assert store.existing_hashes(hashes) == set()
+    store.record("scour", {"D_m": 999.0}, {}, source="cli")
+    assert store.existing_hashes([*hashes, "x"]) == {hashes[-1]}
+    assert ResultsStore(path, version="0.0.1").existing_hashes(hashes) == set(hashes)
+    store.record("scour", {"D_m": 999.0}, {"scour_depth_m": 2.0}, source="cli")
+    assert store.stored_outputs([*hashes, "x"]) == {hashes[-1]: {"scour_depth_m": 2.0}}
+
+
+def test_cli_api_and_stdio_share_hashes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the same berthing inputs hash identically from every front end."""
+    db = tmp_path / "r.db"
+    result = CliRunner().invoke(
+        app,
+        ["--results-db", str(db), "--project", "Pier 7", "--jurisdiction", "CA", "berthing"]
+        + ["--mass", "50000", "--speed", "0.3"],
+    )
+    assert result.exit_code == 0, result.output
+    store = ResultsStore(db)
+    monkeypatch.setattr(server, "results_store", store)
+    r = TestClient(server.app).post(
+        "/berthing",
+        json={"mass_tonnes": 50000, "speed_knots": 0.3},
+        headers={"X-Project": "Pier 7"},
+    )
+    assert r.status_code == 200
+    reply = handle_line(
+        b'{"calc": "berthing", "mass_tonnes": 5e4, "speed_knots": 0.3, "project": "Pier 7"}',
+        store,
+    )
+    assert reply["ok"]
+    rows = store.query(project="Pier 7")
+    assert [r.source for r in rows] == ["stdio", "api", "cli"]
+    assert {r.input_hash for r in rows} == {input_hash("berthing", BERTHING)}
+    assert rows[2].jurisdiction == "CA"
+    assert rows[0].outputs["energy_J"] == pytest.approx(r.json()["energy_J"])
+
+    found = TestClient(server.app).get("/results", params={"calc": "berthing"}).json()
+    assert len(found) == 3 and found[0]["source"] == "stdio"
+    out = CliRunner().invoke(app, ["-o", "json", "--results-db", str(db), "query-results"])
+    assert [json.loads(line)["id"] for line in out.stdout.splitlines()] == [3, 2, 1]
+
+
+def test_results_api_without_store(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that /results answers 404 when no store is configured."""
+    monkeypatch.setattr(server, "results_store", None)
+    assert TestClient(server.app).get("/results").status_code == 404
+    result = CliRunner().invoke(app, ["query-results"], env={"WATERFRONT_RESULTS_DB": ""})
+    assert result.exit_code == 2
+
+
+def test_storage_errors_do_not_fail_requests(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test that the API and stdio still answer when recording a result fails."""
+    broken = ResultsStore(tmp_path / "r.db")
+    broken.close()  # every record() now raises sqlite3.ProgrammingError
+    monkeypatch.setattr(server, "results_store", broken)
+    r = TestClient(server.app).post("/berthing", json={"mass_tonnes": 50000, "speed_knots": 0.3})
+    assert r.status_code == 200 and r.json()["energy_J"] > 0
+    reply = handle_line(b'{"calc": "scour", "D_m": 1.0, "U_mps": 1.0}', broken)
+    assert reply["ok"] and reply["result"]["scour_depth_m"] > 0
+    assert sum("Could not record" in m for m in caplog.messages) == 2
+
+
+def test_cli_storage_errors_do_not_fail_commands(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a CLI command still prints its result when recording it fails."""
+
+    def locked(*args: object, **kwargs: object) -> str:
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(ResultsStore, "record", locked)
+    result = CliRunner().invoke(
+        app,
+        ["-o", "json", "--results-db", str(tmp_path / "r.db"), "scour-pile"]
+        + ["--D", "1.0", "--U", "1.0"],
+    )
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.stdout)["scour_depth_m"] > 0
+    assert "Could not record scour result: database is locked" in result.stderr
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batch_records_and_skips_existing(tmp_path: Path, workers: int) -> None:
+    """Test that a rerun only computes rows with new inputs and reuses the rest."""
+    store = ResultsStore(tmp_path / "r.db")
+    df = _projects(30)
+    src = tmp_path / "in.csv"
+    df.to_csv(src, index=False)
+    first = run_report(src, tmp_path / "a.csv", chunksize=8, workers=workers, results=store)
+    assert first.rows == 30 and first.skipped_rows == 0
+    stored = store.query(calc="report", limit=100)
+    assert len(stored) == 30 and {r.source for r in stored} == {"batch"}
+    assert stored[-1].project == df["project"][0]
+
+    df.loc[[3, 17], "seawall_mu"] = 0.55
+    df.to_csv(src, index=False)
+    rerun = run_report(
+        src, tmp_path / "b.csv", chunksize=8, workers=workers, results=store, skip_existing=True
+    )
+    assert (rerun.rows, rerun.skipped_rows) == (30, 28)
+    assert len(store.query(calc="report", limit=100)) == 32
+    a, b = pd.read_csv(tmp_path / "a.csv"), pd.read_csv(tmp_path / "b.csv")
+    assert b["project"].tolist() == df["project"].tolist()
+    same = b.index.difference([3, 17])
+    pd.testing.assert_frame_equal(b.loc[same], a.loc[same])
+    assert (b.loc[[3, 17], "seawall_sliding_fs"] < a.loc[[3, 17], "seawall_sliding_fs"]).all()
+
+    again = run_report(src, tmp_path / "c.csv", chunksize=8, results=store, skip_existing=True)
+    assert (again.rows, again.skipped_rows) == (30, 30)
+    assert len(store.query(calc="report", limit=100)) == 32
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "c.csv"), b)
+    with pytest.raises(ValueError, match="results store"):
+        run_report(src, tmp_path / "d.csv", skip_existing=True)
@@ -0,0 +1,172 @@
+"""
+Tests for scenario matrices over lazily expanded axis products.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from open_gov_waterfront.calcs import ARRAY_CALCS, run_calc
+from open_gov_waterfront.scenarios import Criterion, ScenarioStudy
+
+VESSELS = {
+    "tug": {"mass_tonnes": 800.0, "speed_knots": 0.6},
+    "feeder": {"mass_tonnes": 20000.0, "speed_knots": 0.3},
+    "panamax": {"mass_tonnes": 80000.0, "speed_knots": 0.2},
+}
+AXES = {
+    "state": ["CA", "OH"],
+    "vessel": VESSELS,
+    "efficiency": [0.5, 0.6, 0.7],
+    "deflection_m": [0.4, 0.6, 0.8, 1.0],
+}
+
+
+def _brute_force() -> pd.DataFrame:
+    rows = []
+    for i, (state, (vessel, params), eff, defl) in enumerate(
+        itertools.product(AXES["state"], VESSELS.items(), AXES["efficiency"], AXES["deflection_m"])
+    ):
+        out = run_calc("berthing", {**params, "efficiency": eff, "deflection_m": defl})
+        rows.append({"i": i, "state": state, "vessel": vessel, **out})
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_envelope_matches_brute_force(chunk_size: int) -> None:
+    """Test grouped maxima, minima and arg-combinations against a scalar sweep."""
+    study = ScenarioStudy(AXES, ["berthing"])
+    assert study.size == 72
+    result = study.run(by=["vessel"], chunk_size=chunk_size)
+    assert result.evaluated == {"berthing": 72} and result.failed == {}
+    df = _brute_force()
+    for _, row in result.envelope.iterrows():
+        group = df[df["vessel"] == row["vessel"]]
+        assert row["combinations"] == row["passed"] == 24
+        assert row["fender_reaction_kN_max"] == pytest.approx(group["fender_reaction_kN"].max())
+        assert row["energy_J_min"] == pytest.approx(group["energy_J"].min())
+        worst = group.loc[group["fender_reaction_kN"].idxmax(), "i"]
+        assert row["fender_reaction_kN_argmax"] == worst
+        assert study.combination(worst) == {
+            "state": "CA",
+            "vessel": row["vessel"],
+            "efficiency": "0.5",
+            "deflection_m": "0.4",
+        }
+
+
+def test_pruning_skips_later_calculations() -> None:
+    """Test that failed combinations are counted and not evaluated further."""
+    study = ScenarioStudy(
+        {"vessel": VESSELS, "deflection_m": [0.4, 1.0], "W_kN": [500.0, 5000.0]},
+        ["berthing", "seawall"],
+        fixed={"mu": 0.6, "T_kN": 400.0},
+    )
+    limit = Criterion("fender_reaction_kN", "<=", 1000.0)
+    result = study.run(
+        outputs=["sliding_fs"], by=["vessel"], criteria=[Criterion("W_kN", ">", 1000.0), limit]
+    )
+    reactions = {
+        (name, d): run_calc("berthing", {**p, "deflection_m": d})["fender_reaction_kN"]
+        for name, p in VESSELS.items()
+        for d in (0.4, 1.0)
+    }
+    too_high = sum(r > 1000.0 for r in reactions.values())
+    assert too_high == 1
+    assert result.failed == {"W_kN > 1000": 6, "fender_reaction_kN <= 1000": too_high}
+    assert result.evaluated == {"berthing": 6, "seawall": 6 - too_high}
+    env = result.envelope.set_index("vessel")
+    assert list(env["passed"]) == [2, 2, 1]
+    assert env.loc["tug", "sliding_fs_max"] == pytest.approx(0.6 * 5000.0 / 400.0)
+
+    strict = study.run(by=["vessel"], criteria=[Criterion("fender_reaction_kN", "<=", 100.0)])
+    env = strict.envelope.set_index("vessel")
+    assert env.loc["panamax", "passed"] == 0
+    assert env.loc["panamax", "sliding_fs_argmax"] == -1
+    assert np.isnan(env.loc["panamax", "sliding_fs_max"])
+
+
+def test_derived_columns_and_text_axes() -> None:
+    """Test a sea-level-rise axis feeding the wave calculation through `derive`."""
+    base_depth = {"CA": 12.0, "OH": 6.0}
+    study = ScenarioStudy(
+        {"state": ["CA", "OH"], "slr_m": [0.0, 0.5, 1.0], "T_s": [6.0, 10.0]},
+        ["waves"],
+        derive=lambda cols: {"h_m": np.vectorize(base_depth.get)(cols["state"]) + cols["slr_m"]},
+    )
+    result = study.run(outputs=["wavelength_m"], by=["state", "slr_m"])
+    env = result.envelope.set_index(["state", "slr_m"])
+    expected = run_calc("waves", {"T_s": 10.0, "h_m": 7.0})["wavelength_m"]
+    assert env.loc[("OH", "1"), "wavelength_m_max"] == pytest.approx(expected)
+    assert list(env["combinations"]) == [2] * 6
+
+
+def test_product_is_never_materialized() -> None:
+    """Test that a very large product can be sized and chunked lazily."""
+    axis = [float(i) for i in range(1000)]
+    study = ScenarioStudy({"mu": axis, "W_kN": axis, "T_kN": axis, "x": axis}, ["seawall"])
+    assert study.size == 10**12
+    index, codes, columns = next(study.chunks(5))
+    assert list(index) == [0, 1, 2, 3, 4] and list(columns["x"]) == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert study.combination(10**12 - 1)["mu"] == "999"
+
+
+def test_invalid_studies() -> None:
+    """Test errors for malformed axes, clashes, outputs and criteria."""
+    with pytest.raises(ValueError, match="no values"):
+        ScenarioStudy({"mu": []}, ["seawall"])
+    with pytest.raises(ValueError, match="same parameters"):
+        ScenarioStudy({"v": {"a": {"mass_tonnes": 1.0}, "b": {"speed_knots": 1.0}}}, ["berthing"])
+    with pytest.raises(ValueError, match="more than once"):
+        ScenarioStudy({"mu": [0.5]}, ["seawall"], fixed={"mu": 0.6})
+    with pytest.raises(ValueError, match="No array form"):
+        ScenarioStudy({"mu": [0.5]}, ["tides"])
+    study = ScenarioStudy({"mu": [0.5]}, ["seawall"], fixed={"W_kN": 1.0, "T_kN": 1.0})
+    with pytest.raises(ValueError, match="Not a calculation output"):
+        study.run(outputs=["energy_J"])
+    with pytest.raises(ValueError, match="Unknown axis"):
+        study.run(by=["state"])
+    with pytest.raises(ValueError, match="no step produces"):
+        study.run(criteria=[Criterion("energy_J", "<", 1.0)])
+    with pytest.raises(ValueError, match="Unknown comparison"):
+        Criterion("mu", "==", 1.0)  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="needs parameters"):
+        ScenarioStudy({"mu": [0.5]}, ["seawall"]).run()
+
+
+@pytest.mark.parametrize(
+    ("name", "params"),
+    [
+        ("waves", {"T_s": 8.0, "h_m": 10.0}),
+        ("morison", {"D_m": 1.0, "u_amp_mps": 1.5, "a_amp_mps2": 0.8}),
+        ("berthing", {"mass_tonnes": 50000.0, "speed_knots": 0.3, "Ce": 0.9}),
+        (
+            "mooring",
+            {"A_wind_m2": 800.0, "A_current_m2": 300.0, "U_wind_mps": 20.0, "U_current_mps": 1.0},
+        ),
+        (
+            "pile-axial",
+            {
+                "shaft_length_m": 20.0,
+                "perimeter_m": 2.0,
+                "area_tip_m2": 0.3,
+                "unit_skin_kPa": 50.0,
+                "unit_end_bearing_kPa": 5000.0,
+            },
+        ),
+        ("corrosion", {"t0_mm": 12.0, "rate_mm_per_year": 0.1, "years": 50.0}),
+        ("seawall", {"mu": 0.6, "W_kN": 1000.0, "T_kN": 400.0}),
+        ("scour", {"D_m": 1.2, "U_mps": 1.5}),
+    ],
+)
+def test_array_calcs_match_scalar_calcs(name: str, params: dict[str, float]) -> None:
+    """Test that each array calculation agrees with its API counterpart."""
+    arrays = ARRAY_CALCS[name]({k: np.full(3, v) for k, v in params.items()})
+    for key, value in run_calc(name, params).items():
+        np.testing.assert_allclose(arrays[key], value, rtol=1e-12)
@@ -0,0 +1,89 @@
+"""
+Tests for Sobol sensitivity indices.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from open_gov_waterfront.calcs import ArrayCalc
+from open_gov_waterfront.sensitivity import sobol
+from open_gov_waterfront.uncertainty import Normal, Uniform
+
+
+def _ishigami(x1: np.ndarray, x2: np.ndarray, x3: np.ndarray) -> dict[str, np.ndarray]:
+    return {"y": np.sin(x1) + 7 * np.sin(x2) ** 2 + 0.1 * x3**4 * np.sin(x1)}
+
+
+ISHIGAMI = ArrayCalc("ishigami", ("x1", "x2", "x3"), {}, ("y",), _ishigami)
+ISHIGAMI_INPUTS = dict.fromkeys(("x1", "x2", "x3"), Uniform(-math.pi, math.pi))
+
+
+def test_ishigami_matches_analytic_indices() -> None:
+    """Test first-order and total indices against the Ishigami function's analytic values."""
+    result = sobol(ISHIGAMI, ISHIGAMI_INPUTS, 40_000, seed=1, bootstrap=100)
+    y = result.outputs["y"]
+    first = {"x1": 0.3139, "x2": 0.4424, "x3": 0.0}
+    total = {"x1": 0.5576, "x2": 0.4424, "x3": 0.2437}
+    for name in first:
+        assert y.first[name] == pytest.approx(first[name], abs=0.03)
+        assert y.total[name] == pytest.approx(total[name], abs=0.03)
+        lo, hi = y.total_ci[name]
+        assert lo - 0.01 <= total[name] <= hi + 0.01
+    assert y.variance == pytest.approx(13.845, rel=0.03)
+    assert result.evaluations == 40_000 * 5
+    assert result.inputs == ["x1", "x2", "x3"]
+
+
+def test_corrosion_indices_with_fixed_inputs() -> None:
+    """Test a linear kernel with equal variance contributions and a fixed parameter."""
+    inputs = {"t0_mm": Normal(20.0, 1.0), "rate_mm_per_year": Normal(0.1, 0.02), "years": 50.0}
+    result = sobol("corrosion", inputs, 20_000, seed=2, bootstrap=50)
+    out = result.outputs["remaining_thickness_mm"]
+    for name in ("t0_mm", "rate_mm_per_year"):
+        assert out.first[name] == pytest.approx(0.5, abs=0.05)
+        assert out.total[name] == pytest.approx(0.5, abs=0.05)
+        lo, hi = out.first_ci[name]
+        assert lo <= out.first[name] <= hi
+    assert out.variance == pytest.approx(2.0, rel=0.05)
+    assert out.invalid == 0
+
+
+def test_reproducible_and_chunked() -> None:
+    """Test that a seed reproduces a run and a partial last chunk is handled."""
+    a, b = (
+        sobol(ISHIGAMI, ISHIGAMI_INPUTS, 2_500, seed=5, bootstrap=20, chunk_size=1_000)
+        for _ in range(2)
+    )
+    assert a.outputs == b.outputs
+    assert a.seed == 5 and a.samples == 2_500
+    other = sobol(ISHIGAMI, ISHIGAMI_INPUTS, 2_500, seed=6, bootstrap=20, chunk_size=1_000)
+    assert other.outputs != a.outputs
+
+
+def test_invalid_rows_are_dropped() -> None:
+    """Test that rows with a NaN result in any matrix are counted and excluded."""
+    inputs = {"t0_mm": Normal(1.0, 1.0), "rate_mm_per_year": Normal(0.1, 0.02), "years": 50.0}
+    result = sobol("corrosion", inputs, 2_000, seed=3, bootstrap=20)
+    out = result.outputs["remaining_thickness_mm"]
+    assert 0 < out.invalid < 2_000
+    assert all(math.isfinite(v) for v in out.total.values())
+
+
+def test_rejects_bad_arguments() -> None:
+    """Test validation of inputs, outputs and options."""
+    with pytest.raises(ValueError, match="distribution"):
+        sobol("corrosion", {"t0_mm": 20.0}, 100)
+    with pytest.raises(ValueError, match="no parameters"):
+        sobol("corrosion", {"nope": Normal(1.0, 0.1)}, 100)
+    with pytest.raises(ValueError, match="Not an output"):
+        sobol("corrosion", {"t0_mm": Normal(20.0, 1.0)}, 100, outputs=["nope"])
+    with pytest.raises(ValueError, match="confidence"):
+        sobol("corrosion", {"t0_mm": Normal(20.0, 1.0)}, 100, confidence=1.5)
+    with pytest.raises(ValueError, match="samples"):
+        sobol("corrosion", {"t0_mm": Normal(20.0, 1.0)}, 1)
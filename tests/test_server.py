@@ -8,6 +8,7 @@ from __future__ import annotations
 
 from fastapi.testclient import TestClient
 
+from open_gov_waterfront.models import TideJobParams
 from open_gov_waterfront.server import app
 
 client = TestClient(app)
@@ -31,6 +32,22 @@ def test_states_endpoint() -> None:
     assert len(data["states"]) == 3
 
 
+def test_states_conditional_get() -> None:
+    """Test ETag, Cache-Control and If-None-Match on the states endpoint."""
+    first = client.get("/states")
+    etag = first.headers["etag"]
+    assert etag.startswith('"') and etag.endswith('"')
+    assert "max-age" in first.headers["cache-control"]
+    assert client.get("/states").headers["etag"] == etag
+
+    cached = client.get("/states", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    assert client.get("/states", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
 def test_waves_endpoint() -> None:
     """Test waves calculation endpoint."""
     payload = {"T_s": 10.0, "h_m": 50.0}
@@ -134,3 +151,31 @@ def test_waves_invalid_input() -> None:
     payload = {"T_s": -10.0, "h_m": 50.0}
     response = client.post("/waves", json=payload)
     assert response.status_code == 422  # FastAPI returns 422 for validation errors
+
+
+def test_tides_endpoint() -> None:
+    """Test tide series synthesis endpoint."""
+    payload = {
+        "constituents": [{"amp_m": 0.5, "period_s": 44714.0}],
+        "duration_s": 3600.0,
+        "dt_s": 600.0,
+    }
+    response = client.post("/tides", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["t_s"]) == 7
+    assert len(data["eta_m"]) == 7
+    assert data["eta_m"][0] == 0.5
+
+
+def test_tides_endpoint_caps_points() -> None:
+    """Test that oversized inline series are refused with a pointer to the tides job."""
+    payload = {
+        "constituents": [{"amp_m": 0.5, "period_s": 44714.0}],
+        "duration_s": 599594400.0,
+        "dt_s": 60.0,
+    }
+    response = client.post("/tides", json=payload)
+    assert response.status_code == 422
+    assert "'tides' job" in response.text
+    assert TideJobParams.model_validate(payload).points == 9993240
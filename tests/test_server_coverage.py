@@ -17,7 +17,7 @@ client = TestClient(app)
 
 def test_waves_error_handling() -> None:
     """Test waves endpoint error handling."""
-    with patch("open_gov_waterfront.server.wavelength_L", side_effect=Exception("Test error")):
+    with patch("open_gov_waterfront.calcs.wavelength_L", side_effect=Exception("Test error")):
         response = client.post("/waves", json={"T_s": 10.0, "h_m": 50.0})
         assert response.status_code == 400
         assert "Test error" in response.json()["detail"]
@@ -26,7 +26,7 @@ def test_waves_error_handling() -> None:
 def test_morison_error_handling() -> None:
     """Test morison endpoint error handling."""
     with patch(
-        "open_gov_waterfront.server.morison_inline_max_per_length_N",
+        "open_gov_waterfront.calcs.morison_inline_max_per_length_N",
         side_effect=Exception("Test error"),
     ):
         response = client.post(
@@ -37,7 +37,7 @@ def test_morison_error_handling() -> None:
 
 def test_berthing_error_handling() -> None:
     """Test berthing endpoint error handling."""
-    with patch("open_gov_waterfront.server.berthing_energy_J", side_effect=Exception("Test error")):
+    with patch("open_gov_waterfront.calcs.berthing_energy_J", side_effect=Exception("Test error")):
         response = client.post(
             "/berthing",
             json={
@@ -56,7 +56,7 @@ def test_berthing_error_handling() -> None:
 def test_mooring_error_handling() -> None:
     """Test mooring endpoint error handling."""
     with patch(
-        "open_gov_waterfront.server.mooring_total_load_N", side_effect=Exception("Test error")
+        "open_gov_waterfront.calcs.mooring_total_load_N", side_effect=Exception("Test error")
     ):
         response = client.post(
             "/mooring",
@@ -76,7 +76,7 @@ def test_mooring_error_handling() -> None:
 def test_pile_axial_error_handling() -> None:
     """Test pile axial endpoint error handling."""
     with patch(
-        "open_gov_waterfront.server.pile_axial_capacity_kN", side_effect=Exception("Test error")
+        "open_gov_waterfront.calcs.pile_axial_capacity_kN", side_effect=Exception("Test error")
     ):
         response = client.post(
             "/pile-axial",
@@ -94,7 +94,7 @@ def test_pile_axial_error_handling() -> None:
 def test_corrosion_error_handling() -> None:
     """Test corrosion endpoint error handling."""
     with patch(
-        "open_gov_waterfront.server.remaining_thickness_mm", side_effect=Exception("Test error")
+        "open_gov_waterfront.calcs.remaining_thickness_mm", side_effect=Exception("Test error")
     ):
         response = client.post(
             "/corrosion", json={"t0_mm": 16.0, "rate_mm_per_year": 0.1, "years": 50.0}
@@ -104,14 +104,14 @@ def test_corrosion_error_handling() -> None:
 
 def test_seawall_error_handling() -> None:
     """Test seawall endpoint error handling."""
-    with patch("open_gov_waterfront.server.sliding_fs", side_effect=Exception("Test error")):
+    with patch("open_gov_waterfront.calcs.sliding_fs", side_effect=Exception("Test error")):
         response = client.post("/seawall", json={"mu": 0.6, "W_kN": 1000.0, "T_kN": 400.0})
         assert response.status_code == 400
 
 
 def test_scour_error_handling() -> None:
     """Test scour endpoint error handling."""
-    with patch("open_gov_waterfront.server.pile_scour_depth_m", side_effect=Exception("Test error")):
+    with patch("open_gov_waterfront.calcs.pile_scour_depth_m", side_effect=Exception("Test error")):
         response = client.post("/scour", json={"D_m": 1.2, "U_mps": 1.5, "K": 2.0, "m": 1.0})
         assert response.status_code == 400
 
@@ -126,7 +126,14 @@ def test_server_main() -> None:
             "open_gov_waterfront.server:app",
             host="0.0.0.0",
             port=8000,
+            workers=1,
+            loop="auto",
+            http="auto",
+            timeout_keep_alive=5,
+            backlog=2048,
+            limit_concurrency=None,
             log_level="info",
+            access_log=True,
             reload=False,
         )
 
@@ -144,3 +151,12 @@ async def test_server_startup_logging() -> None:
     # Trigger lifespan context
     async with lifespan(app):
         pass  # This exercises the startup/shutdown logging
+
+
+def test_tides_error_handling() -> None:
+    """Test tides endpoint error handling."""
+    with patch("open_gov_waterfront.calcs.tide_series", side_effect=Exception("Test error")):
+        response = client.post(
+            "/tides", json={"constituents": [{"amp_m": 0.5, "period_s": 44714.0}]}
+        )
+        assert response.status_code == 400
@@ -0,0 +1,58 @@
+"""
+Tests for server settings and the launcher configuration.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from open_gov_waterfront.settings import ServerSettings
+
+
+def test_default_settings() -> None:
+    """Test launcher defaults match a single-worker uvicorn on port 8000."""
+    kwargs = ServerSettings(_env_file=None).uvicorn_kwargs()
+    assert kwargs["host"] == "0.0.0.0"
+    assert kwargs["port"] == 8000
+    assert kwargs["workers"] == 1
+    assert kwargs["loop"] == "auto"
+    assert kwargs["http"] == "auto"
+    assert kwargs["reload"] is False
+
+
+def test_settings_from_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that WATERFRONT_ environment variables override defaults."""
+    monkeypatch.setenv("WATERFRONT_WORKERS", "8")
+    monkeypatch.setenv("WATERFRONT_LOOP", "uvloop")
+    monkeypatch.setenv("WATERFRONT_HTTP", "httptools")
+    monkeypatch.setenv("WATERFRONT_LIMIT_CONCURRENCY", "500")
+    kwargs = ServerSettings(_env_file=None).uvicorn_kwargs()
+    assert kwargs["workers"] == 8
+    assert kwargs["loop"] == "uvloop"
+    assert kwargs["http"] == "httptools"
+    assert kwargs["limit_concurrency"] == 500
+
+
+def test_settings_from_env_file(tmp_path: Path) -> None:
+    """Test loading settings from a .env file."""
+    env_file = tmp_path / ".env"
+    env_file.write_text("WATERFRONT_PORT=9000\nWATERFRONT_BACKLOG=4096\nOPENAI_API_KEY=x\n")
+    settings = ServerSettings(_env_file=env_file)
+    assert settings.port == 9000
+    assert settings.backlog == 4096
+
+
+def test_invalid_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test validation of launcher settings."""
+    monkeypatch.setenv("WATERFRONT_WORKERS", "0")
+    with pytest.raises(ValidationError):
+        ServerSettings(_env_file=None)
+    monkeypatch.setenv("WATERFRONT_WORKERS", "2")
+    monkeypatch.setenv("WATERFRONT_LOOP", "trio")
+    with pytest.raises(ValidationError):
+        ServerSettings(_env_file=None)
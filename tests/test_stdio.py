@@ -0,0 +1,78 @@
+"""
+Tests for the calculation registry and the JSON-lines stdio worker.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+from pydantic import ValidationError
+from typer.testing import CliRunner
+
+from open_gov_waterfront.berthing import berthing_energy_J
+from open_gov_waterfront.calcs import CALCS, run_calc
+from open_gov_waterfront.cli import app
+from open_gov_waterfront.loadtest import ENDPOINTS
+from open_gov_waterfront.stdio import handle_line, serve
+
+
+def test_registry_covers_api_calculations() -> None:
+    """Test that every POST endpoint of the API has a registry entry."""
+    posted = {name for name, (method, _, _) in ENDPOINTS.items() if method == "POST"}
+    assert set(CALCS) == posted
+    for name in posted:
+        assert run_calc(name, ENDPOINTS[name][2] or {})
+
+
+def test_run_calc_errors() -> None:
+    """Test unknown names and invalid parameters."""
+    with pytest.raises(ValueError, match="Unknown calculation"):
+        run_calc("nope", {})
+    with pytest.raises(ValidationError):
+        run_calc("waves", {"T_s": 0, "h_m": 10})
+
+
+def test_handle_line() -> None:
+    """Test replies for valid, invalid and malformed requests."""
+    ok = handle_line(b'{"calc": "berthing", "id": "v1", "mass_tonnes": 50000, "speed_knots": 0.3}')
+    assert ok["ok"] and ok["id"] == "v1"
+    assert ok["result"]["energy_J"] == pytest.approx(berthing_energy_J(50000, 0.3))
+    bad = handle_line(b'{"calc": "waves", "id": 2, "T_s": -1, "h_m": 3}')
+    assert bad == {"id": 2, "ok": False, "error": "T_s: Input should be greater than 0"}
+    assert "Invalid JSON" in handle_line(b"{oops")["error"]
+    assert "calc" in handle_line(b'{"T_s": 1}')["error"]
+    assert "JSON object" in handle_line(b"[1, 2]")["error"]
+
+
+def test_serve_keeps_order_and_skips_blank_lines() -> None:
+    """Test that one reply is written per request, in input order."""
+    lines = [
+        json.dumps({"calc": "seawall", "id": i, "mu": 0.5, "W_kN": 100.0 * i, "T_kN": 10.0})
+        for i in range(1, 6)
+    ]
+    lines.insert(2, "   ")
+    lines.append(
+        '{"calc": "tides", "constituents": [{"amp_m": 1, "period_s": 3600}], "duration_s": 1200}'
+    )
+    out = io.BytesIO()
+    summary = serve((line.encode() + b"\n" for line in lines), out)
+    replies = [json.loads(x) for x in out.getvalue().splitlines()]
+    assert summary.requests == 6 and summary.errors == 0
+    assert [r["id"] for r in replies[:5]] == [1, 2, 3, 4, 5]
+    assert replies[4]["result"]["sliding_fs"] == pytest.approx(25.0)
+    assert replies[5]["result"]["t_s"] == [0.0, 600.0, 1200.0]
+
+
+def test_cli_serve_stdio() -> None:
+    """Test the serve-stdio command end to end."""
+    stdin = (
+        '{"calc": "scour", "D_m": 1.0, "U_mps": 1.5}\n{"calc": "scour", "D_m": -1, "U_mps": 1}\n'
+    )
+    result = CliRunner().invoke(app, ["serve-stdio"], input=stdin)
+    assert result.exit_code == 0
+    replies = [json.loads(x) for x in result.stdout.splitlines() if x.startswith("{")]
+    assert [r["ok"] for r in replies] == [True, False]
@@ -0,0 +1,112 @@
+"""
+Tests for the kernel timing registry.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from open_gov_waterfront import timing
+from open_gov_waterfront.metrics import timing_collector
+
+
+@pytest.fixture
+def enabled(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setattr(timing, "ENABLED", True)
+    timing.reset()
+    yield
+    timing.reset()
+
+
+def test_disabled_is_noop(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that disabled timing returns the original function and a shared null timer."""
+    monkeypatch.setattr(timing, "ENABLED", False)
+
+    def kernel(x: float) -> float:
+        return 2.0 * x
+
+    assert timing.timed(kernel) is kernel
+    assert timing.timer("a") is timing.timer("b")
+    assert list(timing_collector()) == []
+
+
+def test_timed_records_calls(enabled: None) -> None:
+    """Test call counts, cumulative and max time for a decorated function."""
+
+    @timing.timed
+    def kernel(x: float) -> float:
+        return 2.0 * x
+
+    assert kernel(2.0) == 4.0
+    kernel(3.0)
+    stat = timing.snapshot()[timing.kernel_name(kernel)]
+    assert stat["calls"] == 2
+    assert stat["total_s"] >= stat["max_s"] > 0.0
+    assert kernel.__name__ == "kernel"
+
+
+def test_timed_records_failed_calls(enabled: None) -> None:
+    """Test that calls raising an exception are still recorded."""
+
+    @timing.timed
+    def failing() -> None:
+        raise ValueError("bad input")
+
+    with pytest.raises(ValueError):
+        failing()
+    assert timing.snapshot()[timing.kernel_name(failing)]["calls"] == 1
+
+
+def test_timer_and_counters(enabled: None) -> None:
+    """Test the block timer, event counters and /metrics exposition."""
+    with timing.timer("stage.solve"):
+        timing.count("stage.solve", "iterations", 7)
+    timing.count("stage.solve", "iterations", 3)
+    stat = timing.snapshot()["stage.solve"]
+    assert stat["calls"] == 1
+    assert stat["counters"] == {"iterations": 10}
+    lines = list(timing_collector())
+    assert 'waterfront_kernel_calls_total{kernel="stage.solve"} 1' in lines
+    assert 'waterfront_kernel_events_total{kernel="stage.solve",event="iterations"} 10' in lines
+
+
+def test_concurrent_updates_are_not_lost(enabled: None) -> None:
+    """Test exact totals when many threads record into the same kernel at once."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads as often as possible
+
+    def work(_: int) -> None:
+        for _ in range(5000):
+            timing.record("shared", 1e-6)
+            timing.count("shared", "events")
+
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(work, range(8)))
+    finally:
+        sys.setswitchinterval(interval)
+    stat = timing.snapshot()["shared"]
+    assert stat["calls"] == 40000 and stat["counters"] == {"events": 40000}
+
+
+def test_cli_reports_timings_when_enabled() -> None:
+    """Test end to end: env var enables timing and the CLI prints Newton iterations."""
+    env = {**os.environ, timing.ENV_VAR: "1", "COLUMNS": "200"}
+    result = subprocess.run(
+        [sys.executable, "-m", "open_gov_waterfront.cli", "waves", "--T", "9.5", "--h", "12"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    assert "Kernel Timings" in result.stderr
+    assert "waves.dispersion_k" in result.stderr
+    assert "newton_iterations=" in result.stderr
@@ -0,0 +1,119 @@
+"""
+Tests for local span tracing and trace summaries.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from typer.testing import CliRunner
+
+from open_gov_waterfront import tracing
+from open_gov_waterfront.cli import app as cli_app
+from open_gov_waterfront.server import app as api_app
+
+
+@pytest.fixture
+def trace_file(tmp_path: Path) -> Iterator[Path]:
+    path = tmp_path / "trace.jsonl"
+    tracing.configure(path)
+    yield path
+    tracing.configure(None)
+
+
+def test_disabled_span_is_shared_noop() -> None:
+    """Test that spans are a shared no-op when tracing is not configured."""
+    tracing.configure(None)
+    assert tracing.span("a") is tracing.span("b")
+    with tracing.span("a", x=1) as sp:
+        sp.set(y=2)
+
+
+def test_spans_nest_and_record_attrs(trace_file: Path) -> None:
+    """Test that child spans share the trace id and point at their parent."""
+    with tracing.span("outer", job="x"):
+        with tracing.span("inner") as inner:
+            inner.set(iterations=3)
+    records = {r["name"]: r for r in tracing.read_trace(trace_file)}
+    outer, inner_rec = records["outer"], records["inner"]
+    assert outer["parent_id"] is None
+    assert inner_rec["parent_id"] == outer["span_id"]
+    assert inner_rec["trace_id"] == outer["trace_id"]
+    assert outer["attrs"] == {"job": "x"}
+    assert inner_rec["attrs"] == {"iterations": 3}
+
+
+def test_span_records_error(trace_file: Path) -> None:
+    """Test that an exception inside a span is recorded and re-raised."""
+    with pytest.raises(ValueError):
+        with tracing.span("failing"):
+            raise ValueError("boom")
+    (record,) = tracing.read_trace(trace_file)
+    assert record["attrs"]["error"] == "ValueError"
+
+
+def test_read_trace_skips_truncated_lines(tmp_path: Path) -> None:
+    """Test that blank and partial lines are ignored."""
+    path = tmp_path / "t.jsonl"
+    path.write_text('{"span_id": "a", "name": "x", "duration_s": 1.0}\n\n{"span_id": "b", ')
+    assert len(tracing.read_trace(path)) == 1
+
+
+def test_summarize_self_time_and_order() -> None:
+    """Test per-stage totals, self time and flame-graph ordering."""
+    records = [
+        {"span_id": "r", "parent_id": None, "name": "root", "duration_s": 10.0},
+        {"span_id": "a1", "parent_id": "r", "name": "a", "duration_s": 2.0},
+        {"span_id": "a2", "parent_id": "r", "name": "a", "duration_s": 3.0},
+        {"span_id": "b", "parent_id": "r", "name": "b", "duration_s": 4.0},
+        {"span_id": "b1", "parent_id": "b", "name": "a", "duration_s": 1.0},
+    ]
+    stages = tracing.summarize(records)
+    assert [s.path for s in stages] == [
+        ("root",),
+        ("root", "a"),
+        ("root", "b"),
+        ("root", "b", "a"),
+    ]
+    root, a, b, ba = stages
+    assert root.self_s == pytest.approx(1.0)
+    assert (a.count, a.total_s, a.max_s) == (2, 5.0, 3.0)
+    assert b.self_s == pytest.approx(3.0)
+    assert ba.depth == 2
+
+
+def test_cli_trace_and_summary(tmp_path: Path) -> None:
+    """Test that --trace writes a CLI root span and trace-summary renders it."""
+    path = tmp_path / "cli.jsonl"
+    runner = CliRunner()
+    try:
+        result = runner.invoke(
+            cli_app,
+            ["--trace", str(path), "tides", "--A1", "0.5", "--T1", "44714"],
+        )
+    finally:
+        tracing.configure(None)
+    assert result.exit_code == 0, result.output
+    names = {r["name"] for r in tracing.read_trace(path)}
+    assert {"cli.tides", "tides.tide_series"} <= names
+
+    result = runner.invoke(cli_app, ["trace-summary", str(path)])
+    assert result.exit_code == 0
+    assert "tides.tide_series" in result.output
+
+
+def test_api_request_spans(trace_file: Path) -> None:
+    """Test that an API request produces an HTTP root span above the calculation spans."""
+    client = TestClient(api_app)
+    body = {"constituents": [{"amp_m": 0.5, "period_s": 44714.0}], "duration_s": 3600}
+    assert client.post("/tides", json=body).status_code == 200
+    records = {r["name"]: r for r in tracing.read_trace(trace_file)}
+    root = records["http POST /tides"]
+    assert root["attrs"]["status_code"] == 200
+    assert records["api.tides"]["parent_id"] == root["span_id"]
+    assert records["tides.tide_series"]["parent_id"] == records["api.tides"]["span_id"]
@@ -0,0 +1,124 @@
+"""
+Tests for Monte Carlo uncertainty propagation.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import math
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from open_gov_waterfront.jobs import JobQueue
+from open_gov_waterfront.uncertainty import (
+    LogNormal,
+    Normal,
+    Triangular,
+    Uniform,
+    parse_input,
+    run_monte_carlo,
+)
+
+BERTHING = {
+    "mass_tonnes": {"dist": "normal", "mean": 50000.0, "std": 5000.0},
+    "speed_knots": {"dist": "lognormal", "mean": 0.25, "std": 0.08},
+    "efficiency": {"dist": "uniform", "low": 0.6, "high": 0.8},
+}
+
+
+def test_identical_across_workers_and_reproducible() -> None:
+    """Test that worker count never changes results and the seed reproduces a run."""
+    serial, parallel = (
+        run_monte_carlo(
+            "berthing",
+            BERTHING,
+            45_000,
+            seed=7,
+            chunk_size=10_000,
+            workers=workers,
+            thresholds={"fender_reaction_kN": [3000.0]},
+        )
+        for workers in (1, 2)
+    )
+    assert serial.chunks == 5 and serial.seed == 7
+    assert serial.outputs == parallel.outputs
+    other = run_monte_carlo("berthing", BERTHING, 45_000, seed=8, chunk_size=10_000)
+    assert other.outputs["energy_J"].mean != serial.outputs["energy_J"].mean
+    fresh = run_monte_carlo("berthing", BERTHING, 1000)
+    again = run_monte_carlo("berthing", BERTHING, 1000, seed=fresh.seed)
+    assert again.outputs == fresh.outputs
+
+
+def test_statistics_match_closed_form() -> None:
+    """Test a linear output (corrosion) against its exact mean, spread and tails."""
+    result = run_monte_carlo(
+        "corrosion",
+        {"t0_mm": 20.0, "rate_mm_per_year": Normal(0.1, 0.02), "years": 50.0},
+        200_000,
+        seed=1,
+        thresholds={"remaining_thickness_mm": [15.0]},
+    )
+    out = result.outputs["remaining_thickness_mm"]
+    assert out.invalid == 0
+    assert out.mean == pytest.approx(15.0, abs=0.01)
+    assert out.std == pytest.approx(1.0, rel=0.01)
+    assert out.percentiles[95.0] == pytest.approx(15.0 + 1.6449, abs=0.02)
+    assert out.exceedance[15.0] == pytest.approx(0.5, abs=0.005)
+
+
+def test_distributions_sample_their_moments() -> None:
+    """Test sample moments of each distribution and spec parsing."""
+    rng = np.random.default_rng(0)
+    ln = LogNormal(0.25, 0.08).sample(rng, 400_000)
+    assert ln.mean() == pytest.approx(0.25, rel=0.005) and ln.std() == pytest.approx(0.08, rel=0.01)
+    assert Uniform(1.0, 3.0).sample(rng, 100_000).mean() == pytest.approx(2.0, abs=0.01)
+    assert Triangular(0.0, 0.0, 3.0).sample(rng, 100_000).mean() == pytest.approx(1.0, abs=0.01)
+    assert parse_input({"dist": "normal", "mean": 1.0, "std": 0.1}) == Normal(1.0, 0.1)
+    assert parse_input(3) == 3.0
+    assert math.isclose(LogNormal(1.0, 0.5).mu_ln, -0.5 * math.log(1.25))
+    with pytest.raises(ValueError, match="Unknown distribution"):
+        parse_input({"dist": "weibull"})
+    with pytest.raises(ValueError, match="Bad parameters"):
+        parse_input({"dist": "normal", "mu": 1.0})
+    with pytest.raises(ValueError):
+        Uniform(2.0, 1.0)
+
+
+def test_invalid_samples_and_arguments() -> None:
+    """Test that invalid samples are counted, not summarized, and bad runs are refused."""
+    result = run_monte_carlo(
+        "seawall", {"mu": Normal(0.1, 0.1), "W_kN": 1000.0, "T_kN": 400.0}, 10_000, seed=3
+    )
+    out = result.outputs["sliding_fs"]
+    assert 0 < out.invalid < 10_000 and out.percentiles[5.0] > 0
+    with pytest.raises(ValueError, match="no parameters"):
+        run_monte_carlo("seawall", {"phi": 30.0}, 10)
+    with pytest.raises(ValueError, match="Not an output"):
+        run_monte_carlo("seawall", {"mu": 0.5, "W_kN": 1.0, "T_kN": 1.0}, 10, outputs=["x"])
+    with pytest.raises(ValueError, match="needs parameters"):
+        run_monte_carlo("seawall", {"mu": 0.5}, 10)
+    with pytest.raises(ValueError, match="percentiles"):
+        run_monte_carlo("seawall", {"mu": 0.5, "W_kN": 1.0, "T_kN": 1.0}, 10, percentiles=[101])
+
+
+def test_monte_carlo_job(tmp_path: Path) -> None:
+    """Test the background job kind against a direct run with the same seed."""
+    queue = JobQueue(tmp_path / "jobs", workers=1)
+    queue.start()
+    try:
+        params = {"calc": "berthing", "inputs": BERTHING, "samples": 20_000, "seed": 11}
+        job = queue.wait(queue.submit("montecarlo", params).id)
+        for too_big in ({"samples": 100_000_000}, {"chunk_size": 10_000_000}):
+            with pytest.raises(ValidationError, match="less than or equal"):
+                queue.submit("montecarlo", {**params, **too_big})
+    finally:
+        queue.shutdown()
+    assert job.status == "succeeded" and job.result is not None
+    direct = run_monte_carlo("berthing", BERTHING, 20_000, seed=11)
+    stored = job.result["outputs"]["fender_reaction_kN"]
+    assert stored["mean"] == pytest.approx(direct.outputs["fender_reaction_kN"].mean)
+    assert job.result["seed"] == 11
@@ -0,0 +1,105 @@
+"""
+Tests for the array versions of the screening calculations.
+
+Author: Nik Jois <nikjois@llamasearch.ai>
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from open_gov_waterfront import vectorized
+from open_gov_waterfront.berthing import berthing_energy_J, fender_reaction_kN
+from open_gov_waterfront.corrosion import CorrosionInputs, remaining_thickness_mm
+from open_gov_waterfront.mooring import EnvLoads, mooring_total_load_N
+from open_gov_waterfront.morison import MorisonCoeffs, morison_inline_max_per_length_N
+from open_gov_waterfront.piles import PileAxialInputs, pile_axial_capacity_kN
+from open_gov_waterfront.scour import pile_scour_depth_m
+from open_gov_waterfront.seawall import sliding_fs
+from open_gov_waterfront.waves import (
+    celerity_c,
+    dispersion_k,
+    group_celerity_cg,
+    shoaling_coefficient,
+    wavelength_L,
+)
+
+T = np.array([3.0, 6.0, 8.0, 10.0, 15.0, 20.0])
+H = np.array([100.0, 50.0, 10.0, 2.0, 30.0, 5.0])
+
+
+def test_dispersion_matches_scalar() -> None:
+    """Test that the array solver agrees with the scalar solver."""
+    expected = [dispersion_k(t, h) for t, h in zip(T, H, strict=True)]
+    np.testing.assert_allclose(vectorized.dispersion_k(T, H), expected, rtol=1e-12)
+
+
+def test_dispersion_invalid_is_nan() -> None:
+    """Test that invalid elements give NaN without affecting the others."""
+    k = vectorized.dispersion_k([10.0, -1.0, np.nan, 10.0], [50.0, 10.0, 10.0, 0.0])
+    assert k[0] == pytest.approx(dispersion_k(10.0, 50.0))
+    assert np.isnan(k[1:]).all()
+
+
+def test_wave_properties_match_scalar() -> None:
+    """Test wavelength, celerity, group celerity and shoaling against the scalar code."""
+    props = vectorized.wave_properties(T, H)
+    pairs = list(zip(T, H, strict=True))
+    np.testing.assert_allclose(props["wavelength_m"], [wavelength_L(t, h) for t, h in pairs])
+    np.testing.assert_allclose(props["celerity_mps"], [celerity_c(t, h) for t, h in pairs])
+    np.testing.assert_allclose(
+        props["group_celerity_mps"], [group_celerity_cg(t, h) for t, h in pairs]
+    )
+    np.testing.assert_allclose(
+        props["shoaling_coefficient"], [shoaling_coefficient(None, t, h) for t, h in pairs]
+    )
+
+
+def test_surface_kinematics_deep_water() -> None:
+    """Test that deep-water velocity amplitude tends to pi H / T."""
+    k = vectorized.dispersion_k(8.0, 500.0)
+    u, a = vectorized.surface_kinematics(2.0, 8.0, k, 500.0)
+    assert float(u) == pytest.approx(np.pi * 2.0 / 8.0, rel=1e-6)
+    assert float(a) == pytest.approx(float(u) * 2 * np.pi / 8.0)
+
+
+def test_scalar_equivalents() -> None:
+    """Test the remaining kernels against their scalar counterparts."""
+    assert vectorized.morison_inline_max_per_length_N(1.2, 2.0, 1.5, 1.1, 1.9) == pytest.approx(
+        morison_inline_max_per_length_N(1.2, 2.0, 1.5, MorisonCoeffs(1.1, 1.9))
+    )
+    assert vectorized.mooring_total_load_N(1000.0, 500.0, 20.0, 1.0) == pytest.approx(
+        mooring_total_load_N(EnvLoads(1000.0, 500.0, 20.0, 1.0))
+    )
+    E = vectorized.berthing_energy_J(50000.0, 0.3, 0.9)
+    assert E == pytest.approx(berthing_energy_J(50000.0, 0.3, Ce=0.9))
+    assert vectorized.fender_reaction_kN(E) == pytest.approx(fender_reaction_kN(float(E)))
+    assert vectorized.sliding_fs(0.6, 1000.0, 400.0) == pytest.approx(
+        sliding_fs(0.6, 1000.0, 400.0)
+    )
+
+
+def test_invalid_inputs_are_nan() -> None:
+    """Test NaN results where the scalar functions would raise."""
+    assert np.isnan(vectorized.morison_inline_max_per_length_N(0.0, 1.0, 1.0))
+    assert np.isnan(vectorized.berthing_energy_J([1000.0, -1.0], 0.3)[1])
+    assert np.isnan(vectorized.fender_reaction_kN(1e6, efficiency=0.0))
+    fs = vectorized.sliding_fs([0.6, 0.6], [1000.0, 1000.0], [400.0, 0.0])
+    assert fs[0] == pytest.approx(1.5) and np.isnan(fs[1])
+
+
+def test_pile_axial_capacity() -> None:
+    """Test the array pile capacity against the scalar function, NaN for negatives."""
+    inp = PileAxialInputs(20.0, 2.0, 0.3, 50.0, 5000.0)
+    Q = vectorized.pile_axial_capacity_kN([20.0, -1.0], 2.0, 0.3, 50.0, 5000.0)
+    assert Q[0] == pytest.approx(pile_axial_capacity_kN(inp)) and np.isnan(Q[1])
+
+
+def test_corrosion_and_scour() -> None:
+    """Test the array corrosion and scour kernels against the scalar functions."""
+    t = vectorized.remaining_thickness_mm([12.0, 12.0, -1.0], 0.1, [50.0, 500.0, 1.0])
+    assert t[0] == pytest.approx(remaining_thickness_mm(CorrosionInputs(12.0, 0.1, 50.0)))
+    assert t[1] == 0.0 and np.isnan(t[2])
+    y = vectorized.pile_scour_depth_m([1.2, 0.0], 1.5, K=1.8, m=0.8)
+    assert y[0] == pytest.approx(pile_scour_depth_m(1.2, 1.5, K=1.8, m=0.8)) and np.isnan(y[1])
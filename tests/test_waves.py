@@ -81,3 +81,16 @@ def test_dispersion_fails_to_converge() -> None:
     # The RuntimeError path is very difficult to trigger with valid physical inputs
     k = dispersion_k(1.0, 0.1)
     assert k > 0.0
+
+
+def test_dispersion_cache() -> None:
+    """Test that repeated (T, h) solutions are served from the cache."""
+    from open_gov_waterfront.waves import dispersion_cache_info
+
+    before = dispersion_cache_info()
+    k1 = dispersion_k(11.5, 37.0)
+    k2 = dispersion_k(11.5, 37.0)
+    after = dispersion_cache_info()
+    assert k1 == k2
+    assert after.hits >= before.hits + 1
+    assert after.maxsize == 4096 and after.currsize >= 1